@@ -1,9 +1,27 @@
+import uuid
 from typing import ClassVar
 
 from django.contrib import admin
+from django.db.models import Max, Min, Q
+from django.utils import timezone
 from django.utils.html import format_html
 
-from .models import Denuncia
+from accounts.models import User
+
+from .cache import invalidate_denuncia_cache
+from .models import Categoria, Denuncia
+from .search import search_query
+from .stats import rebuild_daily_stats, stats_day
+from .tiles import invalidate_tiles_for_point
+
+
+@admin.register(Categoria)
+class CategoriaAdmin(admin.ModelAdmin):
+    """Categorias de denúncia (renomear recalcula a busca textual das denúncias)."""
+
+    list_display = ('id', 'nome')
+    search_fields = ('nome',)
+    ordering = ('nome',)
 
 
 @admin.register(Denuncia)
@@ -33,11 +51,11 @@ class DenunciaAdmin(admin.ModelAdmin):
         'updated_at',
     )
     
-    # Campos de busca
+    # Campos de busca (ver `get_search_results`: usa o índice de busca textual)
     search_fields = (
         'id',
         'protocolo',
-        'categoria',
+        'categoria__nome',
         'descricao',
         'usuario__email',
         'usuario__name',
@@ -45,6 +63,7 @@ class DenunciaAdmin(admin.ModelAdmin):
     
     # Ordenação padrão
     ordering = ('-created_at',)
+    list_select_related = ('usuario', 'categoria')
     
     # Campos somente leitura
     readonly_fields = (
@@ -89,6 +108,29 @@ class DenunciaAdmin(admin.ModelAdmin):
     # Ações customizadas
     actions: ClassVar[list[str]] = ['marcar_como_analise', 'marcar_como_resolvido', 'marcar_como_rejeitado']
     
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Busca pelo índice GIN de `search_vector` (categoria e descrição) e
+        por igualdade em id/protocolo, em vez de `icontains` em cada campo
+        (varredura da tabela inteira). Usuários são resolvidos antes, na
+        tabela de usuários, para o OR ficar todo em `api_denuncia`.
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+
+        condition = Q(search_vector=search_query(term)) | Q(protocolo=term.upper())
+        try:
+            condition |= Q(id=uuid.UUID(term))
+        except ValueError:
+            pass
+        usuarios = list(
+            User.objects.filter(Q(email__iexact=term) | Q(name__icontains=term)).values_list("pk", flat=True)[:100]
+        )
+        if usuarios:
+            condition |= Q(usuario_id__in=usuarios)
+        return queryset.filter(condition), False
+
     # Métodos para exibição formatada
     def id_truncado(self, obj):
         """Exibe o UUID truncado"""
@@ -164,20 +206,48 @@ class DenunciaAdmin(admin.ModelAdmin):
     audio_preview.short_description = 'Prévia do Áudio'
     
     # Ações customizadas
+    def _snapshot(self, queryset):
+        """
+        Pks e localizações das denúncias selecionadas, lidas antes do
+        `update()`: depois dele o queryset do changelist ainda carrega o
+        filtro de status ativo e pode não encontrar mais as linhas alteradas.
+        """
+        return list(queryset.values_list('pk', 'localizacao'))
+
+    def _invalidate_caches(self, snapshot):
+        """
+        `update()` não dispara signals; invalida tiles MVT e cache de respostas
+        e recalcula o rollup diário dos dias afetados manualmente.
+        """
+        for _pk, localizacao in snapshot:
+            invalidate_tiles_for_point(localizacao)
+        invalidate_denuncia_cache()
+        queryset = Denuncia.objects.filter(pk__in=[pk for pk, _localizacao in snapshot])
+        period = queryset.aggregate(first=Min('created_at'), last=Max('created_at'))
+        if period['first'] is not None:
+            rebuild_daily_stats(stats_day(period['first']), stats_day(period['last']))
+
+    def _update_status(self, queryset, status):
+        snapshot = self._snapshot(queryset)
+        # `update()` não aplica o `auto_now`; sem ele o delta do heatmap (`since`) não vê a mudança
+        updated = queryset.update(status=status, updated_at=timezone.now())
+        self._invalidate_caches(snapshot)
+        return updated
+
     def marcar_como_analise(self, request, queryset):
         """Marca denúncias como em análise"""
-        updated = queryset.update(status='em_analise')
+        updated = self._update_status(queryset, 'em_analise')
         self.message_user(request, f'{updated} denúncia(s) marcada(s) como em análise.')
     marcar_como_analise.short_description = 'Marcar como em análise'
     
     def marcar_como_resolvido(self, request, queryset):
         """Marca denúncias como resolvidas"""
-        updated = queryset.update(status='resolvido')
+        updated = self._update_status(queryset, 'resolvido')
         self.message_user(request, f'{updated} denúncia(s) marcada(s) como resolvida(s).')
     marcar_como_resolvido.short_description = 'Marcar como resolvido'
     
     def marcar_como_rejeitado(self, request, queryset):
         """Marca denúncias como rejeitadas"""
-        updated = queryset.update(status='rejeitado')
+        updated = self._update_status(queryset, 'rejeitado')
         self.message_user(request, f'{updated} denúncia(s) marcada(s) como rejeitada(s).')
     marcar_como_rejeitado.short_description = 'Marcar como rejeitado'
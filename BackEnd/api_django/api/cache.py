@@ -0,0 +1,170 @@
+"""
+Cache de respostas dos endpoints de leitura de denúncias (heatmap, dashboard,
+resumo de relatórios).
+
+As chaves são derivadas dos parâmetros já normalizados e incluem uma geração
+global, incrementada pelos signals de `Denuncia` e `Categoria`
+(`invalidate_denuncia_cache`). Cada endpoint tem TTL próprio
+(`API_CACHE_TTLS`) e contadores de hit/miss. A mesma geração serve de
+validador do GET condicional (`generation_watermark`), sem consulta ao banco.
+"""
+
+import datetime
+import hashlib
+import json
+import math
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+
+GENERATION_KEY = "api-cache-generation:denuncia"
+GENERATION_CHANGED_AT_KEY = "api-cache-generation:denuncia:changed-at"
+BBOX_PRECISION = 4  # casas decimais (~11 m) usadas para normalizar o bbox
+DEFAULT_TTLS = {
+    "heatmap": 300,
+    "dashboard": 60,
+    "report_summary": 300,
+}
+BYPASS_QUERY_PARAM = "nocache"
+ACTIVE_USERS_KEY = "api-cache:active-users"
+ACTIVE_USERS_TTL = 300
+
+
+def _incr(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def endpoint_ttl(endpoint: str) -> int:
+    ttls = {**DEFAULT_TTLS, **getattr(settings, "API_CACHE_TTLS", {})}
+    return ttls[endpoint]
+
+
+def normalize_bbox(raw_value: str | None) -> tuple[float, float, float, float] | None:
+    """
+    Converte `minx,miny,maxx,maxy` em tupla arredondada para fora
+    (`BBOX_PRECISION` casas). Retorna None para valores inválidos.
+    """
+    if not raw_value:
+        return None
+    try:
+        minx, miny, maxx, maxy = map(float, raw_value.split(","))
+    except ValueError:
+        return None
+    if not all(math.isfinite(value) for value in (minx, miny, maxx, maxy)):
+        return None
+    factor = 10**BBOX_PRECISION
+    return (
+        math.floor(minx * factor) / factor,
+        math.floor(miny * factor) / factor,
+        math.ceil(maxx * factor) / factor,
+        math.ceil(maxy * factor) / factor,
+    )
+
+
+def generation_watermark() -> tuple[int, datetime.datetime]:
+    """
+    `(geração, momento da última escrita)` das denúncias. Sem a chave (cache
+    novo ou esvaziado), a geração recomeça de um valor derivado do relógio,
+    para não repetir números já usados em ETags.
+    """
+    values = cache.get_many([GENERATION_KEY, GENERATION_CHANGED_AT_KEY])
+    if GENERATION_KEY not in values:
+        cache.add(GENERATION_KEY, time.time_ns() // 1000, timeout=None)
+        cache.add(GENERATION_CHANGED_AT_KEY, timezone.now(), timeout=None)
+        values = cache.get_many([GENERATION_KEY, GENERATION_CHANGED_AT_KEY])
+    changed_at = values.get(GENERATION_CHANGED_AT_KEY) or timezone.now()
+    return values.get(GENERATION_KEY, 0), changed_at
+
+
+def build_key(endpoint: str, params: dict[str, Any]) -> str:
+    generation, _ = generation_watermark()
+    digest = hashlib.sha1(
+        json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return f"api-cache:{endpoint}:g{generation}:{digest}"
+
+
+def should_bypass(request) -> bool:
+    """
+    Ignora o cache quando desativado em settings ou, para depuração, com
+    `?nocache=1` / `Cache-Control: no-cache` (apenas em DEBUG ou para staff).
+    """
+    if not getattr(settings, "API_CACHE_ENABLED", True):
+        return True
+    if request is None:
+        return False
+    wants_bypass = request.GET.get(BYPASS_QUERY_PARAM) in ("1", "true") or (
+        "no-cache" in request.headers.get("Cache-Control", "")
+    )
+    if not wants_bypass:
+        return False
+    user = getattr(request, "user", None)
+    return settings.DEBUG or bool(user and user.is_staff)
+
+
+def get_or_set(
+    endpoint: str,
+    params: dict[str, Any],
+    builder: Callable[[], Any],
+    *,
+    request=None,
+) -> tuple[Any, bool]:
+    """Retorna `(valor, hit)`; em miss (ou bypass) chama `builder` e armazena."""
+    if should_bypass(request):
+        return builder(), False
+
+    key = build_key(endpoint, params)
+    value = cache.get(key)
+    if value is not None:
+        _incr(f"api-cache-stats:{endpoint}:hits")
+        return value, True
+
+    _incr(f"api-cache-stats:{endpoint}:misses")
+    value = builder()
+    cache.set(key, value, timeout=endpoint_ttl(endpoint))
+    return value, False
+
+
+def invalidate_denuncia_cache() -> None:
+    """Descarta todas as entradas derivadas de `Denuncia` (nova geração)."""
+    generation_watermark()  # semeia a geração antes de incrementar
+    _incr(GENERATION_KEY)
+    cache.set(GENERATION_CHANGED_AT_KEY, timezone.now(), timeout=None)
+
+
+def active_users_count() -> int:
+    """Total de usuários ativos do dashboard, em cache até a próxima alteração de `User`."""
+    total = cache.get(ACTIVE_USERS_KEY)
+    if total is None:
+        total = get_user_model().objects.filter(is_active=True).count()
+        cache.set(ACTIVE_USERS_KEY, total, timeout=ACTIVE_USERS_TTL)
+    return total
+
+
+def invalidate_active_users_count() -> None:
+    cache.delete(ACTIVE_USERS_KEY)
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    stats = {}
+    for endpoint in DEFAULT_TTLS:
+        stats[endpoint] = {
+            "hits": cache.get(f"api-cache-stats:{endpoint}:hits", 0),
+            "misses": cache.get(f"api-cache-stats:{endpoint}:misses", 0),
+            "ttl": endpoint_ttl(endpoint),
+        }
+    return stats
+
+
+def reset_cache_stats() -> None:
+    cache.delete_many(
+        [f"api-cache-stats:{endpoint}:{kind}" for endpoint in DEFAULT_TTLS for kind in ("hits", "misses")]
+    )
@@ -0,0 +1,101 @@
+"""
+Cache em processo da dimensão `Categoria` (id ↔ nome).
+
+A tabela é pequena e quase nunca muda, então cada processo guarda o
+mapeamento inteiro e o recarrega quando: expira (`CACHE_TTL`), uma
+categoria é salva/removida neste processo (signals) ou uma consulta não
+encontra o id/nome pedido (categoria criada por outro processo). Assim os
+filtros e agrupamentos trabalham só com a chave inteira, e o nome é
+resolvido aqui, sem JOIN.
+"""
+
+import threading
+import time
+
+from django.db import IntegrityError, transaction
+
+from api.models import Categoria
+
+CACHE_TTL = 300  # segundos; cobre renomeações feitas em outros processos
+
+_lock = threading.Lock()
+_labels: dict[int, str] = {}
+_ids: dict[str, int] = {}
+_loaded_at: float | None = None
+
+
+def _key(nome: str) -> str:
+    # mesma normalização da constraint `categoria_nome_upper_unique`
+    return nome.strip().upper()
+
+
+def _load() -> None:
+    global _labels, _ids, _loaded_at
+    rows = list(Categoria.objects.order_by().values_list("id", "nome"))
+    with _lock:
+        _labels = dict(rows)
+        _ids = {_key(nome): pk for pk, nome in rows}
+        _loaded_at = time.monotonic()
+
+
+def _ensure_loaded() -> None:
+    if _loaded_at is None or time.monotonic() - _loaded_at > CACHE_TTL:
+        _load()
+
+
+def clear_categoria_cache() -> None:
+    """Descarta o cache deste processo (recarregado no próximo acesso)."""
+    global _loaded_at
+    with _lock:
+        _loaded_at = None
+
+
+def categoria_labels() -> dict[int, str]:
+    """Mapeamento completo `id -> nome`."""
+    _ensure_loaded()
+    return dict(_labels)
+
+
+def categoria_label(pk: int | None) -> str:
+    """Nome da categoria `pk` (string vazia para None ou id inexistente)."""
+    if pk is None:
+        return ""
+    _ensure_loaded()
+    if pk not in _labels:
+        _load()
+    return _labels.get(pk, "")
+
+
+def categoria_id(nome: str, *, create: bool = False) -> int | None:
+    """
+    Id da categoria com esse nome, sem diferenciar maiúsculas. Com
+    `create=True`, uma categoria inexistente é criada; caso contrário
+    retorna None.
+    """
+    key = _key(nome)
+    if not key:
+        return None
+    _ensure_loaded()
+    if key not in _ids:
+        _load()
+    if key in _ids or not create:
+        return _ids.get(key)
+
+    try:
+        with transaction.atomic():
+            categoria = Categoria.objects.create(nome=nome.strip())
+    except IntegrityError:
+        # criada em paralelo por outra requisição
+        categoria = Categoria.objects.get(nome__iexact=nome.strip())
+    with _lock:
+        _labels[categoria.pk] = categoria.nome
+        _ids[_key(categoria.nome)] = categoria.pk
+    return categoria.pk
+
+
+def get_categoria(nome: str) -> Categoria:
+    """`Categoria` com esse nome, criada se necessário."""
+    pk = categoria_id(nome, create=True)
+    if pk is None:
+        raise ValueError("O nome da categoria não pode ser vazio.")
+    return Categoria(pk=pk, nome=categoria_label(pk))
@@ -7,5 +7,12 @@ class StatusChoices(models.TextChoices):
     REJEITADO = "rejeitado", "Rejeitado"
 
 
+class ReportJobStatusChoices(models.TextChoices):
+    PENDENTE = "pendente", "Pendente"
+    PROCESSANDO = "processando", "Processando"
+    CONCLUIDO = "concluido", "Concluído"
+    FALHOU = "falhou", "Falhou"
+
+
 # Expose constant with the same name expected elsewhere in the project
 STATUS_CHOICES = StatusChoices
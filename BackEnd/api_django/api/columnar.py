@@ -0,0 +1,67 @@
+"""
+Exportação colunar (Parquet e Arrow IPC) das denúncias.
+
+As linhas chegam como tuplas na ordem de `COLUMNS`, vindas de um cursor do
+lado do servidor, e são convertidas em `RecordBatch` de `batch_size`
+linhas. Cada lote vira um row group do Parquet (ou um batch do arquivo
+Arrow), então a memória fica limitada a um lote por vez.
+"""
+
+from collections.abc import Iterable
+from itertools import islice
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+FORMATS = ("parquet", "arrow")
+DEFAULT_BATCH_SIZE = 50_000
+
+# campos do queryset, na ordem das colunas de `SCHEMA`
+COLUMNS = (
+    "id", "protocolo", "categoria__nome", "status", "created_at", "updated_at", "latitude", "longitude", "descricao",
+)
+SCHEMA = pa.schema(
+    [
+        pa.field("id", pa.string(), nullable=False),
+        pa.field("protocolo", pa.string(), nullable=False),
+        pa.field("categoria", pa.string(), nullable=False),
+        pa.field("status", pa.string(), nullable=False),
+        pa.field("created_at", pa.timestamp("us", tz="UTC"), nullable=False),
+        pa.field("updated_at", pa.timestamp("us", tz="UTC"), nullable=False),
+        pa.field("latitude", pa.float64()),
+        pa.field("longitude", pa.float64()),
+        pa.field("descricao", pa.string()),
+    ]
+)
+
+
+def _batches(rows: Iterable[tuple], batch_size: int):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            return
+        columns = list(zip(*chunk, strict=True))
+        columns[0] = [str(value) for value in columns[0]]  # UUID -> texto
+        yield pa.record_batch(
+            [pa.array(values, type=field.type) for values, field in zip(columns, SCHEMA, strict=True)],
+            schema=SCHEMA,
+        )
+
+
+def write_table(rows: Iterable[tuple], fileobj, formato: str, *, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Grava `rows` em `fileobj` como Parquet (zstd) ou Arrow IPC (formato de
+    arquivo). Retorna a quantidade de linhas escritas.
+    """
+    if formato == "parquet":
+        writer = pq.ParquetWriter(fileobj, SCHEMA, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(fileobj, SCHEMA, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+
+    total = 0
+    with writer:
+        for batch in _batches(rows, batch_size):
+            writer.write_batch(batch)
+            total += batch.num_rows
+    return total
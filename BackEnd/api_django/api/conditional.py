@@ -0,0 +1,82 @@
+"""
+Suporte a GET condicional (ETag / Last-Modified) nos endpoints de leitura.
+
+Cada view decorada com `conditional_get` implementa
+`get_conditional_validators(request, *args, **kwargs)`, que devolve
+`(etag, last_modified)`. Os endpoints de coleção usam a geração do cache
+de respostas (`generation_validators`), incrementada em toda escrita de
+denúncia ou categoria: validar custa uma leitura no cache, sem consulta ao
+banco, inclusive quando a própria resposta sai do cache. O detalhe usa o
+`updated_at` da denúncia. Quando o cliente já possui a versão atual, a view
+responde 304 sem serializar nada.
+"""
+
+import datetime
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from api import cache as api_cache
+
+
+def queryset_watermark(queryset) -> tuple[datetime.datetime | None, int]:
+    """Retorna `(max(updated_at), count)` do queryset em uma única query."""
+    data = queryset.order_by().aggregate(last_modified=Max("updated_at"), total=Count("pk"))
+    return data["last_modified"], data["total"]
+
+
+def build_etag(*parts) -> str:
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def generation_validators(scope: str, request, *parts) -> tuple[str, datetime.datetime]:
+    """
+    `(etag, last_modified)` a partir da geração de `api.cache`. Filtros e
+    paginação não precisam entrar na ETag: ela é comparada por URL.
+    """
+    generation, changed_at = api_cache.generation_watermark()
+    etag = build_etag(scope, request.accepted_renderer.format, generation, *parts)
+    return etag, changed_at
+
+
+def _timestamp(value: datetime.datetime | None) -> int | None:
+    if value is None:
+        return None
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, datetime.UTC)
+    return int(value.timestamp())
+
+
+def conditional_get(method):
+    """
+    Decorator para o `get` de uma view DRF. Roda depois de autenticação e
+    permissões (dentro do handler), então 304 nunca vaza dados protegidos.
+    """
+
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        etag, last_modified = self.get_conditional_validators(request, *args, **kwargs)
+        last_modified_ts = _timestamp(last_modified)
+
+        response = None
+        if etag is not None or last_modified_ts is not None:
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+        if response is None:
+            response = method(self, request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            if last_modified_ts is not None and not response.has_header("Last-Modified"):
+                response["Last-Modified"] = http_date(last_modified_ts)
+            if etag is not None:
+                response.headers.setdefault("ETag", etag)
+            # força o navegador a revalidar (If-None-Match) em vez de reusar às cegas
+            response.headers.setdefault("Cache-Control", "no-cache")
+            patch_vary_headers(response, ("Accept", "Authorization"))
+        return response
+
+    return wrapper
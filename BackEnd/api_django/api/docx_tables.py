@@ -0,0 +1,62 @@
+"""
+Inserção rápida de linhas em tabelas do python-docx.
+
+`table.add_row()` percorre o XML da tabela a cada chamada (custo
+quadrático). Aqui as linhas são montadas como texto WordprocessingML,
+analisadas pelo lxml em blocos de `chunk_size` e anexadas de uma vez ao
+`<w:tbl>`, produzindo o mesmo XML que `cell.text = ...` geraria.
+"""
+
+import re
+from collections.abc import Iterable
+from itertools import islice
+from xml.sax.saxutils import escape
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+# caracteres de controle que não são permitidos em XML 1.0
+_INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_TEXT_SPECIALS = re.compile(r"(\n|\t)")
+
+
+def _run_xml(text: str) -> str:
+    """Conteúdo de `<w:r>` equivalente ao setter `cell.text` (quebras e tabs viram elementos)."""
+    parts = []
+    for piece in _TEXT_SPECIALS.split(_INVALID_XML_CHARS.sub("", text)):
+        if piece == "\n":
+            parts.append("<w:br/>")
+        elif piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece:
+            preserve = ' xml:space="preserve"' if piece != piece.strip() else ""
+            parts.append(f"<w:t{preserve}>{escape(piece)}</w:t>")
+    return "".join(parts)
+
+
+def _cell_xml(text: str, width: int | None) -> str:
+    tc_pr = f'<w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr>' if width else ""
+    return f"<w:tc>{tc_pr}<w:p><w:r>{_run_xml(text)}</w:r></w:p></w:tc>"
+
+
+def append_table_rows(table, rows: Iterable[Iterable[str]], *, chunk_size: int = 2000) -> int:
+    """
+    Anexa `rows` (sequências de textos, uma por coluna) ao final de `table`.
+    As larguras das colunas são copiadas da primeira linha. Retorna a
+    quantidade de linhas inseridas.
+    """
+    widths = [tc.width.twips if tc.width is not None else None for tc in table._tbl.tr_lst[0].tc_lst]
+    tbl = table._tbl
+    rows = iter(rows)
+    total = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return total
+        body = "".join(
+            "<w:tr>" + "".join(_cell_xml(text or "", width) for text, width in zip(row, widths, strict=True)) + "</w:tr>"
+            for row in chunk
+        )
+        fragment = parse_xml(f"<w:tbl {nsdecls('w')}>{body}</w:tbl>")
+        tbl.extend(list(fragment))
+        total += len(chunk)
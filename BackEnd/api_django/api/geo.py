@@ -0,0 +1,67 @@
+from django.contrib.gis.db.models import PointField
+from django.contrib.gis.db.models.functions import GeoFunc
+from django.db.models import BooleanField, FloatField, Func, Value
+from django.db.models.functions import Cast
+
+
+class X(GeoFunc):
+    """Longitude (`ST_X`) de um ponto, calculada direto no PostGIS."""
+
+    function = "ST_X"
+    output_field = FloatField()
+
+
+class Y(GeoFunc):
+    """Latitude (`ST_Y`) de um ponto, calculada direto no PostGIS."""
+
+    function = "ST_Y"
+    output_field = FloatField()
+
+
+def as_geography(expression):
+    """
+    `::geography(POINT,4326)`: distâncias em metros sobre o esferoide. É a
+    mesma expressão do índice GiST `denuncia_geog_gist_idx`, então filtros e
+    ordenações montados com ela usam o índice.
+    """
+    return Cast(expression, PointField(geography=True))
+
+
+class GeographyPoint(Func):
+    """Ponto `geography` (EPSG:4326) a partir de longitude e latitude."""
+
+    template = "ST_SetSRID(ST_MakePoint(%(expressions)s), 4326)::geography"
+    output_field = PointField(geography=True)
+
+    def __init__(self, lng: float, lat: float, **extra):
+        super().__init__(Value(float(lng)), Value(float(lat)), **extra)
+
+
+class DWithin(Func):
+    """`ST_DWithin` entre duas geografias: verdadeiro se estão a até `distance` metros."""
+
+    function = "ST_DWithin"
+    output_field = BooleanField()
+
+    def __init__(self, geography, point, distance: float, **extra):
+        super().__init__(geography, point, Value(float(distance)), **extra)
+
+
+class KnnDistance(Func):
+    """
+    Operador KNN `<->` do PostGIS. Num `ORDER BY`, percorre o índice GiST em
+    ordem de distância em vez de calcular e ordenar a distância de todas as
+    linhas; entre geografias o valor é a distância em metros (esfera).
+    """
+
+    arg_joiner = " <-> "
+    template = "(%(expressions)s)"
+    output_field = FloatField()
+
+
+def grid_cell_size(zoom: int, cell_pixels: int) -> float:
+    """
+    Converte um nível de zoom (tiles de 256px, Web Mercator) no tamanho,
+    em graus, de uma célula com `cell_pixels` de lado na tela.
+    """
+    return 360.0 / (256 * 2**zoom) * cell_pixels
@@ -0,0 +1,71 @@
+import io
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+from docx import Document
+
+from api.docx_tables import append_table_rows
+
+HEADERS = ["Protocolo", "Categoria", "Status", "Data de criação", "Descrição"]
+
+
+def _rows(total):
+    created = datetime(2025, 1, 1, 10, 30).strftime("%d/%m/%Y %H:%M")
+    for index in range(total):
+        yield (f"01J{index:023d}", "Furto", "Em análise", created, f"Denúncia de benchmark #{index}\nsegunda linha")
+
+
+def _new_table():
+    document = Document()
+    table = document.add_table(rows=1, cols=len(HEADERS))
+    for cell, header in zip(table.rows[0].cells, HEADERS, strict=True):
+        cell.text = header
+    return document, table
+
+
+def render_add_row(total):
+    """Implementação anterior: uma chamada a `add_row()` por denúncia."""
+    document, table = _new_table()
+    for row in _rows(total):
+        for cell, text in zip(table.add_row().cells, row, strict=True):
+            cell.text = text
+    document.save(io.BytesIO())
+
+
+def render_bulk(total):
+    document, table = _new_table()
+    append_table_rows(table, _rows(total))
+    document.save(io.BytesIO())
+
+
+class Command(BaseCommand):
+    help = "Compara o tempo de geração da tabela DOCX (add_row vs XML em lote)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000], help="Tamanhos a medir.")
+        parser.add_argument(
+            "--skip-add-row-above",
+            type=int,
+            default=None,
+            help=(
+                "Não mede a implementação antiga acima deste número de linhas. Por padrão mede "
+                "todos os tamanhos; a de 50.000 linhas é a que mostra o custo quadrático, mas demora."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'linhas':>8} {'add_row (s)':>12} {'lote (s)':>10} {'ganho':>8}")
+        for total in options["rows"]:
+            bulk = self._measure(render_bulk, total)
+            limit = options["skip_add_row_above"]
+            if limit is None or total <= limit:
+                legacy = self._measure(render_add_row, total)
+                self.stdout.write(f"{total:>8} {legacy:>12.2f} {bulk:>10.2f} {legacy / bulk:>7.1f}x")
+            else:
+                self.stdout.write(f"{total:>8} {'-':>12} {bulk:>10.2f} {'-':>8}")
+
+    def _measure(self, render, total):
+        start = time.perf_counter()
+        render(total)
+        return time.perf_counter() - start
@@ -0,0 +1,77 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.geo import X, Y
+from api.models import Denuncia
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+from api.serializers import DenunciaListSerializer
+from api.serializers.denuncia.heatmap import (
+    HEATMAP_POINT_COLUMNS,
+    DenunciaHeatmapSerializer,
+)
+
+RENDERERS = {"json (DRF)": JSONRenderer(), "orjson": ORJSONRenderer()}
+PARSERS = {"json (DRF)": JSONParser(), "orjson": ORJSONParser()}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara o JSONRenderer/JSONParser do DRF com o par orjson nos payloads "
+        "da listagem (DenunciaListSerializer) e do heatmap (DenunciaHeatmapSerializer)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000, help="Denúncias em cada payload.")
+        parser.add_argument("--repeat", type=int, default=20, help="Repetições; vale o melhor tempo.")
+
+    def handle(self, *args, **options):
+        rows, repeat = max(1, options["rows"]), max(1, options["repeat"])
+        base = Denuncia.objects.order_by("-created_at", "-id")
+        recentes = base[:rows]
+        pontos = base.annotate(lat=Y("localizacao"), lng=X("localizacao")).values_list(*HEATMAP_POINT_COLUMNS)[:rows]
+        # serializers avaliados antes de medir: só a (de)serialização JSON entra no tempo
+        payloads = {
+            "listagem": DenunciaListSerializer(recentes, many=True).data,
+            "listagem (fields=todos)": DenunciaListSerializer(
+                recentes, many=True, context={"fields": DenunciaListSerializer.available_fields()}
+            ).data,
+            "heatmap": DenunciaHeatmapSerializer(pontos, many=True).data,
+        }
+        total = len(payloads["listagem"])
+        if total < rows:
+            self.stdout.write(
+                self.style.WARNING(f"Apenas {total} denúncias no banco (use benchmark_queries --rows para gerar mais).")
+            )
+
+        self.stdout.write(f"{total} itens por payload, melhor de {repeat} repetições")
+        self.stdout.write(f"{'payload':<24} {'operação':<8} {'json (DRF) ms':>14} {'orjson ms':>10} {'ganho':>7} {'bytes':>10}")
+        for label, data in payloads.items():
+            body = RENDERERS["json (DRF)"].render(data)
+            if ORJSONParser().parse(io.BytesIO(RENDERERS["orjson"].render(data))) != JSONParser().parse(io.BytesIO(body)):
+                self.stdout.write(self.style.ERROR(f"{label}: saídas diferentes entre os renderers"))
+
+            render = {name: self._best(renderer.render, lambda d=data: (d,), repeat) for name, renderer in RENDERERS.items()}
+            parse = {
+                name: self._best(parser.parse, lambda b=body: (io.BytesIO(b),), repeat) for name, parser in PARSERS.items()
+            }
+            for operation, timings in (("render", render), ("parse", parse)):
+                drf_ms, orjson_ms = timings["json (DRF)"] * 1000, timings["orjson"] * 1000
+                speedup = drf_ms / orjson_ms if orjson_ms else 0.0
+                self.stdout.write(
+                    f"{label:<24} {operation:<8} {drf_ms:>14.2f} {orjson_ms:>10.2f} {speedup:>6.1f}x {len(body):>10,}"
+                )
+
+    def _best(self, func, make_args, repeat) -> float:
+        """Melhor tempo de `func(*make_args())`; os argumentos são montados fora da medição."""
+        best = float("inf")
+        for _ in range(repeat):
+            args = make_args()
+            started = time.perf_counter()
+            func(*args)
+            best = min(best, time.perf_counter() - started)
+        return best
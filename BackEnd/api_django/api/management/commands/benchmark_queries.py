@@ -0,0 +1,177 @@
+from datetime import timedelta
+
+from django.contrib.gis.geos import Polygon
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, F, Value
+from django.utils import timezone
+
+from api.cache import invalidate_denuncia_cache
+from api.categories import categoria_id
+from api.geo import DWithin, GeographyPoint, KnnDistance, as_geography
+from api.models import UUID7_SQL, Denuncia
+from api.pagination import Row
+from api.stats import rebuild_daily_stats
+
+CATEGORIAS = [
+    "Furto", "Roubo", "Vandalismo", "Violência", "Tráfico",
+    "Perturbação", "Depredação", "Briga", "Fraude", "Outros",
+]
+PAGINA_PROFUNDA = 100_000  # OFFSET usado para comparar com a paginação por keyset
+
+# generate_series é bem mais rápido que bulk_create para milhões de linhas e
+# permite espalhar created_at (bulk_create sobrescreve campos auto_now_add).
+SEED_SQL = f"""
+    INSERT INTO api_denuncia
+        (id, protocolo, categoria_id, descricao, localizacao, status, created_at, updated_at)
+    SELECT
+        {UUID7_SQL.format(timestamp="t.created_at")},
+        upper(substr(md5(random()::text || t.g::text), 1, 26)),
+        (%(categorias)s::smallint[])[1 + floor(random() * %(total_categorias)s)::int],
+        'Denúncia de benchmark #' || t.g,
+        ST_SetSRID(ST_MakePoint(-73.98 + random() * 39.19, -33.75 + random() * 39.02), 4326),
+        (ARRAY['em_analise', 'aprovado', 'rejeitado'])[1 + floor(random() * 3)::int],
+        t.created_at,
+        t.created_at + random() * interval '72 hours'
+    FROM (
+        SELECT g, now() - random() * make_interval(days => %(days)s) AS created_at
+        FROM generate_series(1, %(rows)s) AS g
+    ) AS t
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera denúncias fictícias e mostra o EXPLAIN ANALYZE das consultas dos "
+        "endpoints com e sem os índices de Denuncia."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=0, help="Quantidade de denúncias a inserir antes de medir.")
+        parser.add_argument("--days", type=int, default=365, help="Janela (dias) usada para espalhar created_at.")
+        parser.add_argument(
+            "--skip-before",
+            action="store_true",
+            help="Não mede o plano sem índices (apenas o estado atual).",
+        )
+
+    def handle(self, *args, **options):
+        if options["rows"] > 0:
+            self._seed(options["rows"], options["days"])
+
+        queries = self._queries()
+        if not options["skip_before"]:
+            self.stdout.write(self.style.MIGRATE_HEADING("== Antes (sem índices) =="))
+            with transaction.atomic():
+                dropped = self._drop_indexes()
+                self.stdout.write(f"Índices removidos temporariamente: {', '.join(dropped) or '-'}")
+                self._explain_all(queries)
+                transaction.set_rollback(True)  # os índices voltam no rollback
+
+        self.stdout.write(self.style.MIGRATE_HEADING("== Depois (com índices) =="))
+        self._explain_all(queries)
+
+    def _seed(self, rows, days):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                SEED_SQL,
+                {
+                    "categorias": [categoria_id(nome, create=True) for nome in CATEGORIAS],
+                    "total_categorias": len(CATEGORIAS),
+                    "rows": rows,
+                    "days": days,
+                },
+            )
+            cursor.execute("ANALYZE api_denuncia")
+        invalidate_denuncia_cache()
+        rebuild_daily_stats()
+        self.stdout.write(self.style.SUCCESS(f"{rows} denúncias inseridas."))
+
+    def _queries(self):
+        agora = timezone.now()
+        inicio_mes = agora.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        ultimos_30 = agora - timedelta(days=30)
+        sao_paulo = Polygon.from_bbox((-46.83, -23.78, -46.36, -23.36))
+        sao_paulo.srid = 4326
+        centro_sp = GeographyPoint(-46.6333, -23.5505)
+        base = Denuncia.objects.all()
+        recentes = base.order_by("-created_at", "-id")
+        queries = [
+            (
+                "listagem (status, mais recentes)",
+                base.filter(status="em_analise").order_by("-created_at")[:10],
+            ),
+            (
+                "listagem (categoria + período)",
+                base.filter(categoria_id=categoria_id("Furto"), created_at__gte=ultimos_30).order_by("-created_at")[:10],
+            ),
+            (
+                "relatório (total por categoria no período)",
+                base.filter(created_at__gte=ultimos_30).values("categoria").annotate(total=Count("id")).order_by(),
+            ),
+            (
+                "heatmap (bbox + período)",
+                base.filter(localizacao__within=sao_paulo, created_at__gte=ultimos_30).values_list(
+                    "id", "categoria", "localizacao", "created_at"
+                ),
+            ),
+            (
+                "proximidade (raio de 1 km)",
+                base.filter(DWithin(as_geography("localizacao"), centro_sp, 1_000)).order_by("-created_at")[:20],
+            ),
+            (
+                "proximidade (20 mais próximas, KNN)",
+                base.order_by(KnnDistance(as_geography("localizacao"), centro_sp).asc())[:20],
+            ),
+            (
+                "dashboard (mês corrente por status)",
+                base.filter(created_at__gte=inicio_mes).values("status").annotate(total=Count("id")).order_by(),
+            ),
+            (
+                "relatório (período)",
+                base.filter(created_at__gte=ultimos_30, created_at__lte=agora).order_by("created_at"),
+            ),
+            (
+                "marca d'água (max updated_at)",
+                base.order_by("-updated_at").values_list("updated_at", flat=True)[:1],
+            ),
+            (
+                f"listagem paginada (OFFSET {PAGINA_PROFUNDA})",
+                recentes[PAGINA_PROFUNDA:PAGINA_PROFUNDA + 20],
+            ),
+        ]
+        # mesma página via keyset, a partir da linha anterior a ela
+        anterior = list(recentes.values_list("created_at", "id")[PAGINA_PROFUNDA - 1:PAGINA_PROFUNDA])
+        if anterior:
+            queries.append(
+                (
+                    "listagem paginada (keyset)",
+                    recentes.alias(keyset_position=Row(F("created_at"), F("id")))
+                    .filter(keyset_position__lt=Row(*map(Value, anterior[0])))[:20],
+                )
+            )
+        return queries
+
+    def _drop_indexes(self):
+        """Remove (dentro da transação atual) os índices de Meta e o GiST de `localizacao`."""
+        table = Denuncia._meta.db_table
+        meta_names = {index.name for index in Denuncia._meta.indexes}
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, table)
+            dropped = [
+                name
+                for name, info in constraints.items()
+                if info["index"]
+                and not info["primary_key"]
+                and not info["unique"]
+                and (name in meta_names or info["columns"] == ["localizacao"])
+            ]
+            for name in dropped:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+        return sorted(dropped)
+
+    def _explain_all(self, queries):
+        for label, queryset in queries:
+            self.stdout.write(self.style.SQL_TABLE(f"-- {label}"))
+            self.stdout.write(queryset.explain(analyze=True, buffers=True))
+            self.stdout.write("")
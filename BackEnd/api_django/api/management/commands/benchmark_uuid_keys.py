@@ -0,0 +1,84 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from api.models import UUID7_SQL
+
+# Mesmo formato da chave de `api_denuncia` (uuid PK) e do índice em `id` da
+# tabela de histórico; as tabelas são criadas e descartadas (rollback) a cada medição.
+KEY_EXPRESSIONS = {
+    "uuid4": "gen_random_uuid()",
+    "uuid7": UUID7_SQL.format(timestamp="clock_timestamp()"),
+}
+
+CREATE_SQL = """
+    CREATE TABLE {table} (
+        id uuid PRIMARY KEY,
+        created_at timestamptz NOT NULL DEFAULT clock_timestamp(),
+        descricao text NOT NULL
+    )
+"""
+
+INSERT_SQL = """
+    INSERT INTO {table} (id, descricao)
+    SELECT {key}, 'Denúncia de benchmark #' || g
+    FROM generate_series(1, %(batch)s) AS g
+"""
+
+SIZES_SQL = """
+    SELECT pg_relation_size(%(index)s::regclass), pg_relation_size(%(table)s::regclass)
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara inserção com chave primária UUIDv4 (aleatória) e UUIDv7 (ordenada "
+        "pelo tempo): linhas/s, WAL gerado e tamanho do índice da chave."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="Linhas inseridas em cada medição.")
+        parser.add_argument(
+            "--batch-size", type=int, default=10_000, help="Linhas por INSERT (ingestão contínua em lotes)."
+        )
+
+    def handle(self, *args, **options):
+        rows, batch_size = max(1, options["rows"]), max(1, options["batch_size"])
+        self.stdout.write(f"{rows} linhas em lotes de {batch_size}")
+        self.stdout.write(f"{'chave':<6} {'linhas/s':>12} {'WAL (MB)':>10} {'índice PK (MB)':>15} {'tabela (MB)':>12}")
+        for kind, key in KEY_EXPRESSIONS.items():
+            result = self._measure(kind, key, rows, batch_size)
+            self.stdout.write(
+                f"{kind:<6} {result['rows_per_second']:>12,.0f} {result['wal_mb']:>10.1f} "
+                f"{result['index_mb']:>15.1f} {result['table_mb']:>12.1f}"
+            )
+
+    def _measure(self, kind, key, rows, batch_size) -> dict[str, float]:
+        table = f"benchmark_keys_{kind}"
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(CREATE_SQL.format(table=table))
+            cursor.execute("SELECT pg_current_wal_insert_lsn()")
+            wal_start = cursor.fetchone()[0]
+
+            started = time.perf_counter()
+            inserted = 0
+            while inserted < rows:
+                batch = min(batch_size, rows - inserted)
+                cursor.execute(INSERT_SQL.format(table=table, key=key), {"batch": batch})
+                inserted += batch
+            elapsed = time.perf_counter() - started
+
+            cursor.execute("SELECT pg_wal_lsn_diff(pg_current_wal_insert_lsn(), %s)", [wal_start])
+            wal_bytes = cursor.fetchone()[0]
+            cursor.execute(SIZES_SQL, {"index": f"{table}_pkey", "table": table})
+            index_bytes, table_bytes = cursor.fetchone()
+            transaction.set_rollback(True)  # a tabela de teste some no rollback
+
+        megabyte = 1024 * 1024
+        return {
+            "rows_per_second": rows / elapsed if elapsed else 0.0,
+            "wal_mb": float(wal_bytes) / megabyte,
+            "index_mb": index_bytes / megabyte,
+            "table_mb": table_bytes / megabyte,
+        }
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import cache_stats, invalidate_denuncia_cache, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Mostra hits/misses do cache de respostas por endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zera os contadores após exibir.")
+        parser.add_argument("--invalidate", action="store_true", help="Descarta as respostas em cache.")
+
+    def handle(self, *args, **options):
+        for endpoint, stats in cache_stats().items():
+            total = stats["hits"] + stats["misses"]
+            ratio = (stats["hits"] / total * 100) if total else 0.0
+            self.stdout.write(
+                f"{endpoint}: hits={stats['hits']} misses={stats['misses']} "
+                f"hit_rate={ratio:.1f}% ttl={stats['ttl']}s"
+            )
+
+        if options["reset"]:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Contadores zerados."))
+        if options["invalidate"]:
+            invalidate_denuncia_cache()
+            self.stdout.write(self.style.SUCCESS("Cache de respostas invalidado."))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from api import report_cache
+
+
+class Command(BaseCommand):
+    help = "Remove arquivos do cache de relatórios (LRU por tamanho e/ou idade)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-bytes",
+            type=int,
+            default=None,
+            help="Tamanho máximo do cache após a limpeza. Padrão: REPORT_CACHE_MAX_BYTES.",
+        )
+        parser.add_argument("--older-than-days", type=float, default=None, help="Remove arquivos não usados há N dias.")
+        parser.add_argument("--clear", action="store_true", help="Esvazia o cache.")
+
+    def handle(self, *args, **options):
+        limit = 0 if options["clear"] else options["max_bytes"]
+        if limit is None:
+            limit = report_cache.max_bytes()
+        older_than = options["older_than_days"] * 86400 if options["older_than_days"] is not None else None
+
+        removed, freed = report_cache.evict(limit, older_than=older_than)
+        files, used = report_cache.usage()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{removed} arquivo(s) removido(s), {freed} bytes liberados. "
+                f"Restam {files} arquivo(s), {used} bytes."
+            )
+        )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from api.stats import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = "Recalcula o rollup diário de denúncias (DenunciaDailyStats)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", help="Primeiro dia (YYYY-MM-DD). Padrão: desde o início.")
+        parser.add_argument("--end", help="Último dia (YYYY-MM-DD). Padrão: até hoje.")
+
+    def handle(self, *args, **options):
+        start = self._parse(options["start"], "--start")
+        end = self._parse(options["end"], "--end")
+        if start and end and start > end:
+            raise CommandError("--start não pode ser maior que --end.")
+
+        total = rebuild_daily_stats(start, end)
+        self.stdout.write(self.style.SUCCESS(f"{total} linhas de rollup gravadas."))
+
+    def _parse(self, raw_value, option):
+        if not raw_value:
+            return None
+        parsed = parse_date(raw_value)
+        if parsed is None:
+            raise CommandError(f"{option} inválido. Use YYYY-MM-DD.")
+        return parsed
@@ -0,0 +1,102 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from api.choice import ReportJobStatusChoices
+from api.report_jobs import (
+    claim_pending_jobs,
+    requeue_stale_jobs,
+    run_report_job,
+    touch_running_jobs,
+)
+from api.workers import render_report_job, setup_worker
+
+
+class Command(BaseCommand):
+    help = "Processa os jobs de relatório pendentes em um pool de processos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=min(4, os.cpu_count() or 1),
+            help="Processos simultâneos. 0 executa no próprio processo (útil para depuração).",
+        )
+        parser.add_argument("--poll", type=float, default=2.0, help="Intervalo (s) entre consultas à fila.")
+        parser.add_argument("--once", action="store_true", help="Processa a fila atual e encerra.")
+        parser.add_argument(
+            "--requeue-interval",
+            type=float,
+            default=60.0,
+            help="Intervalo (s) entre verificações de jobs travados em processamento.",
+        )
+
+    def handle(self, *args, **options):
+        self._next_requeue = 0.0
+        if options["workers"] <= 0:
+            self._run_inline(options)
+        else:
+            self._run_pool(options)
+
+    def _requeue_stale(self, options, running=()):
+        """
+        Devolve à fila jobs travados (ex.: outro worker morreu), no máximo a
+        cada `--requeue-interval`. Antes renova `started_at` dos jobs em
+        execução neste worker, para relatórios longos não serem reenfileirados.
+        """
+        now = time.monotonic()
+        if now < self._next_requeue:
+            return
+        self._next_requeue = now + options["requeue_interval"]
+        touch_running_jobs(list(running))
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(self.style.WARNING(f"{requeued} job(s) travado(s) devolvido(s) à fila."))
+
+    def _run_inline(self, options):
+        while True:
+            self._requeue_stale(options)
+            job_ids = claim_pending_jobs(1)
+            for job_id in job_ids:
+                self._report(job_id, run_report_job(job_id))
+            if not job_ids:
+                if options["once"]:
+                    return
+                time.sleep(options["poll"])
+
+    def _run_pool(self, options):
+        workers = options["workers"]
+        # spawn: cada processo abre a própria conexão, sem herdar sockets do pai
+        context = multiprocessing.get_context("spawn")
+        connections.close_all()
+        self.stdout.write(f"Worker de relatórios iniciado com {workers} processo(s).")
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=setup_worker) as pool:
+            running = {}
+            while True:
+                self._requeue_stale(options, running.values())
+                for job_id in claim_pending_jobs(workers - len(running)):
+                    running[pool.submit(render_report_job, job_id)] = job_id
+
+                if not running:
+                    if options["once"]:
+                        return
+                    time.sleep(options["poll"])
+                    continue
+
+                done, _ = wait(running, timeout=options["poll"], return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id = running.pop(future)
+                    try:
+                        status = future.result()
+                    except Exception as exc:  # processo do pool morreu ou job sumiu
+                        status = f"erro ({exc})"
+                    self._report(job_id, status)
+
+    def _report(self, job_id, status):
+        style = self.style.SUCCESS if status == ReportJobStatusChoices.CONCLUIDO else self.style.ERROR
+        self.stdout.write(style(f"Job {job_id}: {status}"))
@@ -1,5 +1,4 @@
 import random
-import uuid
 from datetime import timedelta
 
 from django.contrib.gis.geos import Point
@@ -7,7 +6,10 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from api import choice
+from api.cache import invalidate_denuncia_cache
+from api.categories import get_categoria
 from api.models import Denuncia
+from api.stats import rebuild_daily_stats
 
 
 class Command(BaseCommand):
@@ -26,8 +28,11 @@ class Command(BaseCommand):
             return
 
         categorias = [
-            "Furto", "Roubo", "Vandalismo", "Violência", "Tráfico",
-            "Perturbação", "Depredação", "Briga", "Fraude", "Outros"
+            get_categoria(nome)
+            for nome in (
+                "Furto", "Roubo", "Vandalismo", "Violência", "Tráfico",
+                "Perturbação", "Depredação", "Briga", "Fraude", "Outros",
+            )
         ]
         status_source = getattr(choice.STATUS_CHOICES, "choices", choice.STATUS_CHOICES)
         status_choices = [item[0] for item in status_source]
@@ -46,7 +51,6 @@ class Command(BaseCommand):
 
             denuncias.append(
                 Denuncia(
-                    id=uuid.uuid4(),
                     categoria=random.choice(categorias),
                     descricao=f"Denúncia automática #{existentes + i + 1}",
                     localizacao=Point(lon, lat, srid=4326),
@@ -57,4 +61,7 @@ class Command(BaseCommand):
             )
 
         Denuncia.objects.bulk_create(denuncias, ignore_conflicts=True)
+        # bulk_create não dispara post_save
+        invalidate_denuncia_cache()
+        rebuild_daily_stats()
         self.stdout.write(self.style.SUCCESS(f"{len(denuncias)} denúncias criadas."))
@@ -0,0 +1,34 @@
+from typing import ClassVar
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies: ClassVar[list[tuple[str, str]]] = [
+        ('api', '0003_historicaldenuncia'),
+    ]
+
+    operations: ClassVar[list] = [
+        migrations.AddIndex(
+            model_name='denuncia',
+            index=models.Index(fields=['created_at'], name='denuncia_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='denuncia',
+            index=models.Index(fields=['updated_at'], name='denuncia_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='denuncia',
+            index=models.Index(fields=['status', 'created_at'], name='denuncia_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='denuncia',
+            index=models.Index(
+                django.db.models.functions.text.Upper('categoria'),
+                models.F('created_at'),
+                name='denuncia_categ_created_idx',
+            ),
+        ),
+    ]
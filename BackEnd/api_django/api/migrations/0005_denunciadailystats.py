@@ -0,0 +1,38 @@
+from typing import ClassVar
+
+from django.db import migrations, models
+
+
+def populate_daily_stats(apps, schema_editor):
+    from api.stats import rebuild_daily_stats
+
+    rebuild_daily_stats(
+        denuncia_model=apps.get_model('api', 'Denuncia'),
+        stats_model=apps.get_model('api', 'DenunciaDailyStats'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies: ClassVar[list[tuple[str, str]]] = [
+        ('api', '0004_denuncia_indexes'),
+    ]
+
+    operations: ClassVar[list] = [
+        migrations.CreateModel(
+            name='DenunciaDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('categoria', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('em_analise', 'Em análise'), ('aprovado', 'Aprovado'), ('rejeitado', 'Rejeitado')], max_length=20)),
+                ('total', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [
+                    models.UniqueConstraint(fields=('day', 'categoria', 'status'), name='denuncia_daily_stats_unique'),
+                ],
+            },
+        ),
+        migrations.RunPython(populate_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+import uuid
+from typing import ClassVar
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+import api.models
+import api.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies: ClassVar[list[tuple[str, str]]] = [
+        ('api', '0005_denunciadailystats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations: ClassVar[list] = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('formato', models.CharField(max_length=10)),
+                ('data_inicio', models.DateTimeField(blank=True, null=True)),
+                ('data_fim', models.DateTimeField(blank=True, null=True)),
+                ('chave', models.CharField(max_length=120)),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('concluido', 'Concluído'), ('falhou', 'Falhou')], default='pendente', max_length=20)),
+                ('arquivo', models.FileField(blank=True, null=True, storage=api.storage.ReportFileStorage(), upload_to=api.models.report_job_upload_path)),
+                ('erro', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='report_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='report_job_status_created_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status__in', ['pendente', 'processando'])), fields=('chave',), name='report_job_active_chave_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+from typing import ClassVar
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies: ClassVar[list[tuple[str, str]]] = [
+        ('api', '0006_reportjob'),
+    ]
+
+    operations: ClassVar[list] = [
+        migrations.AddIndex(
+            model_name='denuncia',
+            index=models.Index(fields=['created_at', 'id'], name='denuncia_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='denuncia',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='denuncia_status_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='denuncia',
+            index=models.Index(
+                django.db.models.functions.text.Upper('categoria'),
+                models.F('created_at'),
+                models.F('id'),
+                name='denuncia_categ_created_id_idx',
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name='denuncia',
+            name='denuncia_created_at_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='denuncia',
+            name='denuncia_status_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='denuncia',
+            name='denuncia_categ_created_idx',
+        ),
+    ]
@@ -0,0 +1,48 @@
+from typing import ClassVar
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_VECTOR_SQL = """
+CREATE FUNCTION api_denuncia_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('portuguese', coalesce(NEW.categoria, '')), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce(NEW.descricao, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER denuncia_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF categoria, descricao, search_vector ON api_denuncia
+    FOR EACH ROW EXECUTE FUNCTION api_denuncia_search_vector_update();
+
+-- preenche as linhas existentes (o trigger recalcula a coluna)
+UPDATE api_denuncia SET search_vector = NULL;
+"""
+
+DROP_SEARCH_VECTOR_SQL = """
+DROP TRIGGER IF EXISTS denuncia_search_vector_trigger ON api_denuncia;
+DROP FUNCTION IF EXISTS api_denuncia_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies: ClassVar[list[tuple[str, str]]] = [
+        ('api', '0007_denuncia_keyset_indexes'),
+    ]
+
+    operations: ClassVar[list] = [
+        migrations.AddField(
+            model_name='denuncia',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_SQL, reverse_sql=DROP_SEARCH_VECTOR_SQL),
+        migrations.AddIndex(
+            model_name='denuncia',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='denuncia_search_gin_idx'),
+        ),
+    ]
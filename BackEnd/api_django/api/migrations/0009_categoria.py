@@ -0,0 +1,192 @@
+from typing import ClassVar
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+# Uma categoria por nome sem diferenciar maiúsculas/espaços; entre grafias
+# diferentes do mesmo nome, fica a mais usada. Considera também o histórico,
+# que pode citar categorias de denúncias já removidas.
+POPULATE_CATEGORIAS_SQL = """
+INSERT INTO api_categoria (nome)
+SELECT DISTINCT ON (upper(nome)) nome
+FROM (
+    SELECT btrim(categoria) AS nome FROM api_denuncia
+    UNION ALL
+    SELECT btrim(categoria) AS nome FROM api_historicaldenuncia
+) AS todas
+GROUP BY nome
+ORDER BY upper(nome), count(*) DESC, nome;
+
+UPDATE api_denuncia AS d SET categoria_ref_id = c.id
+FROM api_categoria AS c WHERE upper(btrim(d.categoria)) = upper(c.nome);
+
+UPDATE api_historicaldenuncia AS h SET categoria_ref_id = c.id
+FROM api_categoria AS c WHERE upper(btrim(h.categoria)) = upper(c.nome);
+
+-- verifica agora a FK adiada, senão o ALTER TABLE seguinte falha com
+-- "pending trigger events"
+SET CONSTRAINTS ALL IMMEDIATE;
+"""
+
+RESTORE_CATEGORIA_TEXT_SQL = """
+UPDATE api_denuncia AS d SET categoria = c.nome
+FROM api_categoria AS c WHERE d.categoria_ref_id = c.id;
+
+UPDATE api_historicaldenuncia AS h SET categoria = c.nome
+FROM api_categoria AS c WHERE h.categoria_ref_id = c.id;
+
+SET CONSTRAINTS ALL IMMEDIATE;
+"""
+
+# O trigger de busca (0008) lia `NEW.categoria` e depende dessa coluna: é
+# removido antes de trocar a coluna e recriado lendo o nome pela FK.
+OLD_SEARCH_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION api_denuncia_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('portuguese', coalesce(NEW.categoria, '')), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce(NEW.descricao, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER denuncia_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF categoria, descricao, search_vector ON api_denuncia
+    FOR EACH ROW EXECUTE FUNCTION api_denuncia_search_vector_update();
+"""
+
+DROP_SEARCH_TRIGGER_SQL = "DROP TRIGGER IF EXISTS denuncia_search_vector_trigger ON api_denuncia;"
+
+SEARCH_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION api_denuncia_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('portuguese', coalesce(
+            (SELECT nome FROM api_categoria WHERE id = NEW.categoria_id), ''
+        )), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce(NEW.descricao, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER denuncia_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF categoria_id, descricao, search_vector ON api_denuncia
+    FOR EACH ROW EXECUTE FUNCTION api_denuncia_search_vector_update();
+
+-- renomear uma categoria recalcula o vetor das denúncias dela
+CREATE FUNCTION api_categoria_search_vector_refresh() RETURNS trigger AS $$
+BEGIN
+    UPDATE api_denuncia SET search_vector = NULL WHERE categoria_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER categoria_search_vector_trigger
+    AFTER UPDATE OF nome ON api_categoria
+    FOR EACH ROW WHEN (OLD.nome IS DISTINCT FROM NEW.nome)
+    EXECUTE FUNCTION api_categoria_search_vector_refresh();
+"""
+
+DROP_NEW_SEARCH_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS categoria_search_vector_trigger ON api_categoria;
+DROP FUNCTION IF EXISTS api_categoria_search_vector_refresh();
+DROP TRIGGER IF EXISTS denuncia_search_vector_trigger ON api_denuncia;
+"""
+
+
+def rebuild_stats(apps, schema_editor):
+    from api.stats import rebuild_daily_stats
+
+    rebuild_daily_stats(
+        denuncia_model=apps.get_model('api', 'Denuncia'),
+        stats_model=apps.get_model('api', 'DenunciaDailyStats'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies: ClassVar[list[tuple[str, str]]] = [
+        ('api', '0008_denuncia_search_vector'),
+    ]
+
+    operations: ClassVar[list] = [
+        migrations.CreateModel(
+            name='Categoria',
+            fields=[
+                ('id', models.SmallAutoField(primary_key=True, serialize=False)),
+                ('nome', models.CharField(max_length=100)),
+            ],
+            options={
+                'ordering': ['nome'],
+                'constraints': [
+                    models.UniqueConstraint(
+                        django.db.models.functions.text.Upper('nome'), name='categoria_nome_upper_unique'
+                    ),
+                ],
+            },
+        ),
+        # rollup diário: esvaziado aqui e recalculado no fim (na reversão, recalculado com o texto)
+        migrations.RunPython(migrations.RunPython.noop, rebuild_stats),
+        migrations.RemoveConstraint(model_name='denunciadailystats', name='denuncia_daily_stats_unique'),
+        migrations.RunSQL('DELETE FROM api_denunciadailystats', reverse_sql='DELETE FROM api_denunciadailystats'),
+        migrations.RemoveField(model_name='denunciadailystats', name='categoria'),
+        migrations.AddField(
+            model_name='denunciadailystats',
+            name='categoria',
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.categoria'
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='denunciadailystats',
+            constraint=models.UniqueConstraint(fields=('day', 'categoria', 'status'), name='denuncia_daily_stats_unique'),
+        ),
+        # denúncias e histórico: coluna nova, dados copiados, coluna de texto removida
+        migrations.AddField(
+            model_name='denuncia',
+            name='categoria_ref',
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='+',
+                to='api.categoria',
+            ),
+        ),
+        migrations.AddField(
+            model_name='historicaldenuncia',
+            name='categoria_ref',
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name='+',
+                to='api.categoria',
+            ),
+        ),
+        migrations.RunSQL(POPULATE_CATEGORIAS_SQL, reverse_sql=RESTORE_CATEGORIA_TEXT_SQL),
+        migrations.RunSQL(DROP_SEARCH_TRIGGER_SQL, reverse_sql=OLD_SEARCH_TRIGGER_SQL),
+        migrations.RemoveIndex(model_name='denuncia', name='denuncia_categ_created_id_idx'),
+        migrations.RemoveField(model_name='denuncia', name='categoria'),
+        migrations.RemoveField(model_name='historicaldenuncia', name='categoria'),
+        migrations.RenameField(model_name='denuncia', old_name='categoria_ref', new_name='categoria'),
+        migrations.RenameField(model_name='historicaldenuncia', old_name='categoria_ref', new_name='categoria'),
+        migrations.AlterField(
+            model_name='denuncia',
+            name='categoria',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='denuncias',
+                to='api.categoria',
+            ),
+        ),
+        migrations.RunSQL(SEARCH_TRIGGER_SQL, reverse_sql=DROP_NEW_SEARCH_TRIGGERS_SQL),
+        migrations.AddIndex(
+            model_name='denuncia',
+            index=models.Index(fields=['categoria', 'created_at', 'id'], name='denuncia_cat_created_id_idx'),
+        ),
+        migrations.RunPython(rebuild_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+from typing import ClassVar
+
+from django.db import migrations, models
+
+import api.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies: ClassVar[list[tuple[str, str]]] = [
+        ('api', '0009_categoria'),
+    ]
+
+    operations: ClassVar[list] = [
+        migrations.AlterField(
+            model_name='denuncia',
+            name='id',
+            field=models.UUIDField(default=api.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='historicaldenuncia',
+            name='id',
+            field=models.UUIDField(db_index=True, default=api.models.uuid7, editable=False),
+        ),
+    ]
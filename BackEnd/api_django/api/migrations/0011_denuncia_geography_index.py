@@ -0,0 +1,25 @@
+from typing import ClassVar
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies: ClassVar[list[tuple[str, str]]] = [
+        ('api', '0010_denuncia_uuid7'),
+    ]
+
+    operations: ClassVar[list] = [
+        migrations.AddIndex(
+            model_name='denuncia',
+            index=django.contrib.postgres.indexes.GistIndex(
+                django.db.models.functions.comparison.Cast(
+                    'localizacao', output_field=django.contrib.gis.db.models.fields.PointField(geography=True)
+                ),
+                name='denuncia_geog_gist_idx',
+            ),
+        ),
+    ]
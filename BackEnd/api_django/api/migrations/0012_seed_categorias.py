@@ -0,0 +1,40 @@
+from typing import ClassVar
+
+from django.db import migrations
+
+# Mesmas categorias do formulário público (web/src/constants/categories.ts).
+# A criação pública de denúncias só aceita categorias existentes; sem estas,
+# uma instalação nova recusaria toda denúncia até um admin cadastrá-las.
+DEFAULT_CATEGORIAS = (
+    "Furto",
+    "Assalto",
+    "Vandalismo",
+    "Atividade com Drogas",
+    "Infração de Trânsito",
+    "Violência Doméstica",
+    "Arrombamento",
+    "Roubo",
+    "Homicídio",
+    "Cibercrime",
+    "Fraude",
+    "Outro",
+)
+
+
+def seed_categorias(apps, schema_editor):
+    Categoria = apps.get_model('api', 'Categoria')
+    for nome in DEFAULT_CATEGORIAS:
+        # nome único sem diferenciar maiúsculas: mantém a grafia já cadastrada
+        if not Categoria.objects.filter(nome__iexact=nome).exists():
+            Categoria.objects.create(nome=nome)
+
+
+class Migration(migrations.Migration):
+
+    dependencies: ClassVar[list[tuple[str, str]]] = [
+        ('api', '0011_denuncia_geography_index'),
+    ]
+
+    operations: ClassVar[list] = [
+        migrations.RunPython(seed_categorias, migrations.RunPython.noop),
+    ]
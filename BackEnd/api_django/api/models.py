@@ -1,14 +1,21 @@
 import os
+import time
 import uuid
+from typing import ClassVar
 
 import ulid
 from django.contrib.gis.db import models as geomodels
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Upper
 from simple_history.models import HistoricalRecords
 
 from accounts.models import User
 
 from . import choice
+from .geo import as_geography
+from .storage import report_file_storage
 
 
 def denuncia_midia_upload_path(instance, filename):
@@ -23,24 +30,155 @@ def denuncia_audio_upload_path(instance, filename):
     return os.path.join('denuncias_audios', filename)
 
 
+def report_job_upload_path(instance, filename):
+    ext = filename.split('.')[-1]
+    return os.path.join('relatorios', f"{instance.id}.{ext}")
+
+
 def ulid_str():
     return str(ulid.new())
-    
+
+
+def uuid7():
+    """
+    UUIDv7 (RFC 9562): 48 bits de timestamp Unix em milissegundos seguidos
+    de 74 bits aleatórios. Chaves novas entram sempre no fim do índice da
+    chave primária, em vez de espalhadas como no UUIDv4; dentro do mesmo
+    milissegundo a ordem é aleatória.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # versão 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # variante RFC 9562
+    return uuid.UUID(int=value)
+
+
+# Mesmo layout em SQL (o PostgreSQL só tem `uuidv7()` a partir da versão 18):
+# o timestamp sobrescreve os 6 primeiros bytes de um UUIDv4 e a versão passa
+# de 4 para 7 ligando os bits 52 e 53.
+UUID7_SQL = """
+    encode(set_bit(set_bit(overlay(uuid_send(gen_random_uuid())
+        placing substring(int8send(floor(extract(epoch FROM {timestamp}) * 1000)::bigint) FROM 3)
+        FROM 1 FOR 6), 52, 1), 53, 1), 'hex')::uuid
+"""
+
+
+class Categoria(models.Model):
+    """
+    Dimensão de categorias das denúncias. A chave inteira pequena mantém
+    estreitos os índices e agrupamentos por categoria; o nome é único sem
+    diferenciar maiúsculas (ver `api.categories` para o cache id ↔ nome).
+    """
+
+    id = models.SmallAutoField(primary_key=True)
+    nome = models.CharField(max_length=100)
+
+    class Meta:
+        ordering: ClassVar[list[str]] = ["nome"]
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(Upper("nome"), name="categoria_nome_upper_unique"),
+        ]
+
+    def __str__(self):
+        return self.nome
+
 
 class Denuncia(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # ordenado pelo tempo (UUIDv7) e compatível com as rotas `<uuid:pk>`
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     usuario = models.ForeignKey(User, on_delete=models.CASCADE, default=None, null=True, blank=True)
     protocolo = models.CharField(max_length=26, unique=True, default=ulid_str, editable=False, db_index=True)
-    categoria = models.CharField(max_length=100)
+    # sem índice próprio: `denuncia_cat_created_id_idx` começa por categoria
+    categoria = models.ForeignKey(Categoria, on_delete=models.PROTECT, related_name="denuncias", db_index=False)
     descricao = models.TextField(max_length=1000)
     localizacao = geomodels.PointField()
     midia = models.FileField(upload_to=denuncia_midia_upload_path, blank=True, null=True)
     audio = models.FileField(upload_to=denuncia_audio_upload_path, blank=True, null=True)
     status = models.CharField(max_length=20, choices=choice.STATUS_CHOICES.choices, default=choice.STATUS_CHOICES.EM_ANALISE)
-    history = HistoricalRecords()
+    # mantido pelo trigger `denuncia_search_vector_trigger` (ver api/search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+    history = HistoricalRecords(excluded_fields=["search_vector"])
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # `localizacao` já tem índice GiST em geometry (spatial_index padrão do PointField),
+        # usado por bbox e tiles; o índice em geography atende raio em metros e KNN (`near`)
+        indexes: ClassVar[list[models.Index]] = [
+            # `id` desempata a ordenação e permite a paginação por keyset em (created_at, id)
+            models.Index(fields=["created_at", "id"], name="denuncia_created_id_idx"),
+            models.Index(fields=["updated_at"], name="denuncia_updated_at_idx"),
+            models.Index(fields=["status", "created_at", "id"], name="denuncia_status_created_id_idx"),
+            models.Index(fields=["categoria", "created_at", "id"], name="denuncia_cat_created_id_idx"),
+            GinIndex(fields=["search_vector"], name="denuncia_search_gin_idx"),
+            GistIndex(as_geography("localizacao"), name="denuncia_geog_gist_idx"),
+        ]
+
+    def __str__(self):
+        return self.protocolo
+
+
+class DenunciaDailyStats(models.Model):
+    """
+    Rollup diário de denúncias (dia, categoria e status), mantido pelos
+    signals de `Denuncia` e reconstruível com `rebuild_daily_stats`.
+    """
+
+    day = models.DateField()
+    categoria = models.ForeignKey(Categoria, on_delete=models.CASCADE, related_name="+")
+    status = models.CharField(max_length=20, choices=choice.STATUS_CHOICES.choices)
+    total = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(fields=["day", "categoria", "status"], name="denuncia_daily_stats_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.categoria} {self.status}: {self.total}"
+
+
+class ReportJob(models.Model):
+    """
+    Relatório gerado em segundo plano (`run_report_worker`). Pedidos idênticos
+    (mesma `chave`) enquanto o job está pendente ou processando reaproveitam o job.
+    """
+
+    ACTIVE_STATUSES = (
+        choice.ReportJobStatusChoices.PENDENTE,
+        choice.ReportJobStatusChoices.PROCESSANDO,
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    usuario = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="report_jobs")
+    formato = models.CharField(max_length=10)
+    data_inicio = models.DateTimeField(null=True, blank=True)
+    data_fim = models.DateTimeField(null=True, blank=True)
+    chave = models.CharField(max_length=120)
+    status = models.CharField(
+        max_length=20,
+        choices=choice.ReportJobStatusChoices.choices,
+        default=choice.ReportJobStatusChoices.PENDENTE,
+    )
+    arquivo = models.FileField(
+        upload_to=report_job_upload_path, storage=report_file_storage, blank=True, null=True
+    )
+    erro = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["status", "created_at"], name="report_job_status_created_idx"),
+        ]
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=["chave"],
+                condition=models.Q(status__in=["pendente", "processando"]),
+                name="report_job_active_chave_unique",
+            ),
+        ]
+
     def __str__(self):
-        return self.categoria
+        return f"{self.formato} {self.chave} ({self.status})"
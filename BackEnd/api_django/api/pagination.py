@@ -0,0 +1,206 @@
+"""
+Paginação para listagens grandes.
+
+- `EstimatedCountPagination`: paginação por página em que o `count` vem da
+  estimativa do planejador (`EXPLAIN`) quando ela passa de um limite, sem
+  nenhum `COUNT`; abaixo dele a contagem continua exata.
+- `KeysetPagination`: em vez de `OFFSET`, cada página filtra a partir da
+  última linha vista com uma comparação de linha no PostgreSQL
+  (`ROW(created_at, id) < ROW(...)`), que o índice composto resolve como um
+  intervalo. O custo de uma página não depende da sua posição nem do
+  tamanho da tabela, e nenhum `COUNT(*)` é feito.
+"""
+
+import json
+from functools import cached_property
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import F, Field, Func, Value
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+
+def planner_row_estimate(queryset) -> int:
+    """Linhas que o planejador espera para o queryset (`EXPLAIN`, sem executar)."""
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedPage(Page):
+    """Página cujo `has_next` vem da linha extra lida, não do total estimado."""
+
+    def __init__(self, object_list, number, paginator, *, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Consulta primeiro a estimativa do planejador: acima de
+    `estimate_threshold` ela é o `count` e nenhum `COUNT` chega ao banco.
+    Abaixo, um `COUNT` limitado a `estimate_threshold + 1` linhas dá o total
+    exato (e corrige estimativas baixas demais). Com estimativa, as páginas
+    não são validadas contra o total: cada uma lê uma linha a mais para
+    saber se existe a próxima, e a última página lida revela o total exato.
+    """
+
+    estimate_threshold = 10_000
+
+    @cached_property
+    def _counted(self) -> tuple[int, bool]:
+        if not hasattr(self.object_list, "query"):
+            return len(self.object_list), False
+        estimate = planner_row_estimate(self.object_list)
+        if estimate > self.estimate_threshold:
+            return estimate, True
+        bounded = self.object_list.order_by()[: self.estimate_threshold + 1].count()
+        if bounded <= self.estimate_threshold:
+            return bounded, False
+        return max(estimate, bounded), True
+
+    @property
+    def count(self) -> int:
+        return self._counted[0]
+
+    @property
+    def count_is_estimate(self) -> bool:
+        return self._counted[1]
+
+    def validate_number(self, number):
+        if not self.count_is_estimate:
+            return super().validate_number(number)
+        # total estimado: o limite superior é conferido em `page`, pela linha extra
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"]) from None
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_estimate:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        if len(rows) <= self.per_page:
+            # última página: o total passa a ser exato (filtro seletivo mal estimado)
+            self._counted = (bottom + len(rows), False)
+        return EstimatedPage(rows[: self.per_page], number, self, has_next=len(rows) > self.per_page)
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """`PageNumberPagination` com `count` possivelmente estimado e o campo `count_is_estimate`."""
+
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.page.paginator.count,
+                "count_is_estimate": self.page.paginator.count_is_estimate,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_estimate"] = {"type": "boolean", "example": False}
+        return response_schema
+
+
+class Row(Func):
+    """Construtor de linha do SQL (`ROW(a, b)`), comparável campo a campo."""
+
+    function = "ROW"
+    output_field = Field()
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursores opacos (mesma codificação do `CursorPagination` do DRF) com a
+    posição completa da linha em `ordering`, todas as colunas decrescentes.
+    A última coluna deve ser única para desempatar.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    position_separator = "|"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        # `?cursor=` vazio apenas ativa o modo keyset (primeira página)
+        self.cursor = self.decode_cursor(request) if request.query_params.get(self.cursor_query_param) else None
+        fields = [name.lstrip("-") for name in self.ordering]
+        reverse = bool(self.cursor and self.cursor.reverse)
+
+        # a página anterior é lida em ordem crescente a partir do cursor e invertida
+        queryset = queryset.order_by(*(name if reverse else f"-{name}" for name in fields))
+        if self.cursor:
+            position = self._parse_position(queryset.model, fields, self.cursor.position)
+            lookup = "gt" if reverse else "lt"
+            queryset = queryset.alias(keyset_position=Row(*map(F, fields))).filter(
+                **{f"keyset_position__{lookup}": Row(*map(Value, position))}
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        self.has_next = reverse or has_more
+        self.has_previous = has_more if reverse else self.cursor is not None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self._position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self._position(self.page[0])))
+
+    def _position(self, instance) -> str:
+        values = []
+        for name in self.ordering:
+            value = getattr(instance, name.lstrip("-"))
+            values.append(value.isoformat() if hasattr(value, "isoformat") else str(value))
+        return self.position_separator.join(values)
+
+    def _parse_position(self, model, fields, raw_position) -> list:
+        parts = (raw_position or "").split(self.position_separator)
+        if len(parts) != len(fields):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            values = [model._meta.get_field(name).to_python(part) for name, part in zip(fields, parts, strict=True)]
+        except DjangoValidationError:
+            raise NotFound(self.invalid_cursor_message) from None
+        if any(value is None for value in values):
+            raise NotFound(self.invalid_cursor_message)
+        return values
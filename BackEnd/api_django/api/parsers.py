@@ -0,0 +1,25 @@
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+
+class ORJSONParser(JSONParser):
+    """
+    `JSONParser` com leitura pelo orjson (par do `ORJSONRenderer`), para
+    corpos enviados com `Content-Type: application/vnd.mapcrime+json`.
+    """
+
+    media_type = "application/vnd.mapcrime+json"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            raw = stream.read()
+            # o orjson lê UTF-8 direto dos bytes; outras codificações passam por str
+            if encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+                raw = raw.decode(encoding)
+            return orjson.loads(raw)
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}") from exc
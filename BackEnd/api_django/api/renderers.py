@@ -0,0 +1,67 @@
+import orjson
+from django.contrib.gis.geos import GEOSGeometry
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# chaves não-string convertidas, como o encoder do DRF; datas e horas vão
+# para `orjson_default`, que usa o próprio encoder do DRF (precisão e "Z")
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+_drf_encoder = JSONEncoder()
+
+
+def orjson_default(obj):
+    """
+    Tipos que o orjson não serializa sozinho. UUID, dataclasses e enums são
+    nativos; geometrias GEOS viram GeoJSON e o resto (datetime/date/time,
+    Decimal, timedelta, textos lazy, QuerySet...) segue as mesmas regras do
+    `JSONEncoder` do DRF, para a saída ser idêntica à do `JSONRenderer`.
+    """
+    if isinstance(obj, GEOSGeometry):
+        return orjson.loads(obj.json)
+    return _drf_encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` com serialização pelo orjson e a mesma saída. Registrado
+    ao lado do `JSONRenderer` (que segue como padrão) em `REST_FRAMEWORK`:
+    o cliente escolhe com `?format=orjson` ou `Accept: application/vnd.mapcrime+json`.
+    """
+
+    media_type = "application/vnd.mapcrime+json"
+    format = "orjson"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        options = ORJSON_OPTIONS
+        # o orjson só indenta com 2 espaços; vale para qualquer `indent` pedido
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=orjson_default, option=options)
+        # mesmo escape do JSONRenderer: U+2028/U+2029 quebram linha em JavaScript
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+class HeatmapColumnarRenderer(ORJSONRenderer):
+    """JSON colunar do heatmap (arrays paralelos + dicionário de categorias)."""
+
+    media_type = "application/vnd.mapcrime.heatmap-columnar+json"
+    format = "columnar"
+
+
+class HeatmapBinaryRenderer(BaseRenderer):
+    """
+    Pontos do heatmap empacotados em binário (ver `encode_heatmap_binary`).
+    A view entrega os bytes prontos; o renderer só os repassa.
+    """
+
+    media_type = "application/octet-stream"
+    format = "bin"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
@@ -0,0 +1,123 @@
+"""
+Cache em disco dos arquivos de relatório já renderizados.
+
+O nome de cada arquivo é o hash de (formato, período normalizado, marca
+d'água dos dados), então uma alteração nas denúncias simplesmente gera
+outra chave. A evicção é LRU por tamanho: cada hit atualiza o mtime do
+arquivo e, ao gravar, os mais antigos são removidos até o diretório caber
+em `REPORT_CACHE_MAX_BYTES`.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def enabled() -> bool:
+    return getattr(settings, "REPORT_CACHE_ENABLED", True)
+
+
+def cache_dir() -> Path:
+    return Path(settings.REPORT_FILES_ROOT) / "cache"
+
+
+def max_bytes() -> int:
+    return getattr(settings, "REPORT_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+
+
+def build_key(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, default=str).encode("utf-8")).hexdigest()
+
+
+def _path(key: str, extension: str) -> Path:
+    return cache_dir() / key[:2] / f"{key}.{extension}"
+
+
+def open_cached(key: str, extension: str):
+    """Abre o arquivo em cache (marcando-o como usado) ou retorna None."""
+    path = _path(key, extension)
+    try:
+        handle = path.open("rb")
+    except FileNotFoundError:
+        return None
+    with contextlib.suppress(OSError):
+        os.utime(path)
+    return handle
+
+
+@contextlib.contextmanager
+def writer(key: str, extension: str):
+    """
+    Arquivo temporário no próprio diretório do cache, publicado com
+    `os.replace` (atômico) só se o bloco terminar sem erro — inclusive
+    `GeneratorExit` quando o cliente abandona um download em streaming.
+    """
+    path = _path(key, extension)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            yield handle
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+    evict(max_bytes())
+
+
+def tee(chunks, key: str, extension: str):
+    """Repassa os blocos de um streaming e grava uma cópia no cache."""
+    with writer(key, extension) as handle:
+        for chunk in chunks:
+            handle.write(chunk)
+            yield chunk
+
+
+def _entries():
+    root = cache_dir()
+    if not root.exists():
+        return []
+    entries = []
+    for path in root.glob("*/*"):
+        if path.suffix == ".tmp":
+            continue
+        with contextlib.suppress(FileNotFoundError):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+    return entries
+
+
+def evict(limit: int, *, older_than: float | None = None) -> tuple[int, int]:
+    """
+    Remove os arquivos menos usados até o total caber em `limit` bytes
+    (e, com `older_than`, os não usados há mais de `older_than` segundos).
+    Retorna `(arquivos removidos, bytes liberados)`.
+    """
+    entries = sorted(_entries())
+    total = sum(size for _mtime, size, _path in entries)
+    cutoff = time.time() - older_than if older_than is not None else None
+    removed = freed = 0
+    for mtime, size, path in entries:
+        if total <= limit and (cutoff is None or mtime >= cutoff):
+            break
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+            removed += 1
+            freed += size
+        total -= size
+    return removed, freed
+
+
+def usage() -> tuple[int, int]:
+    """Retorna `(quantidade de arquivos, bytes ocupados)`."""
+    entries = _entries()
+    return len(entries), sum(size for _mtime, size, _path in entries)
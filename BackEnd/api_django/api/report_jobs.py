@@ -0,0 +1,116 @@
+"""
+Jobs de relatório em segundo plano.
+
+`enqueue_report_job` cria (ou reaproveita) o job; o comando
+`run_report_worker` chama `claim_pending_jobs` e executa `run_report_job`
+em um pool de processos, gravando o arquivo em `ReportJob.arquivo`.
+"""
+
+import logging
+import tempfile
+from datetime import datetime, timedelta
+
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from api.choice import ReportJobStatusChoices
+from api.models import ReportJob
+
+logger = logging.getLogger(__name__)
+
+STALE_JOB_TIMEOUT = timedelta(minutes=30)
+# o detalhe da exceção fica só no log; a API expõe esta mensagem
+JOB_FAILURE_MESSAGE = "Não foi possível gerar o relatório. Tente novamente mais tarde."
+REPORT_EXTENSIONS = {"csv": "csv", "xlsx": "xlsx", "docx": "docx", "parquet": "parquet", "arrow": "arrow"}
+
+
+def job_key(formato: str, start_dt: datetime | None, end_dt: datetime | None, usuario=None) -> str:
+    """
+    Chave de coalescência: mesmo usuário, mesmo formato e mesmo período
+    normalizado. O usuário entra na chave porque cada um só enxerga os
+    próprios jobs.
+    """
+    start = start_dt.isoformat() if start_dt else "-"
+    end = end_dt.isoformat() if end_dt else "-"
+    owner = usuario.pk if usuario is not None else "-"
+    return f"{owner}|{formato}|{start}|{end}"
+
+
+def enqueue_report_job(formato, start_dt, end_dt, usuario=None) -> tuple[ReportJob, bool]:
+    """Retorna `(job, criado)`; um pedido idêntico ainda ativo devolve o job existente."""
+    usuario = usuario if usuario and usuario.is_authenticated else None
+    chave = job_key(formato, start_dt, end_dt, usuario)
+    active = ReportJob.objects.filter(chave=chave, status__in=ReportJob.ACTIVE_STATUSES)
+    existing = active.first()
+    if existing is not None:
+        return existing, False
+    try:
+        with transaction.atomic():
+            job = ReportJob.objects.create(
+                formato=formato,
+                data_inicio=start_dt,
+                data_fim=end_dt,
+                chave=chave,
+                usuario=usuario,
+            )
+    except IntegrityError:
+        # outro request criou o mesmo job entre o SELECT e o INSERT
+        return active.get(), False
+    return job, True
+
+
+def claim_pending_jobs(limit: int) -> list:
+    """Marca até `limit` jobs pendentes como em processamento e retorna seus IDs."""
+    if limit <= 0:
+        return []
+    with transaction.atomic():
+        ids = list(
+            ReportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ReportJobStatusChoices.PENDENTE)
+            .order_by("created_at")
+            .values_list("pk", flat=True)[:limit]
+        )
+        if ids:
+            ReportJob.objects.filter(pk__in=ids).update(
+                status=ReportJobStatusChoices.PROCESSANDO, started_at=timezone.now()
+            )
+    return ids
+
+
+def touch_running_jobs(job_ids) -> int:
+    """Renova `started_at` dos jobs ainda em execução, para não serem tomados como travados."""
+    if not job_ids:
+        return 0
+    return ReportJob.objects.filter(pk__in=job_ids, status=ReportJobStatusChoices.PROCESSANDO).update(
+        started_at=timezone.now()
+    )
+
+
+def requeue_stale_jobs(timeout: timedelta = STALE_JOB_TIMEOUT) -> int:
+    """Devolve para a fila jobs presos em processamento (ex.: worker interrompido)."""
+    return ReportJob.objects.filter(
+        status=ReportJobStatusChoices.PROCESSANDO,
+        started_at__lt=timezone.now() - timeout,
+    ).update(status=ReportJobStatusChoices.PENDENTE, started_at=None)
+
+
+def run_report_job(job_id) -> str:
+    """Renderiza o relatório do job com a mesma lógica de `DenunciaReportView`."""
+    from api.views.denuncia.report import DenunciaReportView
+
+    job = ReportJob.objects.get(pk=job_id)
+    try:
+        with tempfile.TemporaryFile() as spool:
+            DenunciaReportView().render_to_file(job.formato, job.data_inicio, job.data_fim, spool)
+            spool.seek(0)
+            job.arquivo.save(f"{job.pk}.{REPORT_EXTENSIONS[job.formato]}", File(spool), save=False)
+        job.status = ReportJobStatusChoices.CONCLUIDO
+        job.erro = ""
+    except Exception:
+        logger.exception("Falha ao gerar o relatório do job %s", job.pk)
+        job.status = ReportJobStatusChoices.FALHOU
+        job.erro = JOB_FAILURE_MESSAGE
+    job.finished_at = timezone.now()
+    job.save(update_fields=["arquivo", "status", "erro", "finished_at"])
+    return job.status
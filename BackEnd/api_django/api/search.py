@@ -0,0 +1,26 @@
+"""
+Busca textual nas denúncias (full-text search do PostgreSQL).
+
+`Denuncia.search_vector` é preenchido pelo trigger
+`denuncia_search_vector_trigger` (migrações 0008 e 0009) com o nome da
+categoria (peso A) e `descricao` (peso B) na configuração `portuguese`, e
+indexado por GIN. Como é o banco que mantém a coluna, ela fica correta
+também em `bulk_create`, `update()` e SQL direto; renomear uma `Categoria`
+recalcula as denúncias dela (`categoria_search_vector_trigger`).
+"""
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+
+SEARCH_CONFIG = "portuguese"
+
+
+def search_query(term: str) -> SearchQuery:
+    """Consulta no estilo de buscador (`websearch_to_tsquery`): aspas, `or` e `-termo`."""
+    return SearchQuery(term, config=SEARCH_CONFIG, search_type="websearch")
+
+
+def search_denuncias(queryset, term: str):
+    """Filtra pelo índice GIN e anota a relevância (`ts_rank`) em `search_rank`."""
+    query = search_query(term)
+    return queryset.filter(search_vector=query).annotate(search_rank=SearchRank(F("search_vector"), query))
@@ -1,6 +1,9 @@
 # api/serializers/__init__.py
 
 # Expondo também os serializers de Denuncia para importação direta via `from api.serializers import ...`
+from .denuncia import (
+    CategoriaSerializer as CategoriaSerializer,
+)
 from .denuncia import (
     DenunciaCreateSerializer as DenunciaCreateSerializer,
 )
@@ -19,6 +22,9 @@ from .denuncia import (
 from .denuncia import (
     DenunciaUpdateSerializer as DenunciaUpdateSerializer,
 )
+from .denuncia import (
+    ReportJobSerializer as ReportJobSerializer,
+)
 from .group import (
     GroupCreateSerializer as GroupCreateSerializer,
 )
@@ -1,8 +1,10 @@
 # api/serializers/Denuncia/__init__.py
 
+from .categoria import CategoriaSerializer as CategoriaSerializer
 from .create import DenunciaCreateSerializer as DenunciaCreateSerializer
 from .delete import DenunciaDeleteSerializer as DenunciaDeleteSerializer
 from .detail import DenunciaDetailSerializer as DenunciaDetailSerializer
 from .history import DenunciaHistoryEntrySerializer as DenunciaHistoryEntrySerializer
 from .list import DenunciaListSerializer as DenunciaListSerializer
+from .report_job import ReportJobSerializer as ReportJobSerializer
 from .update import DenunciaUpdateSerializer as DenunciaUpdateSerializer
@@ -0,0 +1,11 @@
+from typing import ClassVar
+
+from rest_framework import serializers
+
+from api.models import Categoria
+
+
+class CategoriaSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Categoria
+        fields: ClassVar[list[str]] = ["id", "nome"]
@@ -5,12 +5,13 @@ from rest_framework import serializers
 
 from api.models import Denuncia
 
-from .utils import enforce_file_upload_limit
+from .utils import CategoriaField, enforce_file_upload_limit
 
 
 class DenunciaCreateSerializer(serializers.ModelSerializer):
     latitude = serializers.FloatField(write_only=True, required=True)
     longitude = serializers.FloatField(write_only=True, required=True)
+    categoria = CategoriaField()
 
     class Meta:
         model = Denuncia
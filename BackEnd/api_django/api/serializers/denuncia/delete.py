@@ -3,8 +3,12 @@ from rest_framework import serializers
 
 from api.models import Denuncia
 
+from .utils import CategoriaField
+
 
 class DenunciaDeleteSerializer(serializers.ModelSerializer):
+    categoria = CategoriaField()
+
     class Meta:
         model = Denuncia
-        fields = '__all__'  # apenas para documentação, mas não será usado
\ No newline at end of file
+        exclude = ('search_vector',)  # apenas para documentação, mas não será usado
\ No newline at end of file
@@ -3,12 +3,14 @@
 from rest_framework import serializers
 
 from api.models import Denuncia
+from api.serializers.denuncia.utils import CategoriaField, SparseFieldsetMixin
 from api.serializers.user.detail import UserDetailSerializer
 
 
-class DenunciaDetailSerializer(serializers.ModelSerializer):
+class DenunciaDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     usuario = UserDetailSerializer(read_only=True)
+    categoria = CategoriaField()
 
     class Meta:
         model = Denuncia
-        fields = '__all__'  # ou lista de campos completa
+        exclude = ('search_vector',)  # coluna interna da busca textual
@@ -1,36 +1,133 @@
+import json
+import struct
+import sys
+from array import array
+
 from rest_framework import serializers
 
-from api.models import Denuncia
+from api.categories import categoria_label, categoria_labels, clear_categoria_cache
 
+# `categoria` é o id (`categoria_id`); o nome sai do cache de categorias
+HEATMAP_POINT_COLUMNS = ("id", "categoria", "lat", "lng", "created_at")
 
-class DenunciaHeatmapSerializer(serializers.ModelSerializer):
-    categoria = serializers.SerializerMethodField()
-    lat = serializers.SerializerMethodField()
-    lng = serializers.SerializerMethodField()
-    date = serializers.SerializerMethodField()
-    weight = serializers.SerializerMethodField()
+HEATMAP_BINARY_MAGIC = b"HMP1"
+HEATMAP_BINARY_MAX_CATEGORIES = 256  # códigos de categoria (por resposta) em uint8
+
+
+class DenunciaHeatmapSerializer(serializers.Serializer):
+    """
+    Ponto do heatmap. Recebe tuplas já projetadas pelo banco
+    (`HEATMAP_POINT_COLUMNS`), sem instanciar `Denuncia`; os campos abaixo
+    servem para documentar o formato no Swagger.
+    """
 
-    class Meta:
-        model = Denuncia
-        fields = ("id", "categoria", "lat", "lng", "date", "weight")
+    id = serializers.UUIDField()
+    categoria = serializers.CharField()
+    lat = serializers.FloatField()
+    lng = serializers.FloatField()
+    date = serializers.DateTimeField()
+    weight = serializers.IntegerField()
 
-    def get_categoria(self, obj):
-        return getattr(obj, "categoria", "")
+    def to_representation(self, row):
+        pk, categoria, lat, lng, created_at = row
+        return {
+            "id": str(pk),
+            "categoria": categoria_label(categoria),
+            "lat": None if lat is None else round(lat, 6),
+            "lng": None if lng is None else round(lng, 6),
+            "date": None if created_at is None else created_at.isoformat(),
+            # default 1; você pode alterar para ponderar por severidade
+            "weight": 1,
+        }
+
+
+class DenunciaHeatmapCellSerializer(serializers.Serializer):
+    """Centroide ponderado de uma célula do grid (`aggregate=grid`)."""
+
+    lat = serializers.SerializerMethodField()
+    lng = serializers.SerializerMethodField()
+    weight = serializers.IntegerField()
 
     def get_lat(self, obj):
-        loc = getattr(obj, "localizacao", None)
-        return None if not loc else round(loc.y, 6)
+        return round(obj["lat"], 6)
 
     def get_lng(self, obj):
-        loc = getattr(obj, "localizacao", None)
-        return None if not loc else round(loc.x, 6)
-
-    def get_date(self, obj):
-        dt = getattr(obj, "created_at", None) or getattr(obj, "created", None) or getattr(obj, "data", None)
-        if dt is None:
-            return None
-        return dt.isoformat()
-
-    def get_weight(self, obj):
-        # default 1; você pode alterar para ponderar por severidade
-        return getattr(obj, "peso", 1)
\ No newline at end of file
+        return round(obj["lng"], 6)
+
+
+def _categories_dictionary(category_ids) -> list[str]:
+    """
+    Nomes das categorias na ordem dos códigos da resposta: a posição `i`
+    tem o nome da categoria de código `i`.
+    """
+    labels = categoria_labels()
+    if not set(category_ids) <= labels.keys():
+        clear_categoria_cache()  # categoria criada por outro processo
+        labels = categoria_labels()
+    return [labels.get(pk, "") for pk in category_ids]
+
+
+def encode_heatmap_columnar(rows) -> dict:
+    """
+    Layout colunar: um array por campo, na mesma ordem, e `categoria` como
+    índice em `categories`. Os códigos são densos e valem só para a
+    resposta (0, 1, 2… na ordem em que cada categoria aparece), então o
+    dicionário tem só as categorias presentes, seja qual for o id delas.
+    `date` vai em epoch (segundos) e `weight` é sempre 1 no modo de pontos,
+    por isso é omitido.
+    """
+    ids, codes, lats, lngs, dates = [], [], [], [], []
+    dense: dict[int, int] = {}
+    for pk, categoria, lat, lng, created_at in rows:
+        ids.append(str(pk))
+        codes.append(dense.setdefault(categoria, len(dense)))
+        lats.append(round(lat, 6))
+        lngs.append(round(lng, 6))
+        dates.append(int(created_at.timestamp()))
+    return {
+        "count": len(ids),
+        "categories": _categories_dictionary(dense),
+        "id": ids,
+        "categoria": codes,
+        "lat": lats,
+        "lng": lngs,
+        "date": dates,
+    }
+
+
+def encode_heatmap_binary(rows) -> bytes:
+    """
+    Layout binário (little-endian), alinhado para `TypedArray` no navegador:
+
+    - cabeçalho: `HMP1`, uint32 `n`, uint32 tamanho do dicionário;
+    - dicionário de categorias: JSON UTF-8 (lista indexada pelo código, como no colunar),
+      completado até múltiplo de 4;
+    - float32 lat[n], float32 lng[n], uint32 epoch_segundos[n], uint8 categoria[n].
+
+    Os códigos são densos por resposta, então o limite de uint8 é de 256
+    categorias distintas na resposta, e não de ids até 255.
+    """
+    lats, lngs = array("f"), array("f")
+    timestamps, codes = array("I"), array("B")
+    dense: dict[int, int] = {}
+    for _pk, categoria, lat, lng, created_at in rows:
+        code = dense.setdefault(categoria, len(dense))
+        if code >= HEATMAP_BINARY_MAX_CATEGORIES:
+            raise serializers.ValidationError(
+                {"format": "Categorias demais para o formato binário. Use format=columnar."}
+            )
+        lats.append(lat)
+        lngs.append(lng)
+        timestamps.append(int(created_at.timestamp()))
+        codes.append(code)
+
+    if sys.byteorder == "big":
+        for column in (lats, lngs, timestamps):
+            column.byteswap()
+
+    dictionary = json.dumps(_categories_dictionary(dense), ensure_ascii=False).encode("utf-8")
+    dictionary += b" " * (-len(dictionary) % 4)
+    header = struct.pack("<4sII", HEATMAP_BINARY_MAGIC, len(codes), len(dictionary))
+    return b"".join(
+        [header, dictionary, lats.tobytes(), lngs.tobytes(), timestamps.tobytes(), codes.tobytes()]
+    )
@@ -3,9 +3,16 @@
 from rest_framework import serializers
 
 from api.models import Denuncia
+from api.serializers.denuncia.utils import CategoriaField, SparseFieldsetMixin
 
 
-class DenunciaListSerializer(serializers.ModelSerializer):
+class DenunciaListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    # padrão enxuto da listagem; os demais campos (descricao, localizacao,
+    # midia, audio) só saem quando pedidos em `?fields=`
+    default_fields = ("id", "protocolo", "categoria", "status", "usuario", "created_at", "updated_at")
+
+    categoria = CategoriaField()
+
     class Meta:
         model = Denuncia
-        fields = '__all__'  # campos resumidos para listagem
\ No newline at end of file
+        exclude = ('search_vector',)  # coluna interna da busca textual
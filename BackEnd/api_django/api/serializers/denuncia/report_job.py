@@ -0,0 +1,34 @@
+# api/serializers/Denuncia/report_job.py
+
+from django.urls import reverse
+from rest_framework import serializers
+
+from api.choice import ReportJobStatusChoices
+from api.models import ReportJob
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = (
+            "id",
+            "formato",
+            "data_inicio",
+            "data_fim",
+            "status",
+            "erro",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "download_url",
+        )
+        read_only_fields = fields
+
+    def get_download_url(self, obj) -> str | None:
+        if obj.status != ReportJobStatusChoices.CONCLUIDO:
+            return None
+        url = reverse("denuncia-report-job-download", kwargs={"pk": obj.pk})
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
@@ -8,10 +8,12 @@ from rest_framework.exceptions import PermissionDenied
 from accounts.permissions.groups import IsAdmin
 from api.models import Denuncia
 
-from .utils import enforce_file_upload_limit
+from .utils import CategoriaField, enforce_file_upload_limit
 
 
 class DenunciaUpdateSerializer(serializers.ModelSerializer):
+    categoria = CategoriaField()
+
     class Meta:
         model = Denuncia
         fields: ClassVar[list[str]] = [
@@ -1,5 +1,10 @@
+from typing import ClassVar
+
 from rest_framework import serializers
 
+from accounts.permissions.groups import IsAdmin
+from api.categories import categoria_id, categoria_label
+
 MAX_FILES_PER_REQUEST = 3
 
 
@@ -18,3 +23,57 @@ def enforce_file_upload_limit(serializer):
         raise serializers.ValidationError(
             f"Envie no máximo {MAX_FILES_PER_REQUEST} arquivos por requisição (recebidos {total_files})."
         )
+
+
+class SparseFieldsetMixin:
+    """
+    Mantém só os campos de `context["fields"]` (já validados pela view).
+    Sem essa chave, usa `default_fields` quando definido; caso contrário,
+    todos os campos do serializer.
+    """
+
+    default_fields: ClassVar[tuple[str, ...] | None] = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.context.get("fields") or self.default_fields
+        if selected:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+    @classmethod
+    def available_fields(cls) -> list[str]:
+        """Todos os campos que podem ser pedidos em `?fields=`."""
+        return list(cls().get_fields())
+
+
+class CategoriaField(serializers.CharField):
+    """
+    `Denuncia.categoria` pelo nome. Lê e grava `categoria_id`, resolvendo
+    o nome pelo cache de `api.categories` (sem JOIN), sem diferenciar
+    maiúsculas. Na escrita o nome precisa existir; só `Admin` cria
+    categorias novas (a criação de denúncias é pública).
+    """
+
+    default_error_messages: ClassVar = {
+        "does_not_exist": "Categoria inexistente: {nome}. Consulte /api/categorias/.",
+    }
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("source", "categoria_id")
+        kwargs.setdefault("max_length", 100)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        nome = super().to_internal_value(data)
+        pk = categoria_id(nome, create=self._can_create())
+        if pk is None:
+            self.fail("does_not_exist", nome=nome.strip())
+        return pk
+
+    def _can_create(self) -> bool:
+        request = self.context.get("request")
+        return request is not None and IsAdmin().has_permission(request, None)
+
+    def to_representation(self, value):
+        return categoria_label(value)
@@ -0,0 +1,97 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from api.cache import invalidate_active_users_count, invalidate_denuncia_cache
+from api.categories import clear_categoria_cache
+from api.models import Categoria, Denuncia
+from api.stats import apply_delta, stats_day
+from api.tiles import invalidate_all_tiles, invalidate_tiles_for_point
+
+User = get_user_model()
+
+
+def after_commit(func, *args):
+    """
+    Agenda a invalidação para depois do commit. Dentro de um bloco atômico
+    (ex.: changeform do admin), invalidar antes deixaria um GET concorrente
+    ler as linhas antigas e gravá-las no cache sob a geração nova.
+    """
+    transaction.on_commit(partial(func, *args))
+
+
+@receiver(pre_save, sender=Denuncia)
+def remember_previous_state(sender, instance, **kwargs):
+    """
+    Guarda localização, data, categoria e status anteriores para invalidar
+    os tiles de origem e mover o contador do rollup diário.
+    """
+    instance._previous_state = None
+    if instance._state.adding:
+        return
+    instance._previous_state = (
+        Denuncia.objects.filter(pk=instance.pk)
+        .values("localizacao", "created_at", "categoria_id", "status")
+        .first()
+    )
+
+
+@receiver(post_save, sender=Denuncia)
+def invalidate_caches_on_save(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_state", None)
+    if previous is not None and previous["localizacao"] != instance.localizacao:
+        after_commit(invalidate_tiles_for_point, previous["localizacao"])
+    after_commit(invalidate_tiles_for_point, instance.localizacao)
+    after_commit(invalidate_denuncia_cache)
+
+
+@receiver(post_save, sender=Denuncia)
+def update_daily_stats_on_save(sender, instance, created, **kwargs):
+    current = (instance.created_at, instance.categoria_id, instance.status)
+    previous = getattr(instance, "_previous_state", None)
+    if not created and previous is not None:
+        before = (previous["created_at"], previous["categoria_id"], previous["status"])
+        if (stats_day(before[0]), *before[1:]) == (stats_day(current[0]), *current[1:]):
+            return
+        apply_delta(*before, -1)
+    apply_delta(*current, 1)
+
+
+@receiver(post_delete, sender=Denuncia)
+def invalidate_caches_on_delete(sender, instance, **kwargs):
+    after_commit(invalidate_tiles_for_point, instance.localizacao)
+    after_commit(invalidate_denuncia_cache)
+
+
+@receiver(post_delete, sender=Denuncia)
+def update_daily_stats_on_delete(sender, instance, **kwargs):
+    apply_delta(instance.created_at, instance.categoria_id, instance.status, -1)
+
+
+@receiver(post_save, sender=Categoria)
+@receiver(post_delete, sender=Categoria)
+def invalidate_caches_on_categoria_change(sender, created=False, **kwargs):
+    # nomes de categoria aparecem nas respostas em cache (heatmap, relatórios, tiles)
+    after_commit(clear_categoria_cache)
+    after_commit(invalidate_denuncia_cache)
+    if not created:
+        # categoria nova ainda não aparece em nenhum tile
+        after_commit(invalidate_all_tiles)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_active_users_on_change(sender, **kwargs):
+    after_commit(invalidate_active_users_count)
+
+
+@receiver(post_save, sender=User)
+def invalidate_caches_on_user_change(sender, created=False, update_fields=None, **kwargs):
+    # o usuário aparece aninhado no detalhe da denúncia; login (só `last_login`)
+    # e cadastro novo não mudam nenhuma denúncia
+    if created or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    after_commit(invalidate_denuncia_cache)
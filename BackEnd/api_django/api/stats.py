@@ -0,0 +1,124 @@
+"""
+Rollup diário de denúncias (`DenunciaDailyStats`).
+
+Os signals de `Denuncia` aplicam deltas de +1/-1 na linha
+(dia, categoria, status) afetada; `rebuild_daily_stats` recalcula um
+intervalo (ou tudo) a partir da tabela de denúncias. O dia é o de
+`created_at` no fuso de `TIME_ZONE`.
+"""
+
+import datetime
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from api.choice import StatusChoices
+from api.models import Denuncia, DenunciaDailyStats
+
+
+def stats_day(created_at: datetime.datetime) -> datetime.date:
+    return timezone.localtime(created_at).date()
+
+
+def day_bounds(start: datetime.date, end: datetime.date) -> tuple[datetime.datetime, datetime.datetime]:
+    """Intervalo `[início de start, início do dia seguinte a end)` no fuso atual."""
+    tz = timezone.get_current_timezone()
+    return (
+        datetime.datetime.combine(start, datetime.time.min, tzinfo=tz),
+        datetime.datetime.combine(end + datetime.timedelta(days=1), datetime.time.min, tzinfo=tz),
+    )
+
+
+def apply_delta(created_at: datetime.datetime, categoria_id: int, status: str, delta: int) -> None:
+    """Soma `delta` ao contador de (dia de `created_at`, categoria, status)."""
+    day = stats_day(created_at)
+    if delta < 0:
+        DenunciaDailyStats.objects.filter(
+            day=day, categoria_id=categoria_id, status=status, total__gte=-delta
+        ).update(total=F("total") + delta)
+        return
+
+    table = connection.ops.quote_name(DenunciaDailyStats._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (day, categoria_id, status, total)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (day, categoria_id, status)
+            DO UPDATE SET total = {table}.total + EXCLUDED.total
+            """,
+            [day, categoria_id, status, delta],
+        )
+
+
+def rebuild_daily_stats(
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+    *,
+    denuncia_model=Denuncia,
+    stats_model=DenunciaDailyStats,
+) -> int:
+    """
+    Recalcula o rollup para `[start, end]` (ou para toda a tabela). Os
+    modelos são parametrizáveis para uso dentro de migrações.
+    Retorna a quantidade de linhas gravadas.
+    """
+    denuncias = denuncia_model.objects.order_by()
+    stats = stats_model.objects.all()
+    if start is not None:
+        denuncias = denuncias.filter(created_at__gte=day_bounds(start, start)[0])
+        stats = stats.filter(day__gte=start)
+    if end is not None:
+        denuncias = denuncias.filter(created_at__lt=day_bounds(end, end)[1])
+        stats = stats.filter(day__lte=end)
+
+    rows = (
+        denuncias.annotate(day=TruncDate("created_at"))
+        .values_list("day", "categoria", "status")
+        .annotate(total=Count("pk"))
+    )
+    # `categoria_id` no modelo atual; `categoria` (texto) nas migrações anteriores à 0009
+    categoria_attname = stats_model._meta.get_field("categoria").attname
+    with transaction.atomic():
+        stats.delete()
+        created = stats_model.objects.bulk_create(
+            (
+                stats_model(day=day, status=status, total=total, **{categoria_attname: categoria})
+                for day, categoria, status, total in rows.iterator()
+            ),
+            batch_size=1000,
+        )
+    return len(created)
+
+
+def reports_timeline(start: datetime.date, end: datetime.date) -> list[dict]:
+    """
+    Série diária `{date, open, resolved}` entre `start` e `end` (inclusive):
+    `open` conta as denúncias registradas no dia e `resolved` as que estão
+    aprovadas. Dias sem registros aparecem zerados.
+    """
+    per_day = {
+        row["day"]: row
+        for row in DenunciaDailyStats.objects.filter(day__gte=start, day__lte=end)
+        .values("day")
+        .annotate(
+            open=Sum("total"),
+            resolved=Sum("total", filter=Q(status=StatusChoices.APROVADO), default=0),
+        )
+        .order_by()
+    }
+    timeline = []
+    day = start
+    while day <= end:
+        row = per_day.get(day)
+        timeline.append(
+            {
+                "date": day.isoformat(),
+                "open": row["open"] if row else 0,
+                "resolved": row["resolved"] if row else 0,
+            }
+        )
+        day += datetime.timedelta(days=1)
+    return timeline
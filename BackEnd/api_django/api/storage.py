@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.functional import cached_property
+
+
+class ReportFileStorage(FileSystemStorage):
+    """
+    Arquivos de relatório gerados pelo servidor, em `REPORT_FILES_ROOT`
+    (fora do MEDIA_ROOT público; em produção, volume compartilhado entre a
+    API e o `run_report_worker`). O download passa sempre pelos endpoints.
+    """
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(self._location, settings.REPORT_FILES_ROOT)
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting == "REPORT_FILES_ROOT":
+            self.__dict__.pop("base_location", None)
+            self.__dict__.pop("location", None)
+
+
+report_file_storage = ReportFileStorage()
@@ -0,0 +1,41 @@
+"""
+Respostas em streaming (CSV de relatórios, GeoJSON) no modelo do servidor.
+
+Em produção a API roda sob ASGI (daphne). Nesse caso o Django consome um
+iterador síncrono inteiro com `sync_to_async(list)` antes de enviar o
+primeiro byte, e a resposta deixa de ser streaming. Sob ASGI, então, os
+blocos são puxados um a um do gerador síncrono (que lê o cursor do banco)
+por `sync_to_async`. A thread é sempre a mesma na requisição
+(`thread_sensitive`), e portanto a conexão também. Sob WSGI (runserver,
+testes com o client síncrono), o próprio gerador síncrono é repassado.
+"""
+
+from collections.abc import AsyncIterator, Iterable
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+_EXHAUSTED = object()
+
+
+async def iterate_in_thread(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    """Iterador assíncrono sobre `chunks`, avançando o iterador síncrono um bloco por vez."""
+    iterator = iter(chunks)
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await next_chunk(iterator, _EXHAUSTED)) is not _EXHAUSTED:
+            yield chunk
+    finally:
+        # cliente desconectado no meio: fecha o gerador (e o cursor do servidor)
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=True)()
+
+
+def streaming_response(request, chunks: Iterable[bytes], **kwargs) -> StreamingHttpResponse:
+    """`StreamingHttpResponse` com iterador assíncrono sob ASGI e síncrono sob WSGI."""
+    django_request = getattr(request, "_request", request)  # aceita o Request do DRF
+    if isinstance(django_request, ASGIRequest):
+        chunks = iterate_in_thread(chunks)
+    return StreamingHttpResponse(chunks, **kwargs)
@@ -1,12 +1,48 @@
+import asyncio
+
 import pytest
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.db import transaction
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from api.categories import clear_categoria_cache
+
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Isola o cache de respostas/tiles (e o de categorias, em processo) entre os testes."""
+    cache.clear()
+    clear_categoria_cache()
+    yield
+    cache.clear()
+    clear_categoria_cache()
+
+
+@pytest.fixture(autouse=True)
+def run_on_commit_immediately(request, monkeypatch):
+    """
+    Os testes rodam dentro de uma transação que nunca é confirmada, então as
+    invalidações agendadas com `on_commit` (api/signals.py) rodam na hora.
+    `@pytest.mark.defer_on_commit` mantém o comportamento real.
+    """
+    if request.node.get_closest_marker("defer_on_commit") is None:
+        monkeypatch.setattr(transaction, "on_commit", lambda func, using=None, robust=False: func())
+
+
+@pytest.fixture(autouse=True)
+def report_files_root(settings, tmp_path):
+    """Relatórios gerados (jobs e cache em disco) vão para um diretório temporário."""
+    settings.REPORT_FILES_ROOT = tmp_path
+    return tmp_path
+
+
 @pytest.fixture
 def create_groups(db):
     """Garante que os grupos padrão existam no banco."""
@@ -54,3 +90,46 @@ def admin_client(admin_user):
     refresh = RefreshToken.for_user(admin_user)
     client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token!s}")
     return client
+
+
+@pytest.fixture
+def asgi_get():
+    """
+    GET pelo `ASGIHandler`, como sob o daphne. Devolve o status, os headers
+    e a lista de mensagens `http.response.body` na ordem em que foram enviadas.
+    """
+
+    def get(path, query="", user=None):
+        headers = [(b"host", b"testserver")]
+        if user is not None:
+            token = RefreshToken.for_user(user).access_token
+            headers.append((b"authorization", f"Bearer {token!s}".encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "query_string": query.encode(),
+            "headers": headers,
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+        }
+        sent = asyncio.Queue()  # `sent.put` é o callable `send` do ASGI
+        received = False
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # sem desconexão: o handler cancela esta espera ao terminar
+            await asyncio.Future()
+
+        async_to_sync(ASGIHandler())(scope, receive, sent.put)
+        messages = [sent.get_nowait() for _ in range(sent.qsize())]
+        start, bodies = messages[0], [m for m in messages[1:] if m["type"] == "http.response.body"]
+        return start["status"], dict(start["headers"]), bodies
+
+    return get
@@ -0,0 +1,129 @@
+import pytest
+from django.contrib.gis.geos import Point
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api.categories import get_categoria
+from api.models import Denuncia
+
+
+@pytest.fixture
+def denuncia(db):
+    return Denuncia.objects.create(
+        categoria=get_categoria("Furto"),
+        descricao="Descrição",
+        localizacao=Point(-46.6333, -23.5505, srid=4326),
+    )
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    """ETag/Last-Modified e respostas 304 nos endpoints de leitura."""
+
+    def test_heatmap_returns_304_when_unchanged(self, client, denuncia):
+        url = reverse("denuncia-heatmap")
+        first = client.get(url)
+        assert first.status_code == 200
+        assert first.has_header("ETag")
+        assert first.has_header("Last-Modified")
+
+        second = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second["ETag"] == first["ETag"]
+
+    def test_heatmap_etag_changes_on_create_and_delete(self, client, denuncia):
+        url = reverse("denuncia-heatmap")
+        etag = client.get(url)["ETag"]
+
+        other = Denuncia.objects.create(
+            categoria=get_categoria("Roubo"),
+            descricao="Outra",
+            localizacao=Point(-46.6, -23.5, srid=4326),
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        etag_after_create = response["ETag"]
+        assert etag_after_create != etag
+
+        other.delete()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag_after_create)
+        assert response.status_code == 200
+
+    def test_heatmap_etag_depends_on_format(self, client, denuncia):
+        url = reverse("denuncia-heatmap")
+        json_etag = client.get(url)["ETag"]
+        response = client.get(url, {"format": "columnar"}, HTTP_IF_NONE_MATCH=json_etag)
+        assert response.status_code == 200
+
+    def test_list_304_skips_serialization(self, auth_client, denuncia):
+        url = reverse("denuncia_list")
+        etag = auth_client.get(url)["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        # a ETag vem da geração do cache: nenhuma consulta à tabela de denúncias
+        denuncia_queries = [q["sql"] for q in queries.captured_queries if '"api_denuncia"' in q["sql"]]
+        assert denuncia_queries == []
+
+    def test_list_requires_auth_before_304(self, client, auth_client, denuncia):
+        url = reverse("denuncia_list")
+        etag = auth_client.get(url)["ETag"]
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 401
+
+    def test_detail_and_protocolo(self, client, denuncia):
+        for url in (
+            reverse("denuncia_detail", kwargs={"pk": denuncia.pk}),
+            reverse("denuncia_detail_protocolo", kwargs={"protocolo": denuncia.protocolo}),
+        ):
+            first = client.get(url)
+            assert first.status_code == 200
+            assert client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+            assert client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code == 304
+
+        url = reverse("denuncia_detail", kwargs={"pk": denuncia.pk})
+        etag = client.get(url)["ETag"]
+        denuncia.status = "aprovado"
+        denuncia.save()
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_detail_etag_changes_on_categoria_rename(self, client, denuncia):
+        """Nome da categoria está no corpo: renomear invalida a ETag mesmo sem tocar na denúncia."""
+        url = reverse("denuncia_detail", kwargs={"pk": denuncia.pk})
+        etag = client.get(url)["ETag"]
+        categoria = denuncia.categoria
+        categoria.nome = "Furto de celular"
+        categoria.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["categoria"] == "Furto de celular"
+
+    def test_detail_not_found_still_404(self, client):
+        url = reverse("denuncia_detail", kwargs={"pk": "00000000-0000-0000-0000-000000000000"})
+        assert client.get(url).status_code == 404
+
+    def test_dashboard_304(self, admin_client, denuncia):
+        url = reverse("denuncia_dashboard")
+        etag = admin_client.get(url)["ETag"]
+        assert admin_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    def test_cache_hit_does_not_query_denuncias(self, client, admin_client, denuncia):
+        """Validadores e resposta saem do cache: nenhuma consulta a denúncias num hit."""
+        for api_client, url in ((client, reverse("denuncia-heatmap")), (admin_client, reverse("denuncia_dashboard"))):
+            assert api_client.get(url)["X-Cache"] == "MISS"
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.get(url)
+            assert response["X-Cache"] == "HIT"
+            assert not any('"api_denuncia"' in query["sql"] for query in queries.captured_queries)
+
+    def test_etag_changes_on_categoria_rename(self, client, denuncia):
+        url = reverse("denuncia-heatmap")
+        etag = client.get(url)["ETag"]
+        categoria = denuncia.categoria
+        categoria.nome = "Furto de celular"
+        categoria.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data[0]["categoria"] == "Furto de celular"
@@ -1,20 +1,29 @@
+import time
+import uuid
 from datetime import timedelta
 
 import pytest
 from django.contrib.auth import get_user_model
 from django.contrib.gis.geos import Point
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
+from api.categories import get_categoria
 from api.choice import StatusChoices
 from api.models import Denuncia
+from api.pagination import EstimatedCountPaginator
+from api.serializers import DenunciaListSerializer
 
 User = get_user_model()
 
 
 @pytest.fixture
-def denuncia_data():
-    """Dados para criar uma denúncia."""
+def denuncia_data(db):
+    """Dados para criar uma denúncia (a categoria precisa existir)."""
+    get_categoria("Vandalismo")
     return {
         "categoria": "Vandalismo",
         "descricao": "Grafite em parede pública",
@@ -29,7 +38,7 @@ def denuncia(db, denuncia_data):
     """Cria uma denúncia de teste."""
     location = Point(denuncia_data["longitude"], denuncia_data["latitude"], srid=4326)
     return Denuncia.objects.create(
-        categoria=denuncia_data["categoria"],
+        categoria=get_categoria(denuncia_data["categoria"]),
         descricao=denuncia_data["descricao"],
         localizacao=location,
         status=denuncia_data["status"]
@@ -41,7 +50,7 @@ def denuncia_with_user(db, denuncia_data, user):
     """Cria denúncia associada a um usuário."""
     location = Point(denuncia_data["longitude"], denuncia_data["latitude"], srid=4326)
     return Denuncia.objects.create(
-        categoria=denuncia_data["categoria"],
+        categoria=get_categoria(denuncia_data["categoria"]),
         descricao=denuncia_data["descricao"],
         localizacao=location,
         status=denuncia_data["status"],
@@ -69,6 +78,45 @@ class TestDenunciaCreate:
         assert response.status_code == 201
         assert Denuncia.objects.count() == 1
     
+    def test_create_denuncia_reuses_categoria(self, client, denuncia, denuncia_data):
+        """Nomes de categoria são resolvidos sem diferenciar maiúsculas."""
+        url = reverse("denuncia_create")
+        response = client.post(url, {**denuncia_data, "categoria": " VANDALISMO "}, format="json")
+        assert response.status_code == 201
+        assert response.data["categoria"] == "Vandalismo"
+        assert Denuncia.objects.filter(categoria_id=denuncia.categoria_id).count() == 2
+
+    def test_create_denuncia_unknown_categoria(self, client, auth_client, admin_client, denuncia_data):
+        """Só admin cria categoria nova; para os demais, nome desconhecido é 400."""
+        url = reverse("denuncia_create")
+        for anonymous_or_user in (client, auth_client):
+            response = anonymous_or_user.post(url, {**denuncia_data, "categoria": "Enchente"}, format="json")
+            assert response.status_code == 400
+            assert "categoria" in response.data
+        assert "Enchente" not in [item["nome"] for item in client.get(reverse("categoria-list")).data]
+
+        response = admin_client.post(url, {**denuncia_data, "categoria": "Enchente"}, format="json")
+        assert response.status_code == 201
+        assert "Enchente" in [item["nome"] for item in client.get(reverse("categoria-list")).data]
+
+    def test_default_categorias_are_seeded(self, client, denuncia_data):
+        """A migração cadastra as categorias do formulário: instalação nova já aceita denúncias públicas."""
+        nomes = [item["nome"] for item in client.get(reverse("categoria-list")).data]
+        assert {"Furto", "Roubo", "Cibercrime", "Outro"} <= set(nomes)
+
+        response = client.post(reverse("denuncia_create"), {**denuncia_data, "categoria": "cibercrime"}, format="json")
+        assert response.status_code == 201
+        assert response.data["categoria"] == "Cibercrime"
+
+    def test_create_denuncia_uses_time_ordered_id(self, client, denuncia_data):
+        """Novas denúncias recebem UUIDv7, com o instante de criação nos 48 bits iniciais."""
+        before = int(time.time() * 1000)
+        response = client.post(reverse("denuncia_create"), denuncia_data, format="json")
+        after = int(time.time() * 1000)
+        pk = uuid.UUID(str(response.data["id"]))
+        assert (pk.version, pk.variant) == (7, uuid.RFC_4122)
+        assert before <= pk.int >> 80 <= after
+
     def test_create_denuncia_missing_required_fields(self, client):
         """Testa criação sem campos obrigatórios."""
         url = reverse("denuncia_create")
@@ -105,19 +153,79 @@ class TestDenunciaList:
         response = auth_client.get(url)
         assert response.status_code == 200
         assert len(response.data["results"]) == 1
-    
+
+    def test_list_denuncias_compact_by_default(self, auth_client, denuncia):
+        """Sem `fields`, a listagem usa a representação enxuta."""
+        item = auth_client.get(reverse("denuncia_list")).data["results"][0]
+        assert set(item) == set(DenunciaListSerializer.default_fields)
+
+    def test_list_denuncias_sparse_fields(self, auth_client, denuncia):
+        """`?fields=` reduz a resposta e o SELECT."""
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(reverse("denuncia_list"), {"fields": "protocolo,descricao"})
+        assert response.status_code == 200
+        assert response.data["results"] == [{"protocolo": denuncia.protocolo, "descricao": denuncia.descricao}]
+        select = next(q["sql"] for q in queries.captured_queries if '"api_denuncia"."descricao"' in q["sql"])
+        assert '"localizacao"' not in select
+        assert '"midia"' not in select
+
+    def test_list_denuncias_invalid_fields(self, auth_client, db):
+        response = auth_client.get(reverse("denuncia_list"), {"fields": "protocolo,senha"})
+        assert response.status_code == 400
+        assert "fields" in response.data
+
+    def test_list_denuncias_full_text_search(self, auth_client, db):
+        """`q` usa a busca textual em português (radicais) e ordena por relevância."""
+        location = Point(-46.6333, -23.5505, srid=4326)
+        na_descricao = Denuncia.objects.create(
+            categoria=get_categoria("Furto"), descricao="Celular roubado no ponto de ônibus", localizacao=location
+        )
+        na_categoria = Denuncia.objects.create(
+            categoria=get_categoria("Roubo"), descricao="Abordagem na saída do metrô", localizacao=location
+        )
+        Denuncia.objects.create(categoria=get_categoria("Vandalismo"), descricao="Muro pichado", localizacao=location)
+
+        response = auth_client.get(reverse("denuncia_list"), {"q": "roubos"})
+        assert response.status_code == 200
+        # categoria tem peso maior que descrição
+        assert [item["id"] for item in response.data["results"]] == [str(na_categoria.id), str(na_descricao.id)]
+
+    def test_search_vector_follows_updates(self, auth_client, denuncia):
+        """O trigger recalcula o vetor mesmo em `update()` (sem signals)."""
+        url = reverse("denuncia_list")
+        assert auth_client.get(url, {"q": "enchente"}).data["results"] == []
+
+        Denuncia.objects.filter(pk=denuncia.pk).update(descricao="Rua alagada depois da enchente")
+        results = auth_client.get(url, {"q": "enchente"}).data["results"]
+        assert [item["id"] for item in results] == [str(denuncia.id)]
+
+    def test_search_vector_follows_categoria_rename(self, auth_client, denuncia):
+        """Renomear a categoria recalcula o vetor das denúncias dela."""
+        denuncia.categoria.nome = "Pichação"
+        denuncia.categoria.save()
+        results = auth_client.get(reverse("denuncia_list"), {"q": "pichação"}).data["results"]
+        assert [item["id"] for item in results] == [str(denuncia.id)]
+        assert results[0]["categoria"] == "Pichação"
+
+    def test_admin_search_uses_full_text(self, client, admin_user, denuncia):
+        client.force_login(admin_user)
+        url = "/admin/api/denuncia/"
+        assert denuncia.protocolo in client.get(url, {"q": "grafites"}).content.decode()
+        assert denuncia.protocolo in client.get(url, {"q": denuncia.protocolo.lower()}).content.decode()
+        assert denuncia.protocolo not in client.get(url, {"q": "enchente"}).content.decode()
+
     def test_list_denuncias_filter_by_status(self, auth_client, db):
         """Testa filtro por status."""
         # Cria denúncias com status diferentes
         location = Point(-46.6333, -23.5505, srid=4326)
         Denuncia.objects.create(
-            categoria="Teste 1",
+            categoria=get_categoria("Teste 1"),
             descricao="Descrição 1",
             localizacao=location,
             status="em_analise"
         )
         Denuncia.objects.create(
-            categoria="Teste 2",
+            categoria=get_categoria("Teste 2"),
             descricao="Descrição 2",
             localizacao=location,
             status="rejeitado"
@@ -132,12 +240,12 @@ class TestDenunciaList:
         """Testa filtro por categoria."""
         location = Point(-46.6333, -23.5505, srid=4326)
         Denuncia.objects.create(
-            categoria="Vandalismo",
+            categoria=get_categoria("Vandalismo"),
             descricao="Descrição",
             localizacao=location
         )
         Denuncia.objects.create(
-            categoria="Assalto",
+            categoria=get_categoria("Assalto"),
             descricao="Descrição",
             localizacao=location
         )
@@ -146,14 +254,48 @@ class TestDenunciaList:
         response = auth_client.get(url, {"categoria": "Vandalismo"})
         assert response.status_code == 200
         assert all(item["categoria"] == "Vandalismo" for item in response.data["results"])
+
+    def test_list_denuncias_filter_by_categoria_id_or_nome(self, auth_client, denuncia):
+        """O filtro aceita o nome (sem diferenciar maiúsculas) ou o id; categoria desconhecida não retorna nada."""
+        url = reverse("denuncia_list")
+        for value in ("vandalismo", str(denuncia.categoria_id)):
+            results = auth_client.get(url, {"categoria": value}).data["results"]
+            assert [item["id"] for item in results] == [str(denuncia.id)]
+        assert auth_client.get(url, {"categoria": "Inexistente"}).data["results"] == []
     
+    def test_list_denuncias_near_order_by_distance(self, auth_client, db):
+        """`near` + `radius_m` filtram pelo raio em metros e `order=distance` ordena do mais próximo ao mais distante."""
+        centro = Point(-46.6333, -23.5505, srid=4326)
+        ids = {}
+        for nome, location in (
+            ("longe", Point(-46.6433, -23.5505, srid=4326)),  # ~1 km
+            ("perto", Point(-46.6335, -23.5505, srid=4326)),  # ~20 m
+            ("centro", centro),
+            ("fora", Point(-43.1729, -22.9068, srid=4326)),  # Rio de Janeiro
+        ):
+            ids[nome] = str(
+                Denuncia.objects.create(categoria=get_categoria("Buraco"), descricao=nome, localizacao=location).id
+            )
+
+        url = reverse("denuncia_list")
+        params = {"near": "-23.5505,-46.6333", "radius_m": "2000", "order": "distance"}
+        response = auth_client.get(url, params)
+        assert response.status_code == 200
+        assert [item["id"] for item in response.data["results"]] == [ids["centro"], ids["perto"], ids["longe"]]
+
+        response = auth_client.get(url, {**params, "radius_m": "100"})
+        assert [item["id"] for item in response.data["results"]] == [ids["centro"], ids["perto"]]
+
+        # a paginação por cursor continua em (created_at, id)
+        assert auth_client.get(url, {**params, "cursor": ""}).status_code == 400
+
     def test_list_denuncias_pagination(self, auth_client, db):
         """Testa paginação da listagem."""
         location = Point(-46.6333, -23.5505, srid=4326)
         # Cria mais de 20 denúncias (page_size padrão)
         for i in range(25):
             Denuncia.objects.create(
-                categoria=f"Categoria {i}",
+                categoria=get_categoria(f"Categoria {i}"),
                 descricao=f"Descrição {i}",
                 localizacao=location
             )
@@ -165,6 +307,68 @@ class TestDenunciaList:
         assert "count" in response.data
         assert len(response.data["results"]) <= 20
 
+    def test_list_denuncias_keyset_pagination(self, auth_client, db):
+        """Cursor percorre (created_at, id) sem repetir linhas, inclusive com datas empatadas."""
+        location = Point(-46.6333, -23.5505, srid=4326)
+        created_at = timezone.now()
+        for i in range(7):
+            denuncia = Denuncia.objects.create(
+                categoria=get_categoria("Furto"), descricao=f"Descrição {i}", localizacao=location, status="em_analise"
+            )
+            # pares de denúncias com o mesmo created_at forçam o desempate por id
+            Denuncia.objects.filter(pk=denuncia.pk).update(created_at=created_at - timedelta(minutes=i // 2))
+        Denuncia.objects.create(categoria=get_categoria("Roubo"), descricao="Outra", localizacao=location, status="aprovado")
+        expected = [
+            str(pk)
+            for pk in Denuncia.objects.filter(status="em_analise")
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        ]
+
+        url = reverse("denuncia_list")
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(url, {"cursor": "", "page_size": 3, "status": "em_analise"})
+        assert "count" not in response.data
+        assert response.data["previous"] is None
+        assert not any("COUNT(" in query["sql"] for query in queries.captured_queries)
+
+        seen = [item["id"] for item in response.data["results"]]
+        pages = [response]
+        while response.data["next"]:
+            response = auth_client.get(response.data["next"])
+            assert response.status_code == 200
+            seen += [item["id"] for item in response.data["results"]]
+            pages.append(response)
+        assert seen == expected
+        assert [len(page.data["results"]) for page in pages] == [3, 3, 1]
+
+        previous = auth_client.get(pages[-1].data["previous"])
+        assert previous.data["results"] == pages[1].data["results"]
+
+    def test_list_denuncias_page_number_above_threshold_skips_count(self, auth_client, db, monkeypatch):
+        """Com a estimativa acima do limite, a paginação por página não executa nenhum COUNT."""
+        monkeypatch.setattr(EstimatedCountPaginator, "estimate_threshold", 0)
+        location = Point(-46.6333, -23.5505, srid=4326)
+        for i in range(3):
+            Denuncia.objects.create(categoria=get_categoria("Furto"), descricao=f"Descrição {i}", localizacao=location)
+
+        url = reverse("denuncia_list")
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(url, {"page": 1, "page_size": 2})
+        assert response.status_code == 200
+        assert response.data["count_is_estimate"] is True
+        assert response.data["next"] is not None
+        assert not any("COUNT(" in query["sql"].upper() for query in queries.captured_queries)
+
+        last = auth_client.get(url, {"page": 2, "page_size": 2})
+        assert len(last.data["results"]) == 1
+        assert last.data["count"] == 3
+        assert last.data["count_is_estimate"] is False
+
+    def test_list_denuncias_invalid_cursor(self, auth_client, db):
+        response = auth_client.get(reverse("denuncia_list"), {"cursor": "invalido"})
+        assert response.status_code == 404
+
 
 @pytest.mark.django_db
 class TestDenunciaDetail:
@@ -202,6 +406,12 @@ class TestDenunciaDetail:
         assert usuario["id"] == denuncia_with_user.usuario.id
         assert usuario["email"] == denuncia_with_user.usuario.email
 
+    def test_detail_denuncia_sparse_fields(self, client, denuncia):
+        url = reverse("denuncia_detail_protocolo", kwargs={"protocolo": denuncia.protocolo})
+        response = client.get(url, {"fields": "status,categoria"})
+        assert response.status_code == 200
+        assert response.data == {"status": denuncia.status, "categoria": denuncia.categoria.nome}
+
 
 @pytest.mark.django_db
 class TestDenunciaUpdate:
@@ -216,6 +426,7 @@ class TestDenunciaUpdate:
     
     def test_update_denuncia_authenticated(self, auth_client, denuncia):
         """Testa atualização por usuário autenticado."""
+        get_categoria("Categoria Atualizada")
         url = reverse("denuncia_update", kwargs={"pk": denuncia.pk})
         data = {"categoria": "Categoria Atualizada", "status": "rejeitado"}
         response = auth_client.patch(url, data, format="json")
@@ -225,7 +436,7 @@ class TestDenunciaUpdate:
         
         # Verifica no banco
         denuncia.refresh_from_db()
-        assert denuncia.categoria == "Categoria Atualizada"
+        assert denuncia.categoria.nome == "Categoria Atualizada"
     
     def test_update_denuncia_usuario_requires_admin(self, auth_client, denuncia, admin_user):
         """Testa que alterar campo usuario requer permissão de admin."""
@@ -300,7 +511,7 @@ class TestDenunciaHistoryDashboard:
         last_month_start = last_month_end.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
         Denuncia.objects.create(
-            categoria="Atual",
+            categoria=get_categoria("Atual"),
             descricao="Teste",
             localizacao=Point(-46, -23, srid=4326),
             status=StatusChoices.EM_ANALISE,
@@ -308,7 +519,7 @@ class TestDenunciaHistoryDashboard:
             updated_at=current_month + timedelta(days=1),
         )
         Denuncia.objects.create(
-            categoria="Resolvida",
+            categoria=get_categoria("Resolvida"),
             descricao="Teste",
             localizacao=Point(-46, -23, srid=4326),
             status=StatusChoices.APROVADO,
@@ -316,7 +527,7 @@ class TestDenunciaHistoryDashboard:
             updated_at=current_month + timedelta(days=2),
         )
         Denuncia.objects.create(
-            categoria="Rejeitada",
+            categoria=get_categoria("Rejeitada"),
             descricao="Antiga",
             localizacao=Point(-46, -23, srid=4326),
             status=StatusChoices.REJEITADO,
@@ -330,6 +541,45 @@ class TestDenunciaHistoryDashboard:
         metrics = response.data["metrics"]
         assert metrics["totalReports"] == 3
         assert metrics["reportsByStatus"]["rejected"] >= 1
+
+    @override_settings(API_CACHE_ENABLED=False)
+    def test_dashboard_metrics_single_pass(self, admin_client):
+        """Métricas de denúncias saem de um único agregado condicional."""
+        now = timezone.localtime()
+        current_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        last_month = (current_month - timedelta(days=1)).replace(day=1)
+
+        for status in (StatusChoices.APROVADO, StatusChoices.EM_ANALISE, StatusChoices.APROVADO):
+            Denuncia.objects.create(
+                categoria=get_categoria("Furto"), descricao="Teste", localizacao=Point(-46, -23, srid=4326), status=status
+            )
+        antiga = Denuncia.objects.create(
+            categoria=get_categoria("Furto"),
+            descricao="Antiga",
+            localizacao=Point(-46, -23, srid=4326),
+            status=StatusChoices.REJEITADO,
+        )
+        # `created_at` é auto_now_add; update() contorna para simular o mês anterior
+        Denuncia.objects.filter(pk=antiga.pk).update(created_at=last_month + timedelta(days=3))
+
+        url = reverse("denuncia_dashboard")
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(url)
+        assert response.status_code == 200
+
+        metrics = response.data["metrics"]
+        assert metrics["totalReports"] == 4
+        assert metrics["reportsByStatus"] == {"rejected": 1, "pending": 1, "resolved": 2}
+        comparison = metrics["resolutionRateComparison"]
+        assert comparison["currentMonth"]["total"] == 3
+        assert comparison["currentMonth"]["resolved"] == 2
+        assert comparison["currentMonth"]["rate"] == pytest.approx(66.67)
+        assert comparison["lastMonth"]["total"] == 1
+        assert comparison["lastMonth"]["resolved"] == 0
+
+        # só o agregado das métricas (a ETag vem da geração do cache)
+        denuncia_queries = [q["sql"] for q in queries.captured_queries if '"api_denuncia"' in q["sql"]]
+        assert len(denuncia_queries) == 1
     
     def test_delete_denuncia_as_admin(self, admin_client, denuncia):
         """Testa exclusão por admin."""
@@ -1,11 +1,19 @@
+import json
+import struct
 from datetime import datetime, time, timedelta
 
 import pytest
+from django.contrib import admin
 from django.contrib.gis.geos import Point
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
-from api.models import Denuncia
+from api.admin import DenunciaAdmin
+from api.categories import get_categoria
+from api.models import Categoria, Denuncia
 
 
 @pytest.fixture
@@ -22,7 +30,7 @@ def denuncias_for_heatmap(db):
     denuncias = []
     for i, location in enumerate(locations):
         denuncia = Denuncia.objects.create(
-            categoria=f"Categoria {i}",
+            categoria=get_categoria(f"Categoria {i}"),
             descricao=f"Descrição {i}",
             localizacao=location,
         )
@@ -96,7 +104,7 @@ class TestDenunciaHeatmap:
         # Deve retornar mais recentes pelo campo created_at
         categorias = [item["categoria"] for item in response.data]
         expected = [
-            d.categoria
+            d.categoria.nome
             for d in sorted(denuncias_for_heatmap, key=lambda d: d.created_at, reverse=True)[:2]
         ]
         assert categorias == expected
@@ -116,7 +124,7 @@ class TestDenunciaHeatmap:
             tz,
         )
         expected = {
-            d.categoria for d in denuncias_for_heatmap if d.created_at >= start_boundary
+            d.categoria.nome for d in denuncias_for_heatmap if d.created_at >= start_boundary
         }
         assert categorias == expected
     
@@ -143,3 +151,249 @@ class TestDenunciaHeatmap:
         assert response.status_code == 200
         # Deve aplicar todos os filtros
         assert len(response.data) <= 10
+
+    @override_settings(API_CACHE_ENABLED=False)
+    def test_heatmap_query_count_is_constant(self, client, denuncias_for_heatmap):
+        """Número de queries não cresce com a quantidade de pontos (sem N+1)."""
+        url = reverse("denuncia-heatmap")
+
+        with CaptureQueriesContext(connection) as few:
+            response = client.get(url)
+        assert len(response.data) == 4
+
+        Denuncia.objects.bulk_create(
+            Denuncia(
+                categoria=get_categoria("Extra"),
+                descricao="Extra",
+                localizacao=Point(-46.6 + i * 0.001, -23.5, srid=4326),
+            )
+            for i in range(20)
+        )
+        with CaptureQueriesContext(connection) as many:
+            response = client.get(url)
+        assert len(response.data) == 24
+
+        # só a projeção dos pontos (a ETag vem da geração do cache)
+        assert len(few.captured_queries) == len(many.captured_queries) == 1
+
+    def test_heatmap_point_values(self, client, denuncias_for_heatmap):
+        """Valores projetados no SQL batem com os dados do modelo."""
+        url = reverse("denuncia-heatmap")
+        response = client.get(url)
+        by_id = {item["id"]: item for item in response.data}
+        for denuncia in denuncias_for_heatmap:
+            item = by_id[str(denuncia.id)]
+            assert item["categoria"] == denuncia.categoria.nome
+            assert item["lat"] == round(denuncia.localizacao.y, 6)
+            assert item["lng"] == round(denuncia.localizacao.x, 6)
+            assert item["date"] == denuncia.created_at.isoformat()
+            assert item["weight"] == 1
+
+    def test_heatmap_near_radius(self, client, denuncias_for_heatmap):
+        """`near` + `radius_m` filtram por distância em metros (ST_DWithin em geography)."""
+        url = reverse("denuncia-heatmap")
+        # os pontos "próximos" estão a ~10 m do centro de SP; o Rio fica a ~360 km
+        response = client.get(url, {"near": "-23.5505,-46.6333", "radius_m": "50"})
+        assert response.status_code == 200
+        assert {item["id"] for item in response.data} == {str(d.id) for d in denuncias_for_heatmap[:3]}
+
+        response = client.get(url, {"near": "-23.5505,-46.6333", "radius_m": "5"})
+        assert [item["id"] for item in response.data] == [str(denuncias_for_heatmap[0].id)]
+
+    def test_heatmap_order_by_distance(self, client, denuncias_for_heatmap):
+        """`order=distance` com `limit` devolve os pontos mais próximos primeiro."""
+        url = reverse("denuncia-heatmap")
+        response = client.get(url, {"near": "-22.9,-43.17", "order": "distance", "limit": "2"})
+        assert response.status_code == 200
+        ids = [item["id"] for item in response.data]
+        assert ids[0] == str(denuncias_for_heatmap[3].id)
+        assert len(ids) == 2
+
+    def test_heatmap_near_invalid_params(self, client, denuncias_for_heatmap):
+        """Parâmetros de proximidade inválidos ou incompletos retornam 400."""
+        url = reverse("denuncia-heatmap")
+        assert client.get(url, {"near": "-23.5"}).status_code == 400
+        assert client.get(url, {"near": "-123.5,-46.6"}).status_code == 400
+        assert client.get(url, {"radius_m": "100"}).status_code == 400
+        assert client.get(url, {"near": "-23.5,-46.6", "radius_m": "-1"}).status_code == 400
+        assert client.get(url, {"order": "distance"}).status_code == 400
+        assert client.get(url, {"near": "-23.5,-46.6", "order": "nome"}).status_code == 400
+        assert client.get(url, {"near": "-23.5,-46.6", "order": "distance", "aggregate": "grid"}).status_code == 400
+
+
+@pytest.mark.django_db
+class TestDenunciaHeatmapGrid:
+    """Testes para o modo agregado (aggregate=grid) do heatmap."""
+
+    def test_grid_groups_nearby_points(self, client, denuncias_for_heatmap):
+        """Pontos próximos caem na mesma célula e somam peso."""
+        url = reverse("denuncia-heatmap")
+        response = client.get(url, {"aggregate": "grid", "cell_size": "0.1"})
+        assert response.status_code == 200
+        assert [cell["weight"] for cell in response.data] == [3, 1]
+        assert sum(cell["weight"] for cell in response.data) == len(denuncias_for_heatmap)
+        for cell in response.data:
+            assert set(cell) == {"lat", "lng", "weight"}
+        # centroide da célula de SP fica entre os pontos agregados
+        assert response.data[0]["lat"] == pytest.approx(-23.5505, abs=1e-3)
+        assert response.data[0]["lng"] == pytest.approx(-46.6333, abs=1e-3)
+
+    def test_grid_respects_bbox(self, client, denuncias_for_heatmap):
+        """Filtro bbox continua valendo no modo agregado."""
+        url = reverse("denuncia-heatmap")
+        response = client.get(url, {
+            "aggregate": "grid",
+            "zoom": "10",
+            "bbox": "-46.64,-23.56,-46.62,-23.54",
+        })
+        assert response.status_code == 200
+        assert sum(cell["weight"] for cell in response.data) == 3
+
+    def test_grid_invalid_params(self, client, denuncias_for_heatmap):
+        """Valores inválidos de aggregate/zoom/cell_size retornam 400."""
+        url = reverse("denuncia-heatmap")
+        assert client.get(url, {"aggregate": "hex"}).status_code == 400
+        assert client.get(url, {"aggregate": "grid", "zoom": "99"}).status_code == 400
+        assert client.get(url, {"aggregate": "grid", "cell_size": "-1"}).status_code == 400
+
+
+@pytest.mark.django_db
+class TestDenunciaHeatmapFormats:
+    """Testes para os formatos compactos (colunar e binário) do heatmap."""
+
+    def test_columnar_format(self, client, denuncias_for_heatmap):
+        url = reverse("denuncia-heatmap")
+        response = client.get(url, {"format": "columnar"})
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("application/vnd.mapcrime.heatmap-columnar+json")
+
+        payload = response.json()
+        assert payload["count"] == 4
+        for column in ("id", "categoria", "lat", "lng", "date"):
+            assert len(payload[column]) == 4
+        labels = [payload["categories"][code] for code in payload["categoria"]]
+        assert sorted(labels) == sorted(d.categoria.nome for d in denuncias_for_heatmap)
+
+    def test_binary_format(self, client, denuncias_for_heatmap):
+        url = reverse("denuncia-heatmap")
+        response = client.get(url, HTTP_ACCEPT="application/octet-stream")
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/octet-stream"
+
+        body = response.content
+        magic, count, dict_len = struct.unpack_from("<4sII", body)
+        assert magic == b"HMP1"
+        assert count == 4
+        offset = 12
+        categories = json.loads(body[offset:offset + dict_len].decode("utf-8"))
+        offset += dict_len
+        lats = struct.unpack_from(f"<{count}f", body, offset)
+        offset += 4 * count
+        lngs = struct.unpack_from(f"<{count}f", body, offset)
+        offset += 4 * count
+        timestamps = struct.unpack_from(f"<{count}I", body, offset)
+        offset += 4 * count
+        codes = struct.unpack_from(f"{count}B", body, offset)
+        assert offset + count == len(body)
+
+        # ordem segue -created_at, igual ao JSON padrão
+        expected = sorted(denuncias_for_heatmap, key=lambda d: d.created_at, reverse=True)
+        for idx, denuncia in enumerate(expected):
+            assert lats[idx] == pytest.approx(denuncia.localizacao.y, abs=1e-4)
+            assert lngs[idx] == pytest.approx(denuncia.localizacao.x, abs=1e-4)
+            assert timestamps[idx] == int(denuncia.created_at.timestamp())
+            assert categories[codes[idx]] == denuncia.categoria.nome
+
+    def test_category_codes_are_dense(self, client, denuncias_for_heatmap):
+        """Ids de categoria altos não alargam o dicionário nem estouram o uint8 do binário."""
+        categoria = Categoria.objects.create(id=32000, nome="Id alto")
+        Denuncia.objects.create(categoria=categoria, descricao="Id alto", localizacao=Point(-46.6, -23.5, srid=4326))
+        url = reverse("denuncia-heatmap")
+
+        payload = client.get(url, {"format": "columnar"}).json()
+        assert len(payload["categories"]) == 5
+        assert sorted(set(payload["categoria"])) == [0, 1, 2, 3, 4]
+        assert "Id alto" in payload["categories"]
+
+        response = client.get(url, {"format": "bin"})
+        assert response.status_code == 200
+        _magic, count, dict_len = struct.unpack_from("<4sII", response.content)
+        categories = json.loads(response.content[12:12 + dict_len].decode("utf-8"))
+        codes = response.content[-count:]
+        assert sorted(categories[code] for code in codes) == sorted(
+            ["Id alto", *(d.categoria.nome for d in denuncias_for_heatmap)]
+        )
+
+    def test_compact_formats_reject_grid(self, client, denuncias_for_heatmap):
+        url = reverse("denuncia-heatmap")
+        response = client.get(url, {"aggregate": "grid", "format": "bin"})
+        assert response.status_code == 400
+        assert "format" in response.json()
+
+
+@pytest.mark.django_db
+class TestDenunciaHeatmapDelta:
+    """Testes para o modo incremental (since=<cursor>) do heatmap."""
+
+    def test_full_response_exposes_cursor(self, client, denuncias_for_heatmap):
+        response = client.get(reverse("denuncia-heatmap"))
+        assert response.status_code == 200
+        assert response["X-Heatmap-Cursor"]
+
+    def test_delta_returns_new_points(self, client, denuncias_for_heatmap):
+        url = reverse("denuncia-heatmap")
+        cursor = client.get(url)["X-Heatmap-Cursor"]
+
+        nova = Denuncia.objects.create(
+            categoria=get_categoria("Nova"),
+            descricao="Nova",
+            localizacao=Point(-46.63, -23.55, srid=4326),
+        )
+        response = client.get(url, {"since": cursor})
+        assert response.status_code == 200
+        payload = response.json()
+        assert set(payload) == {"cursor", "upserts", "removed"}
+        assert str(nova.id) in {item["id"] for item in payload["upserts"]}
+        assert payload["removed"] == []
+
+    def test_delta_reports_deleted_ids(self, client, denuncias_for_heatmap):
+        url = reverse("denuncia-heatmap")
+        cursor = client.get(url)["X-Heatmap-Cursor"]
+
+        removida = denuncias_for_heatmap[0]
+        removida_id = str(removida.id)
+        removida.delete()
+
+        payload = client.get(url, {"since": cursor}).json()
+        assert removida_id in payload["removed"]
+        assert removida_id not in {item["id"] for item in payload["upserts"]}
+
+    def test_delta_reports_points_filtered_out_by_status(self, client, denuncias_for_heatmap):
+        url = reverse("denuncia-heatmap")
+        cursor = client.get(url, {"status": "em_analise"})["X-Heatmap-Cursor"]
+
+        alterada = denuncias_for_heatmap[1]
+        alterada.status = "aprovado"
+        alterada.save()
+
+        payload = client.get(url, {"status": "em_analise", "since": cursor}).json()
+        assert str(alterada.id) in payload["removed"]
+        assert str(alterada.id) not in {item["id"] for item in payload["upserts"]}
+
+    def test_delta_sees_admin_bulk_status_change(self, client, rf, denuncias_for_heatmap, monkeypatch):
+        """A ação em lote do admin usa `update()`, que precisa avançar `updated_at` para o delta."""
+        url = reverse("denuncia-heatmap")
+        cursor = client.get(url, {"status": "em_analise"})["X-Heatmap-Cursor"]
+
+        model_admin = DenunciaAdmin(Denuncia, admin.site)
+        monkeypatch.setattr(model_admin, "message_user", lambda *args, **kwargs: None)
+        alterada = denuncias_for_heatmap[2]
+        model_admin.marcar_como_rejeitado(rf.post("/"), Denuncia.objects.filter(pk=alterada.pk))
+
+        payload = client.get(url, {"status": "em_analise", "since": cursor}).json()
+        assert str(alterada.id) in payload["removed"]
+
+    def test_delta_invalid_cursor(self, client, denuncias_for_heatmap):
+        response = client.get(reverse("denuncia-heatmap"), {"since": "not-a-cursor"})
+        assert response.status_code == 400
+        assert "since" in response.json()
@@ -1,11 +1,19 @@
+import io
+import warnings
 from datetime import datetime, time, timedelta
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 from django.contrib.gis.geos import Point
 from django.urls import reverse
 from django.utils import timezone
+from docx import Document
+from openpyxl import load_workbook
 
+from api.categories import get_categoria
 from api.models import Denuncia
+from api.views.denuncia.report import DenunciaReportView
 
 
 def _detail_categories_from_csv(content: str):
@@ -22,6 +30,13 @@ def _detail_categories_from_csv(content: str):
     return categories
 
 
+def _body(response) -> str:
+    """CSV é entregue em streaming; XLSX/DOCX continuam em `content`."""
+    if response.streaming:
+        return b"".join(response.streaming_content).decode("utf-8")
+    return response.content.decode("utf-8")
+
+
 def _start_boundary(date_value):
     tz = timezone.get_current_timezone()
     return timezone.make_aware(datetime.combine(date_value, time.min), tz)
@@ -34,7 +49,7 @@ def sample_denuncias(db):
 
     def create(offset_days: int, status: str, categoria: str):
         denuncia = Denuncia.objects.create(
-            categoria=categoria,
+            categoria=get_categoria(categoria),
             descricao=f"Descrição {categoria}",
             localizacao=base_point,
             status=status,
@@ -64,17 +79,47 @@ class TestDenunciaReportView:
 
         assert response.status_code == 200
         assert response["Content-Type"].startswith("text/csv")
-        body = response.content.decode("utf-8")
+        body = _body(response)
         assert "Relatório de Denúncias" in body
         assert "Total de denúncias: 3" in body
 
+    def test_csv_is_streamed(self, auth_client, sample_denuncias):
+        """CSV sai como StreamingHttpResponse com todas as linhas de detalhe."""
+        url = reverse("denuncia-report")
+        response = auth_client.get(url, {"formato": "csv"})
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert "attachment" in response["Content-Disposition"]
+        body = _body(response)
+        assert sorted(_detail_categories_from_csv(body)) == ["Categoria A", "Categoria B", "Categoria C"]
+        assert sample_denuncias[0].protocolo in body
+
+    @pytest.mark.django_db(transaction=True)
+    def test_csv_is_streamed_under_asgi(self, asgi_get, user, sample_denuncias, monkeypatch):
+        """Sob ASGI o CSV sai bloco a bloco, sem o Django consumir o gerador inteiro antes."""
+        monkeypatch.setattr(DenunciaReportView, "CSV_FLUSH_ROWS", 1)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            status, headers, bodies = asgi_get(reverse("denuncia-report"), "formato=csv", user=user)
+
+        assert status == 200
+        assert headers[b"content-type"].startswith(b"text/csv")
+        assert not [w for w in caught if "synchronous iterators" in str(w.message)]
+        # cabeçalho + uma linha por bloco
+        chunks = [m["body"] for m in bodies if m["body"]]
+        assert len(chunks) > len(sample_denuncias)
+        assert all(m.get("more_body") for m in bodies[:-1])
+        body = b"".join(chunks).decode("utf-8")
+        assert sorted(_detail_categories_from_csv(body)) == ["Categoria A", "Categoria B", "Categoria C"]
+
     def test_filters_by_date_range(self, auth_client, sample_denuncias):
         url = reverse("denuncia-report")
         data_inicio = sample_denuncias[1].created_at.isoformat()
         response = auth_client.get(url, {"data_inicio": data_inicio})
 
         assert response.status_code == 200
-        content = response.content.decode("utf-8")
+        content = _body(response)
         start_boundary = _start_boundary(sample_denuncias[1].created_at.date())
         expected_total = sum(1 for d in sample_denuncias if d.created_at >= start_boundary)
         assert f"Total de denúncias: {expected_total}" in content
@@ -98,6 +143,55 @@ class TestDenunciaReportView:
             == "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
         )
 
+    def test_xlsx_splits_details_across_sheets(self, admin_client, sample_denuncias, monkeypatch):
+        """Acima do limite de linhas, os detalhes continuam em outra planilha."""
+        # resumo sem filtros ocupa 10 linhas (incluindo o cabeçalho dos detalhes)
+        monkeypatch.setattr(DenunciaReportView, "XLSX_MAX_ROWS", 11)
+        url = reverse("denuncia-report")
+        response = admin_client.get(url, {"formato": "xlsx"})
+        assert response.status_code == 200
+
+        workbook = load_workbook(io.BytesIO(b"".join(response.streaming_content)))
+        assert workbook.sheetnames == ["Relatório", "Relatório (2)"]
+        first, second = workbook.worksheets
+        assert first.cell(row=1, column=1).value == "Relatório de Denúncias"
+        assert first.max_row == 11
+        assert [cell.value for cell in second[1]] == DenunciaReportView.DETAIL_HEADERS
+        categorias = [first.cell(row=11, column=2).value] + [row[1].value for row in second.iter_rows(min_row=2)]
+        assert categorias == ["Categoria A", "Categoria B", "Categoria C"]
+
+    def test_docx_table_has_every_detail_row(self, admin_client, sample_denuncias):
+        """Linhas inseridas em lote continuam legíveis pelo python-docx."""
+        url = reverse("denuncia-report")
+        response = admin_client.get(url, {"formato": "docx"})
+        assert response.status_code == 200
+
+        table = Document(io.BytesIO(response.content)).tables[0]
+        rows = [[cell.text for cell in row.cells] for row in table.rows]
+        assert rows[0] == DenunciaReportView.DETAIL_HEADERS
+        assert [row[1] for row in rows[1:]] == ["Categoria A", "Categoria B", "Categoria C"]
+        assert rows[1][0] == sample_denuncias[0].protocolo
+        assert rows[1][4] == "Descrição Categoria A"
+
+    def test_columnar_formats_keep_types(self, admin_client, sample_denuncias):
+        """Parquet e Arrow trazem só as linhas, com timestamp e coordenadas tipados."""
+        url = reverse("denuncia-report")
+        parquet = admin_client.get(url, {"formato": "parquet"})
+        assert parquet.status_code == 200
+        assert parquet["Content-Type"] == "application/vnd.apache.parquet"
+        table = pq.read_table(io.BytesIO(b"".join(parquet.streaming_content)))
+
+        arrow = admin_client.get(url, {"formato": "ipc"})
+        assert arrow["Content-Type"] == "application/vnd.apache.arrow.file"
+        assert pa.ipc.open_file(io.BytesIO(b"".join(arrow.streaming_content))).read_all().equals(table)
+
+        assert table.column("categoria").to_pylist() == ["Categoria A", "Categoria B", "Categoria C"]
+        assert table.column("protocolo")[0].as_py() == sample_denuncias[0].protocolo
+        assert table.schema.field("created_at").type == pa.timestamp("us", tz="UTC")
+        assert table.column("created_at")[0].as_py() == sample_denuncias[0].created_at
+        assert table.column("latitude")[0].as_py() == pytest.approx(-23.5505)
+        assert table.column("longitude")[0].as_py() == pytest.approx(-46.6333)
+
     def test_filters_ignore_time_component(self, auth_client, sample_denuncias):
         """Mesmo com horário no parâmetro, filtro considera o dia inteiro."""
         url = reverse("denuncia-report")
@@ -105,11 +199,11 @@ class TestDenunciaReportView:
         response = auth_client.get(url, {"data_inicio": f"{start_date}T23:59:59"})
 
         assert response.status_code == 200
-        content = response.content.decode("utf-8")
+        content = _body(response)
         categorias = set(_detail_categories_from_csv(content))
         expected_boundary = _start_boundary(sample_denuncias[1].created_at.date())
         expected = {
-            d.categoria for d in sample_denuncias if d.created_at >= expected_boundary
+            d.categoria.nome for d in sample_denuncias if d.created_at >= expected_boundary
         }
         assert categorias == expected
 
@@ -120,7 +214,7 @@ class TestDenunciaReportView:
         response = auth_client.get(url, {"data_inicio": filtered_start})
         assert response.status_code == 200
 
-        content = response.content.decode("utf-8")
+        content = _body(response)
         assert "Totais por status (intervalo)" in content
         assert "Totais por status (geral)" in content
         assert "Em análise" in content
@@ -0,0 +1,90 @@
+import pytest
+from django.contrib.gis.geos import Point
+from django.urls import reverse
+
+from api.categories import get_categoria
+from api.models import Denuncia
+from api.tiles import tile_for_point
+
+SAO_PAULO = (-46.6333, -23.5505)
+
+
+def _tile_url(z, x, y):
+    return reverse("denuncia-tile", kwargs={"z": z, "x": x, "y": y})
+
+
+def _create_denuncia(lng, lat, categoria="Furto"):
+    return Denuncia.objects.create(
+        categoria=get_categoria(categoria),
+        descricao="Descrição",
+        localizacao=Point(lng, lat, srid=4326),
+    )
+
+
+def test_tile_for_point_known_values():
+    """Coordenadas XYZ conferem com o esquema de tiles Web Mercator."""
+    assert tile_for_point(0.0, 0.0, 0) == (0, 0)
+    assert tile_for_point(-46.6333, -23.5505, 10) == (379, 580)
+
+
+@pytest.mark.django_db
+class TestDenunciaTiles:
+    """Testes para o endpoint de tiles MVT."""
+
+    def test_tile_contains_points_inside(self, client):
+        _create_denuncia(*SAO_PAULO)
+        x, y = tile_for_point(*SAO_PAULO, 12)
+
+        response = client.get(_tile_url(12, x, y))
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/vnd.mapbox-vector-tile"
+        assert "max-age" in response["Cache-Control"]
+        assert len(response.content) > 0
+        assert b"Furto" in response.content
+
+    def test_tile_without_points_is_empty(self, client):
+        _create_denuncia(*SAO_PAULO)
+        response = client.get(_tile_url(12, 0, 0))
+        assert response.status_code == 200
+        assert response.content == b""
+
+    def test_invalid_tile_coordinates(self, client):
+        response = client.get(_tile_url(2, 4, 0))
+        assert response.status_code == 400
+
+    def test_date_filter(self, client):
+        _create_denuncia(*SAO_PAULO)
+        x, y = tile_for_point(*SAO_PAULO, 12)
+        response = client.get(_tile_url(12, x, y), {"start_date": "2999-01-01"})
+        assert response.status_code == 200
+        assert response.content == b""
+
+    def test_cache_invalidated_on_create_and_update(self, client):
+        """Criar ou alterar denúncia dentro do tile gera nova versão em cache."""
+        denuncia = _create_denuncia(*SAO_PAULO)
+        x, y = tile_for_point(*SAO_PAULO, 12)
+        url = _tile_url(12, x, y)
+
+        first = client.get(url).content
+        _create_denuncia(SAO_PAULO[0] + 0.001, SAO_PAULO[1], categoria="Roubo")
+        second = client.get(url).content
+        assert second != first
+        assert b"Roubo" in second
+
+        denuncia.status = "aprovado"
+        denuncia.save()
+        third = client.get(url).content
+        assert third != second
+        assert b"aprovado" in third
+
+    def test_cache_invalidated_on_categoria_rename(self, client):
+        """Renomear uma categoria descarta os tiles que traziam o nome antigo."""
+        denuncia = _create_denuncia(*SAO_PAULO)
+        x, y = tile_for_point(*SAO_PAULO, 12)
+        url = _tile_url(12, x, y)
+        assert b"Furto" in client.get(url).content
+
+        categoria = denuncia.categoria
+        categoria.nome = "Furto qualificado"
+        categoria.save()
+        assert b"Furto qualificado" in client.get(url).content
@@ -0,0 +1,96 @@
+import json
+import warnings
+
+import pytest
+from django.contrib.gis.geos import Point
+from django.urls import reverse
+
+from api.categories import get_categoria
+from api.models import Denuncia
+from api.views.denuncia.geo_export import DenunciaGeoExportView
+
+
+@pytest.fixture
+def denuncias(db):
+    return [
+        Denuncia.objects.create(
+            categoria=get_categoria(categoria),
+            descricao=f"Descrição {categoria}",
+            localizacao=Point(lng, lat, srid=4326),
+            status=status,
+        )
+        for categoria, lng, lat, status in (
+            ("Furto", -46.6333, -23.5505, "em_analise"),
+            ("Roubo", -46.6400, -23.5600, "aprovado"),
+            ("Vandalismo", -43.1729, -22.9068, "em_analise"),
+        )
+    ]
+
+
+def _geojson(response) -> dict:
+    return json.loads(b"".join(response.streaming_content))
+
+
+@pytest.mark.django_db
+class TestDenunciaGeoExport:
+    """Testes da exportação geográfica (GeoJSON/FlatGeobuf)."""
+
+    def test_requires_authentication(self, client):
+        assert client.get(reverse("denuncia-geo-export")).status_code == 401
+
+    def test_streams_feature_collection(self, auth_client, denuncias, monkeypatch):
+        monkeypatch.setattr(DenunciaGeoExportView, "GEOJSON_FLUSH_FEATURES", 1)
+        response = auth_client.get(reverse("denuncia-geo-export"))
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Type"] == "application/geo+json"
+        collection = _geojson(response)
+        assert collection["type"] == "FeatureCollection"
+        feature = collection["features"][0]
+        assert feature["id"] == str(denuncias[0].pk)
+        assert feature["geometry"] == {"type": "Point", "coordinates": [-46.6333, -23.5505]}
+        assert feature["properties"]["protocolo"] == denuncias[0].protocolo
+        assert feature["properties"]["categoria"] == "Furto"
+        assert [f["properties"]["categoria"] for f in collection["features"]] == ["Furto", "Roubo", "Vandalismo"]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_streams_under_asgi(self, asgi_get, user, denuncias, monkeypatch):
+        """Sob ASGI a FeatureCollection sai bloco a bloco, sem o Django consumir o gerador antes."""
+        monkeypatch.setattr(DenunciaGeoExportView, "GEOJSON_FLUSH_FEATURES", 1)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            status, headers, bodies = asgi_get(reverse("denuncia-geo-export"), user=user)
+
+        assert status == 200
+        assert headers[b"content-type"] == b"application/geo+json"
+        assert not [w for w in caught if "synchronous iterators" in str(w.message)]
+        chunks = [m["body"] for m in bodies if m["body"]]
+        assert len(chunks) > len(denuncias)
+        assert all(m.get("more_body") for m in bodies[:-1])
+        assert len(json.loads(b"".join(chunks))["features"]) == len(denuncias)
+
+    def test_bbox_and_status_filters(self, auth_client, denuncias):
+        response = auth_client.get(
+            reverse("denuncia-geo-export"),
+            {"bbox": "-47,-24,-46,-23", "status": "em_analise"},
+        )
+        features = _geojson(response)["features"]
+        assert [f["properties"]["categoria"] for f in features] == ["Furto"]
+
+    def test_empty_collection_is_valid_json(self, auth_client, db):
+        assert _geojson(auth_client.get(reverse("denuncia-geo-export")))["features"] == []
+
+    def test_flatgeobuf(self, auth_client, denuncias):
+        url = reverse("denuncia-geo-export")
+        response = auth_client.get(url, {"formato": "fgb"})
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/flatgeobuf"
+        assert response.content[:3] == b"fgb"
+
+        assert auth_client.get(url, {"formato": "fgb", "status": "rejeitado"}).status_code == 204
+
+    def test_invalid_format_returns_400(self, auth_client):
+        response = auth_client.get(reverse("denuncia-geo-export"), {"formato": "kml"})
+        assert response.status_code == 400
+        assert "formato" in response.data
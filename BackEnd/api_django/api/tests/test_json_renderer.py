@@ -0,0 +1,94 @@
+import io
+import json
+import uuid
+from datetime import UTC, date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from django.contrib.gis.geos import Point
+from django.urls import reverse
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from api.categories import get_categoria
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+
+
+def test_orjson_renderer_matches_drf_output():
+    """UUID, Decimal, chaves inteiras e texto saem iguais ao JSONRenderer do DRF."""
+    data = {
+        "id": uuid.uuid4(),
+        "valor": Decimal("10.50"),
+        "categorias": {1: "Furto"},
+        "texto": "linha\u2028separada",
+    }
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_orjson_renderer_datetime_parity():
+    """Datas e horas cruas (com microssegundos, aware ou naive) seguem o encoder do DRF."""
+    data = {
+        "utc": datetime(2025, 10, 1, 12, 30, 15, 123456, tzinfo=UTC),
+        "offset": datetime(2025, 10, 1, 9, 30, 15, 987654, tzinfo=timezone(timedelta(hours=-3))),
+        "naive": datetime(2025, 10, 1, 12, 30, 15, 500),
+        "sem_fracao": datetime(2025, 10, 1, 12, 30, 15, tzinfo=UTC),
+        "dia": date(2025, 10, 1),
+        "hora": time(12, 30, 15, 123456),
+        "lista": [datetime(2025, 1, 1, 0, 0, 0, 1, tzinfo=UTC)],
+    }
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_orjson_renderer_geometry_and_indent():
+    """Geometrias GEOS viram GeoJSON; `indent` pedido no Accept é respeitado."""
+    rendered = ORJSONRenderer().render({"localizacao": Point(-46.6333, -23.5505, srid=4326)}, "application/json; indent=4")
+    assert rendered.startswith(b"{\n")
+    assert json.loads(rendered) == {"localizacao": {"type": "Point", "coordinates": [-46.6333, -23.5505]}}
+    assert ORJSONRenderer().render(None) == b""
+
+
+def test_orjson_parser():
+    """Lê UTF-8 direto e converte JSON inválido em `ParseError` (400)."""
+    parser = ORJSONParser()
+    assert parser.parse(io.BytesIO('{"categoria": "Depredação"}'.encode())) == {"categoria": "Depredação"}
+    with pytest.raises(ParseError):
+        parser.parse(io.BytesIO(b"{categoria"))
+
+
+@pytest.mark.django_db
+class TestORJSONNegotiation:
+    """JSON do DRF como padrão; orjson só quando o cliente pede."""
+
+    def test_default_classes(self):
+        assert api_settings.DEFAULT_RENDERER_CLASSES[0] is JSONRenderer
+        assert ORJSONRenderer in api_settings.DEFAULT_RENDERER_CLASSES
+        assert ORJSONParser in api_settings.DEFAULT_PARSER_CLASSES
+
+    def test_json_by_default_and_orjson_on_request(self, auth_client):
+        get_categoria("Vandalismo")
+        url = reverse("categoria-list")
+
+        default = auth_client.get(url)
+        assert isinstance(default.accepted_renderer, JSONRenderer)
+        assert not isinstance(default.accepted_renderer, ORJSONRenderer)
+        assert default["Content-Type"] == "application/json"
+
+        by_format = auth_client.get(url, {"format": "orjson"})
+        by_accept = auth_client.get(url, HTTP_ACCEPT=ORJSONRenderer.media_type)
+        for response in (by_format, by_accept):
+            assert isinstance(response.accepted_renderer, ORJSONRenderer)
+            assert response["Content-Type"] == ORJSONRenderer.media_type
+            assert response.content == default.content
+
+    def test_create_with_orjson_body(self, client):
+        get_categoria("Vandalismo")
+        payload = {"categoria": "Vandalismo", "descricao": "Pichação", "latitude": -23.5505, "longitude": -46.6333}
+        response = client.post(reverse("denuncia_create"), json.dumps(payload), content_type=ORJSONParser.media_type)
+        assert response.status_code == 201
+        assert response.data["categoria"] == "Vandalismo"
+
+    def test_invalid_json_body(self, client):
+        response = client.post(reverse("denuncia_create"), "{categoria", content_type="application/json")
+        assert response.status_code == 400
@@ -0,0 +1,96 @@
+import os
+import time
+
+import pytest
+from django.contrib.gis.geos import Point
+from django.test import override_settings
+from django.urls import reverse
+
+from api import report_cache
+from api.categories import get_categoria
+from api.models import Denuncia
+
+
+def _body(response) -> bytes:
+    if response.streaming:
+        return b"".join(response.streaming_content)
+    return response.content
+
+
+def _create_denuncia(categoria="Furto"):
+    return Denuncia.objects.create(
+        categoria=get_categoria(categoria),
+        descricao="Descrição",
+        localizacao=Point(-46.6333, -23.5505, srid=4326),
+    )
+
+
+@pytest.mark.django_db
+class TestReportFileCache:
+    """Testes do cache em disco de relatórios renderizados."""
+
+    @pytest.mark.parametrize("formato", ["csv", "xlsx", "docx"])
+    def test_repeat_download_served_from_cache(self, auth_client, formato):
+        _create_denuncia()
+        url = reverse("denuncia-report")
+
+        first = auth_client.get(url, {"formato": formato, "data_inicio": "2020-01-01"})
+        first_body = _body(first)
+        assert report_cache.usage()[0] == 1
+
+        second = auth_client.get(url, {"formato": formato, "data_inicio": "2020-01-01"})
+        second_body = _body(second)
+        assert second.status_code == 200
+        assert second["Content-Type"] == first["Content-Type"]
+        assert int(second["Content-Length"]) == len(second_body)
+        if formato == "csv":  # XLSX/DOCX embutem data de criação no zip
+            assert second_body == first_body
+        assert report_cache.usage()[0] == 1
+
+    def test_data_change_uses_new_entry(self, auth_client):
+        denuncia = _create_denuncia()
+        url = reverse("denuncia-report")
+
+        before = _body(auth_client.get(url)).decode("utf-8")
+        denuncia.categoria = get_categoria("Roubo")
+        denuncia.save()
+        after = _body(auth_client.get(url)).decode("utf-8")
+
+        assert ";Furto;" in before
+        assert ";Roubo;" in after
+        assert report_cache.usage()[0] == 2
+
+    def test_categoria_rename_uses_new_entry(self, auth_client):
+        """Renomear não muda `updated_at` das denúncias; a geração do cache entra na chave."""
+        denuncia = _create_denuncia()
+        url = reverse("denuncia-report")
+
+        before = _body(auth_client.get(url)).decode("utf-8")
+        categoria = denuncia.categoria
+        categoria.nome = "Furto de celular"
+        categoria.save()
+        after = _body(auth_client.get(url)).decode("utf-8")
+
+        assert ";Furto;" in before
+        assert ";Furto de celular;" in after
+
+    @override_settings(REPORT_CACHE_ENABLED=False)
+    def test_disabled(self, auth_client):
+        _create_denuncia()
+        auth_client.get(reverse("denuncia-report"), {"formato": "docx"})
+        assert report_cache.usage() == (0, 0)
+
+
+def test_evict_removes_least_recently_used(report_files_root):
+    for index, key in enumerate(("a" * 64, "b" * 64, "c" * 64)):
+        with report_cache.writer(key, "csv") as handle:
+            handle.write(b"x" * 100)
+        path = report_cache.cache_dir() / key[:2] / f"{key}.csv"
+        os.utime(path, (time.time() - 100 + index, time.time() - 100 + index))
+
+    report_cache.open_cached("a" * 64, "csv").close()  # "a" passa a ser o mais recente
+    removed, freed = report_cache.evict(200)
+
+    assert (removed, freed) == (1, 100)
+    assert report_cache.open_cached("b" * 64, "csv") is None
+    assert report_cache.usage() == (2, 200)
@@ -0,0 +1,128 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.contrib.gis.geos import Point
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.categories import get_categoria
+from api.choice import ReportJobStatusChoices
+from api.models import Denuncia, ReportJob
+from api.report_jobs import JOB_FAILURE_MESSAGE
+from api.views.denuncia.report import DenunciaReportView
+
+
+@pytest.fixture
+def denuncias(db):
+    return [
+        Denuncia.objects.create(
+            categoria=get_categoria(categoria),
+            descricao="Descrição",
+            localizacao=Point(-46.6333, -23.5505, srid=4326),
+        )
+        for categoria in ("Furto", "Roubo")
+    ]
+
+
+def _create_job(client, **params):
+    return client.post(reverse("denuncia-report-job-create"), params, format="json")
+
+
+@pytest.mark.django_db
+class TestReportJobs:
+    """Testes dos jobs assíncronos de relatório."""
+
+    def test_requires_authentication(self, client):
+        response = client.post(reverse("denuncia-report-job-create"), {"formato": "csv"})
+        assert response.status_code == 401
+
+    def test_identical_requests_are_coalesced(self, auth_client, admin_client):
+        first = _create_job(auth_client, formato="xlsx", data_inicio="2025-01-01")
+        second = _create_job(auth_client, formato="xlsx", data_inicio="2025-01-01T10:00:00")
+        other = _create_job(auth_client, formato="docs", data_inicio="2025-01-01")
+        other_user = _create_job(admin_client, formato="xlsx", data_inicio="2025-01-01")
+
+        assert first.status_code == second.status_code == 202
+        assert first.data["coalesced"] is False
+        assert second.data["coalesced"] is True
+        assert second.data["id"] == first.data["id"]
+        assert other.data["id"] != first.data["id"]
+        assert other_user.data["coalesced"] is False
+        assert ReportJob.objects.count() == 3
+        assert first["Location"] == reverse("denuncia-report-job-detail", kwargs={"pk": first.data["id"]})
+
+    def test_invalid_params_return_400(self, auth_client):
+        response = _create_job(auth_client, formato="txt")
+        assert response.status_code == 400
+        assert "formato" in response.data
+
+    def test_worker_renders_and_download(self, auth_client, denuncias):
+        job_id = _create_job(auth_client, formato="csv").data["id"]
+        detail_url = reverse("denuncia-report-job-detail", kwargs={"pk": job_id})
+        download_url = reverse("denuncia-report-job-download", kwargs={"pk": job_id})
+
+        pending = auth_client.get(detail_url)
+        assert pending.data["status"] == ReportJobStatusChoices.PENDENTE
+        assert pending.data["download_url"] is None
+        assert auth_client.get(download_url).status_code == 409
+
+        call_command("run_report_worker", "--once", "--workers", "0")
+
+        done = auth_client.get(detail_url)
+        assert done.data["status"] == ReportJobStatusChoices.CONCLUIDO
+        assert done.data["download_url"].endswith(download_url)
+
+        response = auth_client.get(download_url)
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/csv")
+        body = b"".join(response.streaming_content).decode("utf-8")
+        assert "Total de denúncias: 2" in body
+        assert denuncias[0].protocolo in body
+
+    def test_finished_job_is_not_reused(self, auth_client):
+        first_id = _create_job(auth_client, formato="csv").data["id"]
+        call_command("run_report_worker", "--once", "--workers", "0")
+
+        second = _create_job(auth_client, formato="csv")
+        assert second.data["coalesced"] is False
+        assert second.data["id"] != first_id
+
+    def test_jobs_are_scoped_to_owner(self, auth_client, admin_client, create_groups):
+        """Outro usuário comum recebe 404; o admin enxerga o job."""
+        job_id = _create_job(auth_client, formato="csv").data["id"]
+        stranger = get_user_model().objects.create_user(email="outro@example.com", password="123456")
+        stranger.groups.add(Group.objects.get(name="User"))
+        stranger_client = APIClient()
+        stranger_client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(stranger).access_token!s}")
+
+        for name in ("denuncia-report-job-detail", "denuncia-report-job-download"):
+            url = reverse(name, kwargs={"pk": job_id})
+            assert stranger_client.get(url).status_code == 404
+        assert admin_client.get(reverse("denuncia-report-job-detail", kwargs={"pk": job_id})).status_code == 200
+
+    def test_failure_exposes_generic_message(self, auth_client, monkeypatch):
+        def fail(*args, **kwargs):
+            raise RuntimeError("senha=segredo em /srv/app")
+
+        monkeypatch.setattr(DenunciaReportView, "render_to_file", fail)
+        job_id = _create_job(auth_client, formato="csv").data["id"]
+        call_command("run_report_worker", "--once", "--workers", "0")
+
+        data = auth_client.get(reverse("denuncia-report-job-detail", kwargs={"pk": job_id})).data
+        assert data["status"] == ReportJobStatusChoices.FALHOU
+        assert data["erro"] == JOB_FAILURE_MESSAGE
+
+    def test_worker_requeues_stale_jobs(self, auth_client, denuncias):
+        job_id = _create_job(auth_client, formato="csv").data["id"]
+        ReportJob.objects.filter(pk=job_id).update(
+            status=ReportJobStatusChoices.PROCESSANDO, started_at=timezone.now() - timedelta(hours=1)
+        )
+
+        call_command("run_report_worker", "--once", "--workers", "0")
+
+        assert ReportJob.objects.get(pk=job_id).status == ReportJobStatusChoices.CONCLUIDO
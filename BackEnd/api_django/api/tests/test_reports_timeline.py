@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib import admin
+from django.contrib.gis.geos import Point
+from django.urls import reverse
+from django.utils import timezone
+
+from api.admin import DenunciaAdmin
+from api.categories import get_categoria
+from api.choice import StatusChoices
+from api.models import Denuncia, DenunciaDailyStats
+from api.stats import rebuild_daily_stats
+
+
+def _create_denuncia(categoria="Furto", status=StatusChoices.EM_ANALISE):
+    return Denuncia.objects.create(
+        categoria=get_categoria(categoria),
+        descricao="Descrição",
+        localizacao=Point(-46.6333, -23.5505, srid=4326),
+        status=status,
+    )
+
+
+def _timeline_url():
+    return reverse("denuncia_reports_timeline")
+
+
+def _stats():
+    return {
+        (row.categoria.nome, row.status): row.total
+        for row in DenunciaDailyStats.objects.filter(day=timezone.localdate(), total__gt=0)
+    }
+
+
+@pytest.mark.django_db
+class TestDenunciaDailyStats:
+    """Testes da manutenção incremental do rollup diário."""
+
+    def test_create_update_delete_keep_rollup_in_sync(self):
+        denuncia = _create_denuncia()
+        _create_denuncia(categoria="Roubo")
+        assert _stats() == {("Furto", "em_analise"): 1, ("Roubo", "em_analise"): 1}
+
+        denuncia.status = StatusChoices.APROVADO
+        denuncia.save()
+        assert _stats() == {("Furto", "aprovado"): 1, ("Roubo", "em_analise"): 1}
+
+        denuncia.delete()
+        assert _stats() == {("Roubo", "em_analise"): 1}
+
+    def test_admin_status_action_with_status_filter_updates_rollup(self, rf, monkeypatch):
+        """O changelist filtrado por status não acha mais as linhas após o `update()`; o rollup usa o snapshot."""
+        _create_denuncia()
+        model_admin = DenunciaAdmin(Denuncia, admin.site)
+        monkeypatch.setattr(model_admin, "message_user", lambda *args, **kwargs: None)
+
+        model_admin.marcar_como_rejeitado(rf.post("/"), Denuncia.objects.filter(status=StatusChoices.EM_ANALISE))
+        assert _stats() == {("Furto", "rejeitado"): 1}
+
+    def test_rebuild_matches_incremental(self):
+        _create_denuncia()
+        _create_denuncia(status=StatusChoices.APROVADO)
+        incremental = _stats()
+
+        DenunciaDailyStats.objects.all().delete()
+        rebuild_daily_stats()
+        assert _stats() == incremental
+
+
+@pytest.mark.django_db
+class TestReportsTimeline:
+    """Testes para o endpoint /dashboard/reports-timeline/."""
+
+    def test_requires_auth(self, client):
+        response = client.get(_timeline_url())
+        assert response.status_code == 401
+
+    def test_daily_series_with_zero_filled_days(self, admin_client):
+        _create_denuncia()
+        _create_denuncia(status=StatusChoices.APROVADO)
+        today = timezone.localdate()
+        start = today - timedelta(days=2)
+
+        response = admin_client.get(
+            _timeline_url(), {"startDate": start.isoformat(), "endDate": today.isoformat()}
+        )
+        assert response.status_code == 200
+        timeline = response.data["timeline"]
+        assert [item["date"] for item in timeline] == [
+            (start + timedelta(days=offset)).isoformat() for offset in range(3)
+        ]
+        assert timeline[0] == {"date": start.isoformat(), "open": 0, "resolved": 0}
+        assert timeline[-1] == {"date": today.isoformat(), "open": 2, "resolved": 1}
+
+    def test_accepts_iso_datetimes(self, admin_client):
+        """O frontend envia `Date` serializado (ISO-8601 com hora)."""
+        now = timezone.now()
+        response = admin_client.get(
+            _timeline_url(),
+            {"startDate": (now - timedelta(days=14)).isoformat(), "endDate": now.isoformat()},
+        )
+        assert response.status_code == 200
+        assert len(response.data["timeline"]) == 15
+
+    def test_invalid_range(self, admin_client):
+        response = admin_client.get(_timeline_url(), {"startDate": "2025-02-01", "endDate": "2025-01-01"})
+        assert response.status_code == 400
+        response = admin_client.get(_timeline_url(), {"startDate": "invalid"})
+        assert response.status_code == 400
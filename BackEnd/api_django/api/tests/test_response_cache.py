@@ -0,0 +1,116 @@
+import pytest
+from django.contrib.gis.geos import Point
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+
+from api.cache import cache_stats, generation_watermark, normalize_bbox
+from api.categories import get_categoria
+from api.models import Denuncia
+
+
+def _create_denuncia(categoria="Furto"):
+    return Denuncia.objects.create(
+        categoria=get_categoria(categoria),
+        descricao="Descrição",
+        localizacao=Point(-46.6333, -23.5505, srid=4326),
+    )
+
+
+def test_normalize_bbox_rounds_outwards():
+    assert normalize_bbox("-46.63331,-23.55059,-46.62001,-23.54001") == (
+        -46.6334,
+        -23.5506,
+        -46.62,
+        -23.54,
+    )
+    assert normalize_bbox("invalid") is None
+    assert normalize_bbox("1,2,3") is None
+
+
+@pytest.mark.defer_on_commit
+@pytest.mark.django_db(transaction=True)
+def test_invalidation_waits_for_commit():
+    """Dentro de um bloco atômico a geração só muda após o commit."""
+    categoria = get_categoria("Furto")
+    before = generation_watermark()[0]
+    with transaction.atomic():
+        Denuncia.objects.create(
+            categoria=categoria, descricao="Descrição", localizacao=Point(-46.6333, -23.5505, srid=4326)
+        )
+        assert generation_watermark()[0] == before
+    assert generation_watermark()[0] != before
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    """Testes do cache de respostas (heatmap, dashboard, relatórios)."""
+
+    def test_heatmap_hit_and_invalidation(self, client):
+        _create_denuncia()
+        url = reverse("denuncia-heatmap")
+
+        first = client.get(url)
+        assert first["X-Cache"] == "MISS"
+        second = client.get(url)
+        assert second["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+
+        _create_denuncia("Roubo")
+        third = client.get(url)
+        assert third["X-Cache"] == "MISS"
+        assert len(third.json()) == 2
+
+        stats = cache_stats()["heatmap"]
+        assert stats == {"hits": 1, "misses": 2, "ttl": stats["ttl"]}
+
+    def test_heatmap_key_depends_on_params(self, client):
+        _create_denuncia()
+        url = reverse("denuncia-heatmap")
+        assert client.get(url)["X-Cache"] == "MISS"
+        assert client.get(url, {"limit": "1"})["X-Cache"] == "MISS"
+        assert client.get(url, {"format": "columnar"})["X-Cache"] == "MISS"
+        assert client.get(url, {"limit": "1"})["X-Cache"] == "HIT"
+
+    def test_dashboard_invalidated_on_delete(self, admin_client):
+        denuncia = _create_denuncia()
+        url = reverse("denuncia_dashboard")
+
+        assert admin_client.get(url).data["metrics"]["totalReports"] == 1
+        assert admin_client.get(url)["X-Cache"] == "HIT"
+
+        denuncia.delete()
+        response = admin_client.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["metrics"]["totalReports"] == 0
+
+    def test_report_summary_cached_until_change(self, auth_client):
+        _create_denuncia()
+        url = reverse("denuncia-report")
+        assert "Total de denúncias: 1" in auth_client.get(url).content.decode("utf-8")
+
+        _create_denuncia("Roubo")
+        assert "Total de denúncias: 2" in auth_client.get(url).content.decode("utf-8")
+        assert cache_stats()["report_summary"]["misses"] == 2
+
+    @override_settings(DEBUG=True)
+    def test_bypass_in_debug(self, client):
+        _create_denuncia()
+        url = reverse("denuncia-heatmap")
+        client.get(url)
+        assert client.get(url, {"nocache": "1"})["X-Cache"] == "MISS"
+        assert client.get(url, HTTP_CACHE_CONTROL="no-cache")["X-Cache"] == "MISS"
+
+    @override_settings(DEBUG=False)
+    def test_bypass_ignored_for_anonymous_in_production(self, client):
+        _create_denuncia()
+        url = reverse("denuncia-heatmap")
+        client.get(url)
+        assert client.get(url, {"nocache": "1"})["X-Cache"] == "HIT"
+
+    @override_settings(API_CACHE_ENABLED=False)
+    def test_cache_disabled(self, client):
+        _create_denuncia()
+        url = reverse("denuncia-heatmap")
+        client.get(url)
+        assert client.get(url)["X-Cache"] == "MISS"
@@ -2,6 +2,8 @@ import pytest
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
+from api.pagination import EstimatedCountPaginator
+
 User = get_user_model()
 
 
@@ -81,6 +83,29 @@ class TestUserList:
         assert response.status_code == 200
         assert len(response.data) >= 2
 
+    def test_list_users_count_is_exact_below_threshold(self, auth_client, user):
+        response = auth_client.get(reverse("user-list"))
+        assert response.data["count"] == User.objects.count()
+        assert response.data["count_is_estimate"] is False
+
+    def test_list_users_estimated_count_above_threshold(self, auth_client, db, monkeypatch):
+        """Acima do limite, `count` vem do planejador e as páginas seguem pela linha extra."""
+        monkeypatch.setattr(EstimatedCountPaginator, "estimate_threshold", 2)
+        for i in range(4):
+            User.objects.create_user(email=f"estimado{i}@example.com", password="123456")
+
+        url = reverse("user-list")
+        response = auth_client.get(url, {"page_size": 3})
+        assert response.status_code == 200
+        assert response.data["count_is_estimate"] is True
+        assert response.data["count"] >= 3
+        assert response.data["next"] is not None
+
+        last = auth_client.get(url, {"page_size": 3, "page": 2})
+        assert len(last.data["results"]) == User.objects.count() - 3
+        assert last.data["next"] is None
+        assert auth_client.get(url, {"page_size": 3, "page": 3}).status_code == 404
+
 
 @pytest.mark.django_db
 class TestUserDetail:
@@ -0,0 +1,118 @@
+"""
+Geração e cache de tiles MVT (Mapbox Vector Tiles) das denúncias.
+
+Cada tile é montado no PostGIS com `ST_AsMVT` e guardado no cache do Django.
+A chave inclui uma versão por tile (z/x/y); quando uma denúncia é criada,
+alterada ou removida, a versão de todos os tiles que contêm o ponto é
+incrementada e as entradas antigas deixam de ser lidas. Mudanças que afetam
+todos os tiles (renomear ou remover uma categoria) incrementam uma geração
+global, também presente na chave.
+"""
+
+import math
+
+from django.core.cache import cache
+from django.db import connection
+
+from api.models import Categoria, Denuncia
+
+MAX_TILE_ZOOM = 22
+TILE_LAYER_NAME = "denuncias"
+TILE_CACHE_TIMEOUT = 60 * 60  # segundos; invalidação explícita cobre mudanças
+MAX_MERCATOR_LAT = 85.0511287798
+
+
+def tile_for_point(lng: float, lat: float, zoom: int) -> tuple[int, int]:
+    """Retorna o (x, y) do tile XYZ que contém o ponto no zoom informado."""
+    n = 2**zoom
+    lat = max(min(lat, MAX_MERCATOR_LAT), -MAX_MERCATOR_LAT)
+    lat_rad = math.radians(lat)
+    x = int((lng + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    return 0 <= z <= MAX_TILE_ZOOM and 0 <= x < 2**z and 0 <= y < 2**z
+
+
+TILE_GENERATION_KEY = "denuncia-tile-generation"
+
+
+def _version_key(z: int, x: int, y: int) -> str:
+    return f"denuncia-tile-version:{z}:{x}:{y}"
+
+
+def tile_cache_key(z: int, x: int, y: int, start_dt=None, end_dt=None) -> str:
+    version_key = _version_key(z, x, y)
+    versions = cache.get_many([TILE_GENERATION_KEY, version_key])
+    generation = versions.get(TILE_GENERATION_KEY, 0)
+    version = versions.get(version_key, 0)
+    start = start_dt.isoformat() if start_dt else ""
+    end = end_dt.isoformat() if end_dt else ""
+    return f"denuncia-tile:{z}:{x}:{y}:g{generation}:v{version}:{start}:{end}"
+
+
+def _bump(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def invalidate_tiles_for_point(point) -> None:
+    """Incrementa a versão de todos os tiles (zoom 0..MAX) que contêm o ponto."""
+    if point is None:
+        return
+    for z in range(MAX_TILE_ZOOM + 1):
+        x, y = tile_for_point(point.x, point.y, z)
+        _bump(_version_key(z, x, y))
+
+
+def invalidate_all_tiles() -> None:
+    """Descarta todos os tiles em cache (ex.: nome de categoria alterado)."""
+    _bump(TILE_GENERATION_KEY)
+
+
+def build_tile(z: int, x: int, y: int, start_dt=None, end_dt=None) -> bytes:
+    """Monta o tile MVT no PostGIS com `categoria`, `status` e `created_at` (epoch)."""
+    conditions = ["d.localizacao && ST_Transform(bounds.geom, 4326)"]
+    params = [z, x, y]
+    if start_dt:
+        conditions.append("d.created_at >= %s")
+        params.append(start_dt)
+    if end_dt:
+        conditions.append("d.created_at <= %s")
+        params.append(end_dt)
+    params.append(TILE_LAYER_NAME)
+
+    sql = f"""
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(%s, %s, %s) AS geom
+        ),
+        features AS (
+            SELECT
+                ST_AsMVTGeom(ST_Transform(d.localizacao, 3857), bounds.geom) AS geom,
+                c.nome AS categoria,
+                d.status,
+                EXTRACT(EPOCH FROM d.created_at)::bigint AS created_at
+            FROM {Denuncia._meta.db_table} d
+            JOIN {Categoria._meta.db_table} c ON c.id = d.categoria_id, bounds
+            WHERE {" AND ".join(conditions)}
+        )
+        SELECT ST_AsMVT(features.*, %s) FROM features
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    return bytes(row[0]) if row and row[0] else b""
+
+
+def get_tile(z: int, x: int, y: int, start_dt=None, end_dt=None) -> bytes:
+    """Lê o tile do cache ou o gera e armazena."""
+    key = tile_cache_key(z, x, y, start_dt, end_dt)
+    tile = cache.get(key)
+    if tile is None:
+        tile = build_tile(z, x, y, start_dt, end_dt)
+        cache.set(key, tile, timeout=TILE_CACHE_TIMEOUT)
+    return tile
@@ -1,15 +1,22 @@
 from django.urls import path
 
 from api.views.denuncia import (
+    CategoriaListView,
     DenunciaCreateView,
     DenunciaDashboardView,
     DenunciaDeleteView,
     DenunciaDetailProtocoloView,
     DenunciaDetailView,
+    DenunciaGeoExportView,
     DenunciaHistoryListView,
     DenunciaListView,
+    DenunciaReportsTimelineView,
     DenunciaReportView,
+    DenunciaTileView,
     DenunciaUpdateView,
+    ReportJobCreateView,
+    ReportJobDetailView,
+    ReportJobDownloadView,
 )
 from api.views.denuncia.heatmap import DenunciaHeatmapList
 from api.views.group import (
@@ -53,12 +60,35 @@ urlpatterns = [
     ),
     path("denuncias/<uuid:pk>/update/", DenunciaUpdateView.as_view(), name="denuncia_update"),
     path("denuncias/<uuid:pk>/delete/", DenunciaDeleteView.as_view(), name="denuncia_delete"),
+    path("categorias/", CategoriaListView.as_view(), name="categoria-list"),
     path("denuncias/heatmap/", DenunciaHeatmapList.as_view(), name="denuncia-heatmap"),
+    path("denuncias/geo-export/", DenunciaGeoExportView.as_view(), name="denuncia-geo-export"),
+    path(
+        "denuncias/tiles/<int:z>/<int:x>/<int:y>.pbf",
+        DenunciaTileView.as_view(),
+        name="denuncia-tile",
+    ),
     path("denuncias/relatorios/", DenunciaReportView.as_view(), name="denuncia-report"),
+    path("denuncias/relatorios/jobs/", ReportJobCreateView.as_view(), name="denuncia-report-job-create"),
+    path(
+        "denuncias/relatorios/jobs/<uuid:pk>/",
+        ReportJobDetailView.as_view(),
+        name="denuncia-report-job-detail",
+    ),
+    path(
+        "denuncias/relatorios/jobs/<uuid:pk>/download/",
+        ReportJobDownloadView.as_view(),
+        name="denuncia-report-job-download",
+    ),
     path(
         "denuncias/<uuid:pk>/history/",
         DenunciaHistoryListView.as_view(),
         name="denuncia_history",
     ),
     path("dashboard/", DenunciaDashboardView.as_view(), name="denuncia_dashboard"),
+    path(
+        "dashboard/reports-timeline/",
+        DenunciaReportsTimelineView.as_view(),
+        name="denuncia_reports_timeline",
+    ),
 ]
@@ -1,22 +1,34 @@
 # api/views/Denuncia/__init__.py
 
+from .categorias import CategoriaListView
 from .create import DenunciaCreateView
 from .dashboard import DenunciaDashboardView
 from .delete import DenunciaDeleteView
 from .detail import DenunciaDetailProtocoloView, DenunciaDetailView
+from .geo_export import DenunciaGeoExportView
 from .history import DenunciaHistoryListView
 from .list import DenunciaListView
 from .report import DenunciaReportView
+from .report_jobs import ReportJobCreateView, ReportJobDetailView, ReportJobDownloadView
+from .tiles import DenunciaTileView
+from .timeline import DenunciaReportsTimelineView
 from .update import DenunciaUpdateView
 
 __all__ = [
+    "CategoriaListView",
     "DenunciaCreateView",
     "DenunciaDashboardView",
     "DenunciaDeleteView",
     "DenunciaDetailProtocoloView",
     "DenunciaDetailView",
+    "DenunciaGeoExportView",
     "DenunciaHistoryListView",
     "DenunciaListView",
     "DenunciaReportView",
+    "DenunciaReportsTimelineView",
+    "DenunciaTileView",
     "DenunciaUpdateView",
+    "ReportJobCreateView",
+    "ReportJobDetailView",
+    "ReportJobDownloadView",
 ]
@@ -0,0 +1,31 @@
+from typing import ClassVar
+
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.categories import categoria_labels
+from api.serializers import CategoriaSerializer
+
+
+class CategoriaListView(APIView):
+    """Categorias de denúncia (id e nome), servidas pelo cache em processo de `api.categories`."""
+
+    permission_classes: ClassVar = [AllowAny]
+
+    @swagger_auto_schema(
+        tags=["Denuncias"],
+        operation_description=(
+            "Lista as categorias em ordem alfabética. O `nome` é o valor aceito em `categoria` "
+            "na criação de denúncias; o `id` pode ser usado no filtro `categoria` da listagem."
+        ),
+        responses={200: CategoriaSerializer(many=True)},
+        operation_id="categoria_list",
+    )
+    def get(self, request):
+        categorias = sorted(
+            ({"id": pk, "nome": nome} for pk, nome in categoria_labels().items()),
+            key=lambda item: item["nome"].casefold(),
+        )
+        return Response(CategoriaSerializer(categorias, many=True).data)
@@ -7,6 +7,7 @@ from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import AllowAny
 
 from api.models import Denuncia
+from api.parsers import ORJSONParser
 from api.serializers import DenunciaCreateSerializer
 
 
@@ -14,7 +15,8 @@ class DenunciaCreateView(CreateAPIView):
     queryset = Denuncia.objects.all()
     serializer_class = DenunciaCreateSerializer
     permission_classes: ClassVar = [AllowAny]
-    parser_classes: ClassVar = [JSONParser, MultiPartParser, FormParser]  # Aceita JSON e form-data
+    # Aceita JSON (também pelo orjson, com o media type próprio) e form-data
+    parser_classes: ClassVar = [JSONParser, ORJSONParser, MultiPartParser, FormParser]
 
     @swagger_auto_schema(
         tags=["Denuncias"],
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from datetime import timedelta
 from typing import Any, ClassVar
 
-from django.contrib.auth import get_user_model
+from django.db.models import Count, Q
 from django.utils import timezone
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.permissions import IsAuthenticated
@@ -12,11 +12,11 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accounts.permissions.groups import IsAdmin, IsUser
+from api import cache as api_cache
 from api.choice import StatusChoices
+from api.conditional import conditional_get, generation_validators
 from api.models import Denuncia
 
-User = get_user_model()
-
 MONTH_PT = {
     1: "janeiro",
     2: "fevereiro",
@@ -39,6 +39,11 @@ class MonthSummary:
     resolved: int
     rate: float
 
+    @classmethod
+    def from_counts(cls, total: int, resolved: int) -> MonthSummary:
+        rate = round((resolved / total) * 100, 2) if total else 0.0
+        return cls(total=total, resolved=resolved, rate=rate)
+
 
 class DenunciaDashboardView(APIView):
     """Métricas agregadas para dashboard usando `django-simple-history`."""
@@ -51,9 +56,18 @@ class DenunciaDashboardView(APIView):
         responses={200: "OK"},
         operation_id="denuncia_dashboard_metrics",
     )
+    @conditional_get
     def get(self, request):
-        metrics = self._build_metrics()
-        return Response({"metrics": metrics})
+        metrics, hit = api_cache.get_or_set("dashboard", {}, self._build_metrics, request=request)
+        response = Response({"metrics": metrics})
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        return response
+
+    def get_conditional_validators(self, request):
+        active_users = api_cache.active_users_count()
+        # o mês corrente entra na ETag porque a comparação mensal muda na virada do mês
+        month = timezone.localtime().strftime("%Y-%m")
+        return generation_validators("dashboard", request, month, active_users)
 
     def _build_metrics(self) -> dict[str, Any]:
         now = timezone.localtime()
@@ -61,13 +75,27 @@ class DenunciaDashboardView(APIView):
         previous_month_end = current_month_start - timedelta(seconds=1)
         previous_month_start = previous_month_end.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
+        counts = self._denuncia_counts(
+            (current_month_start, now),
+            (previous_month_start, previous_month_end),
+        )
         metrics = {
-            "totalActiveUsers": User.objects.filter(is_active=True).count(),
-            "totalReports": Denuncia.objects.count(),
-            "reportsByStatus": self._reports_by_status(),
+            "totalActiveUsers": api_cache.active_users_count(),
+            "totalReports": counts["total"],
+            "reportsByStatus": {
+                "rejected": counts["rejected"],
+                "pending": counts["pending"],
+                "resolved": counts["resolved"],
+            },
             "resolutionRateComparison": {
-                "currentMonth": self._format_segment(current_month_start, now),
-                "lastMonth": self._format_segment(previous_month_start, previous_month_end),
+                "currentMonth": self._format_segment(
+                    current_month_start,
+                    MonthSummary.from_counts(counts["current_total"], counts["current_resolved"]),
+                ),
+                "lastMonth": self._format_segment(
+                    previous_month_start,
+                    MonthSummary.from_counts(counts["previous_total"], counts["previous_resolved"]),
+                ),
             },
         }
         current_rate = metrics["resolutionRateComparison"]["currentMonth"]["rate"]
@@ -80,15 +108,23 @@ class DenunciaDashboardView(APIView):
         metrics["resolutionRateComparison"]["percentageChange"] = percentage_change
         return metrics
 
-    def _reports_by_status(self) -> dict[str, int]:
-        return {
-            "rejected": Denuncia.objects.filter(status=StatusChoices.REJEITADO).count(),
-            "pending": Denuncia.objects.filter(status=StatusChoices.EM_ANALISE).count(),
-            "resolved": Denuncia.objects.filter(status=StatusChoices.APROVADO).count(),
-        }
+    def _denuncia_counts(self, current_month, previous_month) -> dict[str, int]:
+        """Todas as contagens de denúncias em uma única passada (agregados condicionais)."""
+        current = Q(created_at__gte=current_month[0], created_at__lte=current_month[1])
+        previous = Q(created_at__gte=previous_month[0], created_at__lte=previous_month[1])
+        resolved = Q(status=StatusChoices.APROVADO)
+        return Denuncia.objects.order_by().aggregate(
+            total=Count("pk"),
+            rejected=Count("pk", filter=Q(status=StatusChoices.REJEITADO)),
+            pending=Count("pk", filter=Q(status=StatusChoices.EM_ANALISE)),
+            resolved=Count("pk", filter=resolved),
+            current_total=Count("pk", filter=current),
+            current_resolved=Count("pk", filter=current & resolved),
+            previous_total=Count("pk", filter=previous),
+            previous_resolved=Count("pk", filter=previous & resolved),
+        )
 
-    def _format_segment(self, start: timezone.datetime, end: timezone.datetime) -> dict[str, Any]:
-        summary = self._month_summary(start, end)
+    def _format_segment(self, start: timezone.datetime, summary: MonthSummary) -> dict[str, Any]:
         month_label = f"{MONTH_PT[start.month]} de {start.year}"
         return {
             "month": month_label,
@@ -96,16 +132,3 @@ class DenunciaDashboardView(APIView):
             "resolved": summary.resolved,
             "rate": summary.rate,
         }
-
-    def _month_summary(self, start: timezone.datetime, end: timezone.datetime) -> MonthSummary:
-        period = Denuncia.objects.filter(created_at__gte=start, created_at__lte=end)
-        total = period.count()
-        resolved = period.filter(status=StatusChoices.APROVADO).count()
-        rate = self._calculate_percentage(resolved, total)
-        return MonthSummary(total=total, resolved=resolved, rate=rate)
-
-    def _calculate_percentage(self, numerator: int, denominator: int) -> float:
-        if denominator == 0:
-            return 0.0
-        return round((numerator / denominator) * 100, 2)
-
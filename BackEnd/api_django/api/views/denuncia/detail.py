@@ -7,11 +7,39 @@ from rest_framework.generics import RetrieveAPIView
 # autenticated
 from rest_framework.permissions import AllowAny
 
+from api import cache as api_cache
+from api.conditional import build_etag, conditional_get
 from api.models import Denuncia
 from api.serializers import DenunciaDetailSerializer
 
+from .fieldsets import SparseFieldsetViewMixin
 
-class DenunciaDetailView(RetrieveAPIView):
+
+class DenunciaConditionalDetailMixin:
+    """
+    ETag/Last-Modified do detalhe: `updated_at` da própria denúncia e a
+    geração do cache de respostas, que também muda quando algo fora da
+    linha aparece no corpo (nome da categoria, usuário, status em lote no admin).
+    """
+
+    def get_conditional_validators(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        updated_at = (
+            self.get_queryset()
+            .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if updated_at is None:
+            return None, None  # segue o fluxo normal (404)
+        generation, changed_at = api_cache.generation_watermark()
+        etag = build_etag(
+            "denuncia-detail", request.accepted_renderer.format, kwargs[lookup_url_kwarg], updated_at, generation
+        )
+        return etag, max(updated_at, changed_at)
+
+
+class DenunciaDetailView(SparseFieldsetViewMixin, DenunciaConditionalDetailMixin, RetrieveAPIView):
     """Retorna os detalhes de um registro específico de Denuncia."""
     queryset = Denuncia.objects.all()
     serializer_class = DenunciaDetailSerializer
@@ -21,13 +49,15 @@ class DenunciaDetailView(RetrieveAPIView):
         tags=["Denuncias"],
         operation_description="Recupera os detalhes de um registro de Denuncia.",
         responses={200: DenunciaDetailSerializer()},
+        manual_parameters=[SparseFieldsetViewMixin.fields_param],
         operation_id="denuncia_detail",
     )
+    @conditional_get
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
 
-class DenunciaDetailProtocoloView(RetrieveAPIView):
+class DenunciaDetailProtocoloView(SparseFieldsetViewMixin, DenunciaConditionalDetailMixin, RetrieveAPIView):
     """Permite recuperar uma denúncia usando o protocolo público."""
     queryset = Denuncia.objects.all()
     serializer_class = DenunciaDetailSerializer
@@ -39,7 +69,9 @@ class DenunciaDetailProtocoloView(RetrieveAPIView):
         tags=["Denuncias"],
         operation_description="Recupera os detalhes de uma denúncia usando o protocolo.",
         responses={200: DenunciaDetailSerializer()},
+        manual_parameters=[SparseFieldsetViewMixin.fields_param],
         operation_id="denuncia_detail_protocolo",
     )
+    @conditional_get
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
@@ -0,0 +1,72 @@
+from typing import ClassVar
+
+from django.core.exceptions import FieldDoesNotExist
+from drf_yasg import openapi
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldsetViewMixin:
+    """
+    `?fields=a,b,c`: restringe a resposta (via contexto do serializer, ver
+    `SparseFieldsetMixin`) e o SELECT (`.only`) aos campos pedidos. Sem o
+    parâmetro, vale o `default_fields` do serializer.
+    """
+
+    # sempre carregados: chave primária e campos usados fora do serializer (ex.: cursor da paginação)
+    always_loaded_fields: ClassVar[tuple[str, ...]] = ("id",)
+
+    fields_param = openapi.Parameter(
+        "fields",
+        openapi.IN_QUERY,
+        description="Campos retornados, separados por vírgula. Ex: id,protocolo,status,localizacao",
+        type=openapi.TYPE_STRING,
+        required=False,
+    )
+
+    def requested_fields(self) -> list[str] | None:
+        if not hasattr(self, "_requested_fields"):
+            self._requested_fields = self._parse_fields()
+        return self._requested_fields
+
+    def _parse_fields(self) -> list[str] | None:
+        raw_value = self.request.query_params.get("fields", "")
+        names = list(dict.fromkeys(name.strip() for name in raw_value.split(",") if name.strip()))
+        if not names:
+            return None
+        available = self.get_serializer_class().available_fields()
+        invalid = [name for name in names if name not in available]
+        if invalid:
+            raise ValidationError(
+                {"fields": f"Campos inválidos: {', '.join(invalid)}. Disponíveis: {', '.join(available)}."}
+            )
+        return names
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        fields = self.requested_fields()
+        if fields:
+            context["fields"] = fields
+        return context
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        names = self.requested_fields() or serializer_class.default_fields
+        if not names:
+            return queryset
+        columns = self._model_columns(queryset.model, serializer_class(context={"fields": names}).fields)
+        return queryset.only(*columns) if columns else queryset
+
+    def _model_columns(self, model, serializer_fields) -> list[str] | None:
+        """Campos do model por trás de cada campo do serializer; None se algum não puder ser mapeado."""
+        columns = list(self.always_loaded_fields)
+        for field in serializer_fields.values():
+            if field.source == "*":
+                return None
+            name = field.source.split(".")[0]
+            try:
+                # `get_field` aceita também o attname (ex.: `categoria_id`)
+                columns.append(model._meta.get_field(name).name)
+            except FieldDoesNotExist:
+                return None
+        return list(dict.fromkeys(columns))
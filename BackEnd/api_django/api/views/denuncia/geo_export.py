@@ -0,0 +1,141 @@
+import json
+from typing import ClassVar
+
+from django.contrib.gis.db.models.functions import AsGeoJSON
+from django.db import connection
+from django.http import HttpResponse
+from django.utils import timezone
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from accounts.permissions.groups import IsAdmin, IsUser
+from api.models import Denuncia
+from api.streaming import streaming_response
+
+from .heatmap import DenunciaHeatmapList, filter_points
+
+GEO_EXPORT_PROPERTIES = ("protocolo", "categoria", "status", "created_at", "updated_at", "descricao")
+# propriedades que não são colunas de `Denuncia` (a categoria vem pelo JOIN com `Categoria`)
+GEO_EXPORT_SOURCES = {"categoria": "categoria__nome"}
+
+
+class DenunciaGeoExportView(APIView):
+    """
+    Exporta as denúncias como dados geográficos (GeoJSON ou FlatGeobuf)
+    para QGIS e outras ferramentas GIS, com os filtros do heatmap.
+    """
+
+    permission_classes: ClassVar = [IsAuthenticated, IsAdmin | IsUser]
+
+    ITERATOR_CHUNK_SIZE = 2000
+    GEOJSON_FLUSH_FEATURES = 1000
+    COORDINATE_PRECISION = 6  # casas decimais (~10 cm)
+    CONTENT_TYPES: ClassVar[dict[str, str]] = {
+        "geojson": "application/geo+json",
+        "fgb": "application/flatgeobuf",
+    }
+
+    formato_param = openapi.Parameter(
+        "formato",
+        openapi.IN_QUERY,
+        description=(
+            "geojson (padrão, em streaming) ou fgb (FlatGeobuf com índice espacial; "
+            "montado inteiro em memória antes do envio, sem streaming)."
+        ),
+        type=openapi.TYPE_STRING,
+        enum=list(CONTENT_TYPES),
+        required=False,
+    )
+
+    @swagger_auto_schema(
+        tags=["Heatmap"],
+        operation_description=(
+            "Exporta as denúncias filtradas (bbox, start_date, end_date, status) como FeatureCollection "
+            "GeoJSON enviada em streaming, ou como FlatGeobuf (`formato=fgb`), que não é streaming: "
+            "o arquivo é montado inteiro no PostGIS e carregado em memória antes do envio. "
+            "Propriedades: " + ", ".join(GEO_EXPORT_PROPERTIES) + "."
+        ),
+        manual_parameters=[
+            formato_param,
+            DenunciaHeatmapList.bbox_param,
+            DenunciaHeatmapList.start_date_param,
+            DenunciaHeatmapList.end_date_param,
+            DenunciaHeatmapList.status_param,
+        ],
+        responses={
+            200: openapi.Response("Arquivo GeoJSON ou FlatGeobuf."),
+            204: "Nenhuma denúncia no filtro (somente formato=fgb).",
+        },
+        operation_id="denuncia_geo_export",
+    )
+    def get(self, request, *args, **kwargs):
+        formato = (request.query_params.get("formato") or "geojson").lower()
+        if formato not in self.CONTENT_TYPES:
+            raise ValidationError({"formato": "Formato inválido. Use geojson ou fgb."})
+
+        queryset = filter_points(Denuncia.objects.all(), request.query_params).order_by("created_at", "id")
+        filename = f"denuncias_{timezone.now().strftime('%Y%m%d_%H%M%S')}.{formato}"
+
+        if formato == "fgb":
+            content = self._build_flatgeobuf(queryset)
+            if not content:
+                return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+            response = HttpResponse(content, content_type=self.CONTENT_TYPES["fgb"])
+        else:
+            # sob ASGI, iterador assíncrono; ver api/streaming.py
+            response = streaming_response(request, self._stream_geojson(queryset), content_type=self.CONTENT_TYPES["geojson"])
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def _stream_geojson(self, queryset):
+        """
+        FeatureCollection em blocos de `GEOJSON_FLUSH_FEATURES` features. A
+        geometria já vem serializada do PostGIS (`ST_AsGeoJSON`) e as linhas
+        são lidas por cursor do lado do servidor, sem instanciar GEOS nem modelos.
+        """
+        rows = (
+            queryset.annotate(geometry=AsGeoJSON("localizacao", precision=self.COORDINATE_PRECISION))
+            .values_list("id", "geometry", *(GEO_EXPORT_SOURCES.get(name, name) for name in GEO_EXPORT_PROPERTIES))
+            .iterator(chunk_size=self.ITERATOR_CHUNK_SIZE)
+        )
+        yield b'{"type":"FeatureCollection","features":[\n'
+        buffer = []
+        separator = ""
+        for pk, geometry, *values in rows:
+            properties = dict(zip(GEO_EXPORT_PROPERTIES, values, strict=True))
+            properties["created_at"] = properties["created_at"].isoformat()
+            properties["updated_at"] = properties["updated_at"].isoformat()
+            buffer.append(
+                f'{separator}{{"type":"Feature","id":"{pk}","geometry":{geometry},'
+                f'"properties":{json.dumps(properties, ensure_ascii=False)}}}'
+            )
+            separator = ",\n"
+            if len(buffer) >= self.GEOJSON_FLUSH_FEATURES:
+                yield "".join(buffer).encode("utf-8")
+                buffer.clear()
+        buffer.append("\n]}\n")
+        yield "".join(buffer).encode("utf-8")
+
+    def _build_flatgeobuf(self, queryset) -> bytes:
+        """
+        FlatGeobuf com índice espacial (`ST_AsFlatGeobuf`). O índice R-tree
+        fica no início do arquivo e depende de todas as features, por isso o
+        arquivo é montado inteiro no PostGIS antes do envio.
+        """
+        features = queryset.order_by().values_list(
+            "localizacao", *(GEO_EXPORT_SOURCES.get(name, name) for name in GEO_EXPORT_PROPERTIES)
+        )
+        sql, params = features.query.sql_with_params()
+        # renomeia as colunas pela posição (`categoria__nome` sai do SELECT como `nome`)
+        columns = ", ".join(connection.ops.quote_name(name) for name in ("localizacao", *GEO_EXPORT_PROPERTIES))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT ST_AsFlatGeobuf(f.*, true, 'localizacao') FROM ({sql}) AS f({columns})",
+                params,
+            )
+            row = cursor.fetchone()
+        return bytes(row[0]) if row and row[0] else b""
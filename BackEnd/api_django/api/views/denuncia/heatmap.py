@@ -1,23 +1,124 @@
-from datetime import datetime, time
+import base64
+import binascii
+from datetime import datetime, time, timedelta
 from typing import ClassVar
 
+from django.contrib.gis.db.models.functions import SnapToGrid
 from django.contrib.gis.geos import Polygon
+from django.db.models import Avg, Count
 from django.utils import timezone
 from django.utils.dateparse import parse_date as dj_parse_date
 from django.utils.dateparse import parse_datetime
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
+from api import cache as api_cache
+from api.conditional import conditional_get, generation_validators
+from api.geo import X, Y, grid_cell_size
 from api.models import Denuncia
-from api.serializers.denuncia.heatmap import DenunciaHeatmapSerializer
+from api.renderers import HeatmapBinaryRenderer, HeatmapColumnarRenderer
+from api.serializers.denuncia.heatmap import (
+    HEATMAP_POINT_COLUMNS,
+    DenunciaHeatmapCellSerializer,
+    DenunciaHeatmapSerializer,
+    encode_heatmap_binary,
+    encode_heatmap_columnar,
+)
 
+from .nearby import NearbyViewMixin
 
-class DenunciaHeatmapList(ListAPIView):
+
+def parse_date_param(raw_value):
+    if not raw_value:
+        return None
+
+    parsed_dt = parse_datetime(raw_value)
+    if parsed_dt:
+        return parsed_dt.date()
+
+    return dj_parse_date(raw_value)
+
+
+def date_bounds(query_params) -> tuple[datetime | None, datetime | None]:
+    """
+    Converte `start_date`/`end_date` em limites aware cobrindo o dia inteiro
+    (qualquer horário enviado é ignorado). Compartilhado com os tiles MVT.
+    """
+    tz = timezone.get_current_timezone()
+    start = parse_date_param(query_params.get("start_date", ""))
+    end = parse_date_param(query_params.get("end_date", ""))
+    start_dt = timezone.make_aware(datetime.combine(start, time.min), tz) if start else None
+    end_dt = timezone.make_aware(datetime.combine(end, time.max), tz) if end else None
+    return start_dt, end_dt
+
+
+def status_values(query_params) -> list[str]:
+    raw_value = query_params.get("status", "")
+    return sorted({value.strip() for value in raw_value.split(",") if value.strip()})
+
+
+def filter_points(qs, query_params):
+    """
+    Filtros `bbox`, `status` e `start_date`/`end_date` dos endpoints de
+    mapa (heatmap e exportação geográfica).
+    """
+    # filtro bbox: minx,miny,maxx,maxy
+    # (arredondado para fora, igual à chave de cache; bbox inválido é ignorado)
+    bbox = api_cache.normalize_bbox(query_params.get("bbox"))
+    if bbox:
+        qs = qs.filter(localizacao__within=Polygon.from_bbox(bbox))
+    # filtro por status (lista separada por vírgula)
+    statuses = status_values(query_params)
+    if statuses:
+        qs = qs.filter(status__in=statuses)
+    # filtro por datas (ISO-8601)
+    start_dt, end_dt = date_bounds(query_params)
+    if start_dt:
+        qs = qs.filter(created_at__gte=start_dt)
+    if end_dt:
+        qs = qs.filter(created_at__lte=end_dt)
+    return qs
+
+
+def encode_cursor(value: datetime) -> str:
+    return base64.urlsafe_b64encode(value.isoformat().encode("ascii")).decode("ascii")
+
+
+def decode_cursor(raw_value: str) -> datetime:
+    try:
+        value = parse_datetime(base64.urlsafe_b64decode(raw_value.encode("ascii")).decode("ascii"))
+    except (binascii.Error, UnicodeError, ValueError):
+        value = None
+    if value is None or timezone.is_naive(value):
+        raise ValidationError({"since": "Cursor inválido. Use o valor de `cursor`/`X-Heatmap-Cursor` da última resposta."})
+    return value
+
+
+class DenunciaHeatmapList(NearbyViewMixin, ListAPIView):
     serializer_class = DenunciaHeatmapSerializer
     permission_classes: ClassVar = [AllowAny]
     pagination_class: ClassVar = None
+    renderer_classes: ClassVar = [
+        *api_settings.DEFAULT_RENDERER_CLASSES,
+        HeatmapColumnarRenderer,
+        HeatmapBinaryRenderer,
+    ]
+    COMPACT_FORMATS: ClassVar = (HeatmapColumnarRenderer.format, HeatmapBinaryRenderer.format)
+
+    AGGREGATE_GRID = "grid"
+    DEFAULT_GRID_ZOOM = 12
+    MAX_GRID_ZOOM = 22
+    GRID_CELL_PIXELS = 32  # lado aproximado da célula na tela, em pixels
+    # o cursor recua um pouco para não perder transações que commitam com
+    # `updated_at` anterior ao momento da leitura (pontos reenviados são idempotentes)
+    CURSOR_OVERLAP = timedelta(seconds=5)
+    CURSOR_HEADER = "X-Heatmap-Cursor"
 
     # parametros para documentação Swagger/OpenAPI
     bbox_param = openapi.Parameter(
@@ -50,61 +151,240 @@ class DenunciaHeatmapList(ListAPIView):
         type=openapi.TYPE_INTEGER,
         required=False,
     )
+    status_param = openapi.Parameter(
+        "status",
+        openapi.IN_QUERY,
+        description="Filtra por status (um ou mais, separados por vírgula). Ex: em_analise,aprovado",
+        type=openapi.TYPE_STRING,
+        required=False,
+    )
+    since_param = openapi.Parameter(
+        "since",
+        openapi.IN_QUERY,
+        description=(
+            "Cursor da última resposta (header X-Heatmap-Cursor ou campo `cursor`). Ativa o modo incremental: "
+            "retorna {cursor, upserts, removed} apenas com o que mudou desde então."
+        ),
+        type=openapi.TYPE_STRING,
+        required=False,
+    )
+    aggregate_param = openapi.Parameter(
+        "aggregate",
+        openapi.IN_QUERY,
+        description="Use `grid` para agregar os pontos em células no PostGIS (um centroide ponderado por célula).",
+        type=openapi.TYPE_STRING,
+        enum=[AGGREGATE_GRID],
+        required=False,
+    )
+    zoom_param = openapi.Parameter(
+        "zoom",
+        openapi.IN_QUERY,
+        description=f"Zoom do mapa (0-{MAX_GRID_ZOOM}) usado para dimensionar as células quando aggregate=grid. Padrão: {DEFAULT_GRID_ZOOM}.",
+        type=openapi.TYPE_INTEGER,
+        required=False,
+    )
+    cell_size_param = openapi.Parameter(
+        "cell_size",
+        openapi.IN_QUERY,
+        description="Tamanho da célula em graus (EPSG:4326). Quando informado, tem prioridade sobre `zoom`.",
+        type=openapi.TYPE_NUMBER,
+        required=False,
+    )
 
     @swagger_auto_schema(
         tags=["Heatmap"],
-        operation_description="Retorna lista leve de pontos para construir heatmap. Suporta filtros: bbox, start_date, end_date e limit.",
-        manual_parameters=[bbox_param, start_date_param, end_date_param, limit_param],
+        operation_description=(
+            "Retorna lista leve de pontos para construir heatmap. Suporta filtros: bbox, start_date, end_date e limit. "
+            "Com aggregate=grid, retorna um centroide ponderado (lat, lng, weight) por célula do grid. "
+            "Formatos compactos (somente pontos) via Accept ou ?format=: "
+            f"`{HeatmapColumnarRenderer.media_type}` (format=columnar) e "
+            f"`{HeatmapBinaryRenderer.media_type}` (format=bin). "
+            "Com since=<cursor>, retorna só os pontos criados/alterados e os IDs removidos desde o cursor. "
+            "near=lat,lng + radius_m restringem a um raio em metros; order=distance ordena pela distância "
+            "(com limit, os N pontos mais próximos)."
+        ),
+        manual_parameters=[
+            bbox_param,
+            start_date_param,
+            end_date_param,
+            limit_param,
+            status_param,
+            since_param,
+            aggregate_param,
+            zoom_param,
+            cell_size_param,
+            NearbyViewMixin.near_param,
+            NearbyViewMixin.radius_m_param,
+            NearbyViewMixin.order_param,
+        ],
         responses={200: DenunciaHeatmapSerializer(many=True)},
         operation_id="denuncia_heatmap_list",
     )
+    @conditional_get
     def get(self, request, *args, **kwargs):
         """Rota GET documentada para retornar pontos do heatmap."""
         return super().get(request, *args, **kwargs)
 
-    def parse_date_param(self, raw_value):
-        if not raw_value:
-            return None
+    def list(self, request, *args, **kwargs):
+        aggregate = request.query_params.get("aggregate")
+        renderer_format = request.accepted_renderer.format
+        if aggregate and aggregate != self.AGGREGATE_GRID:
+            raise ValidationError({"aggregate": "Valor inválido. Use aggregate=grid."})
+        if aggregate and renderer_format in self.COMPACT_FORMATS:
+            raise ValidationError({"format": "Formatos compactos valem apenas para pontos (sem aggregate)."})
+        if self.orders_by_distance() and aggregate:
+            raise ValidationError({"order": "A ordenação por distância vale apenas para pontos (sem aggregate)."})
+
+        since = request.query_params.get("since")
+        if since:
+            if aggregate or renderer_format in self.COMPACT_FORMATS:
+                raise ValidationError({"since": "O modo incremental retorna apenas pontos em JSON."})
+            return Response(self._build_delta(decode_cursor(since)))
+
+        snapshot, hit = api_cache.get_or_set(
+            "heatmap",
+            self._cache_params(aggregate, renderer_format),
+            lambda: self._build_snapshot(aggregate, renderer_format),
+            request=request,
+        )
+        response = Response(snapshot["payload"])
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        response[self.CURSOR_HEADER] = snapshot["cursor"]
+        return response
+
+    def get_conditional_validators(self, request, *args, **kwargs):
+        return generation_validators("heatmap", request)
+
+    def _next_cursor(self) -> str:
+        return encode_cursor(timezone.now() - self.CURSOR_OVERLAP)
+
+    def _build_snapshot(self, aggregate, renderer_format) -> dict:
+        # cursor calculado antes da leitura; fica no cache junto com os dados
+        cursor = self._next_cursor()
+        return {"cursor": cursor, "payload": self._build_payload(aggregate, renderer_format)}
 
-        parsed_dt = parse_datetime(raw_value)
-        if parsed_dt:
-            return parsed_dt.date()
+    def _build_delta(self, since: datetime) -> dict:
+        """
+        Pontos criados/alterados desde `since` que ainda passam nos filtros
+        (`upserts`) e IDs que saíram do conjunto: excluídos (histórico com
+        `history_type='-'`) ou alterados para fora dos filtros (`removed`).
+        """
+        cursor = self._next_cursor()
+        changed = Denuncia.objects.filter(updated_at__gt=since)
+        matching = self._apply_filters(changed)
+        upserts = self._project(matching.order_by("-created_at"))
+        left_filters = changed.exclude(pk__in=matching.values("pk")).values_list("pk", flat=True)
+        deleted = Denuncia.history.filter(history_type="-", history_date__gt=since).values_list("id", flat=True)
+        removed = {str(pk) for pk in left_filters} | {str(pk) for pk in deleted}
+        return {
+            "cursor": cursor,
+            "upserts": self.get_serializer(upserts, many=True).data,
+            "removed": sorted(removed),
+        }
 
-        return dj_parse_date(raw_value)
+    def _build_payload(self, aggregate, renderer_format):
+        if aggregate:
+            cells = self._grid_cells(self._apply_filters(Denuncia.objects.all()))
+            return DenunciaHeatmapCellSerializer(cells, many=True).data
+        if renderer_format == HeatmapColumnarRenderer.format:
+            return encode_heatmap_columnar(self.get_queryset())
+        if renderer_format == HeatmapBinaryRenderer.format:
+            return encode_heatmap_binary(self.get_queryset())
+        return self.get_serializer(self.get_queryset(), many=True).data
+
+    def _cache_params(self, aggregate, renderer_format) -> dict:
+        """Parâmetros normalizados que identificam a resposta no cache."""
+        params = self.request.query_params
+        start_dt, end_dt = date_bounds(params)
+        return {
+            "bbox": api_cache.normalize_bbox(params.get("bbox")),
+            "status": self._status_values(),
+            "start": start_dt,
+            "end": end_dt,
+            "limit": self._limit_value(),
+            "aggregate": aggregate or None,
+            "zoom": params.get("zoom") if aggregate else None,
+            "cell_size": params.get("cell_size") if aggregate else None,
+            "format": renderer_format,
+            "near": self.near_query(),
+            "order": self.ORDER_DISTANCE if self.orders_by_distance() else None,
+        }
+
+    def handle_exception(self, exc):
+        # erros sempre em JSON, mesmo que o cliente tenha negociado o formato binário
+        renderer = getattr(self.request, "accepted_renderer", None)
+        if renderer is not None and renderer.format == HeatmapBinaryRenderer.format:
+            self.request.accepted_renderer = JSONRenderer()
+            self.request.accepted_media_type = JSONRenderer.media_type
+        return super().handle_exception(exc)
+
+    def parse_date_param(self, raw_value):
+        return parse_date_param(raw_value)
 
     def get_queryset(self):
-        qs = Denuncia.objects.all().only("id", "localizacao").order_by("-created_at")
-        # filtro bbox: minx,miny,maxx,maxy
-        bbox = self.request.query_params.get("bbox")
-        if bbox:
-            try:
-                minx, miny, maxx, maxy = map(float, bbox.split(","))
-                poly = Polygon.from_bbox((minx, miny, maxx, maxy))
-                qs = qs.filter(localizacao__within=poly)
-            except Exception:
-                pass
-        # filtro por datas (ISO-8601)
-        start = self.parse_date_param(self.request.query_params.get("start_date", ""))
-        end = self.parse_date_param(self.request.query_params.get("end_date", ""))
-        if start:
-            start_dt = timezone.make_aware(
-                datetime.combine(start, time.min),
-                timezone.get_current_timezone(),
-            )
-            qs = qs.filter(created_at__gte=start_dt) if hasattr(Denuncia, "created_at") else qs
-        if end:
-            end_dt = timezone.make_aware(
-                datetime.combine(end, time.max),
-                timezone.get_current_timezone(),
-            )
-            qs = qs.filter(created_at__lte=end_dt) if hasattr(Denuncia, "created_at") else qs
+        qs = self._apply_filters(Denuncia.objects.all())
+        # com limit, order=distance devolve os N mais próximos (KNN no índice GiST)
+        qs = self.order_by_distance(qs, "-created_at") if self.orders_by_distance() else qs.order_by("-created_at")
+        return self._apply_limit(self._project(qs))
+
+    def _project(self, qs):
+        # projeção direta das colunas serializadas (uma única query, sem N+1)
+        return qs.annotate(lat=Y("localizacao"), lng=X("localizacao")).values_list(
+            *HEATMAP_POINT_COLUMNS
+        )
+
+    def _apply_filters(self, qs):
+        return self.filter_near(filter_points(qs, self.request.query_params))
+
+    def _status_values(self) -> list[str]:
+        return status_values(self.request.query_params)
+
+    def _apply_limit(self, qs):
         # limitar quantidade
-        limit = self.request.query_params.get("limit")
-        if limit:
+        limit = self._limit_value()
+        return qs[:limit] if limit else qs
+
+    def _limit_value(self) -> int | None:
+        try:
+            limit = int(self.request.query_params.get("limit", ""))
+        except ValueError:
+            return None
+        return limit if limit > 0 else None
+
+    def _grid_cells(self, qs):
+        """
+        Agrupa os pontos por célula (`ST_SnapToGrid`) e devolve, para cada uma,
+        a média das coordenadas e a quantidade de denúncias como peso.
+        """
+        cell_size = self._grid_cell_size()
+        cells = (
+            qs.order_by()
+            .annotate(cell=SnapToGrid("localizacao", cell_size))
+            .values("cell")
+            .annotate(lat=Avg(Y("localizacao")), lng=Avg(X("localizacao")), weight=Count("id"))
+            .values("lat", "lng", "weight")
+            .order_by("-weight")
+        )
+        return self._apply_limit(cells)
+
+    def _grid_cell_size(self) -> float:
+        raw_cell_size = self.request.query_params.get("cell_size")
+        if raw_cell_size:
             try:
-                limit = int(limit)
-                if limit > 0:
-                    qs = qs[:limit]
-            except Exception:
-                pass
-        return qs
+                cell_size = float(raw_cell_size)
+            except ValueError:
+                cell_size = 0
+            if not cell_size > 0:
+                raise ValidationError({"cell_size": "Informe um número positivo (graus)."})
+            return cell_size
+
+        raw_zoom = self.request.query_params.get("zoom")
+        if not raw_zoom:
+            return grid_cell_size(self.DEFAULT_GRID_ZOOM, self.GRID_CELL_PIXELS)
+        try:
+            zoom = int(raw_zoom)
+        except ValueError:
+            zoom = -1
+        if not 0 <= zoom <= self.MAX_GRID_ZOOM:
+            raise ValidationError({"zoom": f"Informe um inteiro entre 0 e {self.MAX_GRID_ZOOM}."})
+        return grid_cell_size(zoom, self.GRID_CELL_PIXELS)
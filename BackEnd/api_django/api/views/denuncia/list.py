@@ -6,26 +6,38 @@ from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.exceptions import ValidationError
 from rest_framework.generics import ListAPIView
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 
 from accounts.permissions.groups import IsAdmin, IsUser
+from api.categories import categoria_id
+from api.conditional import conditional_get, generation_validators
 from api.models import Denuncia
+from api.pagination import EstimatedCountPagination, KeysetPagination
+from api.search import search_denuncias
 from api.serializers import DenunciaListSerializer
 
+from .fieldsets import SparseFieldsetViewMixin
+from .nearby import NearbyViewMixin
 
-class CustomPagination(PageNumberPagination):
+
+class CustomPagination(EstimatedCountPagination):
     page_size = 20  # Número de itens por página
     page_size_query_param = 'page_size'  # permite o uso de ?page_size=20 na URL
     max_page_size = 100  # limite máximo
 
 
-class DenunciaListView(ListAPIView):
-    """Lista todos os registros de Denuncia."""
+class DenunciaListView(SparseFieldsetViewMixin, NearbyViewMixin, ListAPIView):
+    """
+    Lista todos os registros de Denuncia. Com `?cursor=`, troca a paginação
+    por página (OFFSET + COUNT) pela paginação por keyset em (created_at, id).
+    Por padrão retorna a representação enxuta; `?fields=` escolhe os campos.
+    `?near=lat,lng&radius_m=` e `?order=distance` buscam por proximidade.
+    """
     queryset = Denuncia.objects.all().order_by('-created_at')  # Ordena por data de criação (mais recente primeiro)
     serializer_class = DenunciaListSerializer
     permission_classes: ClassVar = [IsAuthenticated, IsAdmin | IsUser]
     pagination_class: ClassVar = CustomPagination
+    always_loaded_fields: ClassVar = ("id", "created_at")  # created_at: posição do cursor keyset
 
     status_param = openapi.Parameter(
         "status",
@@ -37,7 +49,7 @@ class DenunciaListView(ListAPIView):
     categoria_param = openapi.Parameter(
         "categoria",
         openapi.IN_QUERY,
-        description="Filtra denúncias pela categoria (correspondência exata, case-insensitive).",
+        description="Filtra denúncias pela categoria: nome (exato, case-insensitive) ou id de /api/categorias/.",
         type=openapi.TYPE_STRING,
         required=False,
     )
@@ -57,17 +69,67 @@ class DenunciaListView(ListAPIView):
         format=openapi.FORMAT_DATETIME,
         required=False,
     )
+    q_param = openapi.Parameter(
+        "q",
+        openapi.IN_QUERY,
+        description=(
+            "Busca textual (português) em categoria e descrição, ordenada por relevância. "
+            'Aceita sintaxe de buscador: "frase exata", or, -excluir.'
+        ),
+        type=openapi.TYPE_STRING,
+        required=False,
+    )
+    cursor_param = openapi.Parameter(
+        KeysetPagination.cursor_query_param,
+        openapi.IN_QUERY,
+        description=(
+            "Ativa a paginação por cursor (keyset): envie vazio na primeira página e depois use os links "
+            "`next`/`previous`. A resposta não traz `count` e o custo não cresce com a profundidade da página."
+        ),
+        type=openapi.TYPE_STRING,
+        required=False,
+    )
 
     @swagger_auto_schema(
         tags=["Denuncias"],
         operation_description="Lista todos os registros de Denuncia.",
         responses={200: DenunciaListSerializer(many=True)},
         operation_id="denuncia_list",
-        manual_parameters=[status_param, categoria_param, created_from_param, created_to_param],
+        manual_parameters=[
+            status_param,
+            categoria_param,
+            created_from_param,
+            created_to_param,
+            q_param,
+            cursor_param,
+            NearbyViewMixin.near_param,
+            NearbyViewMixin.radius_m_param,
+            NearbyViewMixin.order_param,
+            SparseFieldsetViewMixin.fields_param,
+        ],
     )
+    @conditional_get
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            request = getattr(self, "request", None)
+            if request is not None and self._uses_keyset(request):
+                self._paginator = KeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def _uses_keyset(self, request) -> bool:
+        return KeysetPagination.cursor_query_param in request.query_params
+
+    def get_conditional_validators(self, request, *args, **kwargs):
+        if self._uses_keyset(request):
+            return None, None
+        return generation_validators("denuncia-list", request)
+
     def get_queryset(self):
         queryset = super().get_queryset()  # Já vem ordenado por '-created_at'
 
@@ -77,7 +139,11 @@ class DenunciaListView(ListAPIView):
 
         categoria_value = self.request.query_params.get("categoria")
         if categoria_value:
-            queryset = queryset.filter(categoria__iexact=categoria_value)
+            # o nome é resolvido pelo cache de categorias; o filtro usa só a chave inteira
+            pk = categoria_id(categoria_value)
+            if pk is None and categoria_value.isdigit():
+                pk = int(categoria_value)
+            queryset = queryset.filter(categoria_id=pk) if pk is not None else queryset.none()
 
         created_from_raw = self.request.query_params.get("created_from")
         created_to_raw = self.request.query_params.get("created_to")
@@ -99,7 +165,21 @@ class DenunciaListView(ListAPIView):
             else:
                 queryset = queryset.filter(created_at__date__lte=created_to_value)
 
-        return queryset.order_by('-created_at')  # Garante ordenação mesmo após filtros
+        queryset = self.filter_near(queryset)
+        search_term = self.request.query_params.get("q", "").strip()
+        if search_term:
+            queryset = search_denuncias(queryset, search_term)
+
+        if self.orders_by_distance():
+            if self._uses_keyset(self.request):
+                raise ValidationError({"order": "A ordenação por distância não usa a paginação por cursor."})
+            # com `q`, a distância prevalece sobre a relevância (a busca só filtra)
+            return self.order_by_distance(queryset, '-created_at', '-id')
+        if search_term:
+            # no modo keyset a ordem continua (created_at, id); a relevância vale na paginação por página
+            return queryset.order_by('-search_rank', '-created_at', '-id')
+
+        return queryset.order_by('-created_at', '-id')  # Garante ordenação (estável) mesmo após filtros
 
     def _parse_datetime_param(self, raw_value, param_name):
         """Retorna tupla com valor parseado e tipo ('datetime' ou 'date')."""
@@ -0,0 +1,102 @@
+from typing import NamedTuple
+
+from drf_yasg import openapi
+from rest_framework.exceptions import ValidationError
+
+from api.geo import DWithin, GeographyPoint, KnnDistance, as_geography
+
+
+class NearQuery(NamedTuple):
+    lat: float
+    lng: float
+    radius_m: float | None
+
+
+class NearbyViewMixin:
+    """
+    `?near=lat,lng&radius_m=`: restringe às denúncias a até `radius_m`
+    metros do ponto (`ST_DWithin` em geography, distância real em vez de
+    graus). `?order=distance` ordena da mais próxima para a mais distante
+    com o operador KNN `<->`. Os dois usam o índice GiST sobre
+    `localizacao::geography` (`denuncia_geog_gist_idx`).
+    """
+
+    ORDER_DISTANCE = "distance"
+    MAX_RADIUS_M = 50_000
+
+    near_param = openapi.Parameter(
+        "near",
+        openapi.IN_QUERY,
+        description="Ponto de referência: lat,lng (graus, EPSG:4326). Ex: -23.5505,-46.6333",
+        type=openapi.TYPE_STRING,
+        required=False,
+    )
+    radius_m_param = openapi.Parameter(
+        "radius_m",
+        openapi.IN_QUERY,
+        description=f"Raio em metros a partir de `near` (máximo {MAX_RADIUS_M}).",
+        type=openapi.TYPE_NUMBER,
+        required=False,
+    )
+    order_param = openapi.Parameter(
+        "order",
+        openapi.IN_QUERY,
+        description="Use `distance` para ordenar da mais próxima para a mais distante de `near`.",
+        type=openapi.TYPE_STRING,
+        enum=[ORDER_DISTANCE],
+        required=False,
+    )
+
+    def near_query(self) -> NearQuery | None:
+        if not hasattr(self, "_near_query"):
+            self._near_query = self._parse_near()
+        return self._near_query
+
+    def orders_by_distance(self) -> bool:
+        order = self.request.query_params.get("order")
+        if not order:
+            return False
+        if order != self.ORDER_DISTANCE:
+            raise ValidationError({"order": f"Valor inválido. Use order={self.ORDER_DISTANCE}."})
+        if self.near_query() is None:
+            raise ValidationError({"order": "A ordenação por distância exige near=lat,lng."})
+        return True
+
+    def filter_near(self, queryset):
+        near = self.near_query()
+        if near is None or near.radius_m is None:
+            return queryset
+        return queryset.filter(
+            DWithin(as_geography("localizacao"), GeographyPoint(near.lng, near.lat), near.radius_m)
+        )
+
+    def order_by_distance(self, queryset, *tiebreakers):
+        near = self.near_query()
+        distance = KnnDistance(as_geography("localizacao"), GeographyPoint(near.lng, near.lat))
+        return queryset.order_by(distance.asc(), *tiebreakers)
+
+    def _parse_near(self) -> NearQuery | None:
+        params = self.request.query_params
+        raw_near = params.get("near", "").strip()
+        raw_radius = params.get("radius_m", "").strip()
+        if not raw_near:
+            if raw_radius:
+                raise ValidationError({"radius_m": "Informe também near=lat,lng."})
+            return None
+
+        try:
+            lat, lng = (float(part) for part in raw_near.split(","))
+        except ValueError:
+            lat = lng = None
+        if lat is None or not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise ValidationError({"near": "Use near=lat,lng em graus (ex.: -23.5505,-46.6333)."})
+
+        radius_m = None
+        if raw_radius:
+            try:
+                radius_m = float(raw_radius)
+            except ValueError:
+                radius_m = 0
+            if not 0 < radius_m <= self.MAX_RADIUS_M:
+                raise ValidationError({"radius_m": f"Informe um raio entre 0 e {self.MAX_RADIUS_M} metros."})
+        return NearQuery(lat, lng, radius_m)
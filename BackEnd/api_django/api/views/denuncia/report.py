@@ -1,10 +1,12 @@
 import csv
 import io
+import shutil
+import tempfile
 from datetime import datetime, time
 from typing import ClassVar
 
 from django.db.models import Count
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
 from django.utils import timezone
 from django.utils.dateparse import parse_date, parse_datetime
 from docx import Document
@@ -16,22 +18,25 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
 from accounts.permissions.groups import IsAdmin, IsUser
-from api import choice
+from api import cache as api_cache
+from api import choice, columnar, report_cache
+from api.conditional import queryset_watermark
+from api.docx_tables import append_table_rows
+from api.geo import X, Y
 from api.models import Denuncia
+from api.streaming import streaming_response
 
 
-class DenunciaReportView(APIView):
-    """
-    Gera relatórios de denúncias nos formatos CSV, XLSX e DOCX
-    com resumo por status e listagem detalhada filtrada por período.
-    """
-
-    permission_classes: ClassVar = [IsAuthenticated, IsAdmin | IsUser]
+class ReportParamsMixin:
+    """Leitura de `formato`, `data_inicio` e `data_fim`, compartilhada pelos endpoints de relatório."""
 
     formato_param = openapi.Parameter(
         "formato",
         openapi.IN_QUERY,
-        description="Formato de saída do relatório: csv, xlsx ou docs.",
+        description=(
+            "Formato de saída do relatório: csv, xlsx, docs, parquet ou arrow "
+            "(os dois últimos trazem só as linhas, com colunas tipadas, para análise)."
+        ),
         type=openapi.TYPE_STRING,
         required=False,
     )
@@ -50,60 +55,26 @@ class DenunciaReportView(APIView):
         required=False,
     )
 
-    @swagger_auto_schema(
-        tags=["Relatórios"],
-        operation_description="Gera um relatório detalhado de denúncias com resumo por status.",
-        responses={200: openapi.Response("Arquivo gerado no formato solicitado.")},
-        manual_parameters=[formato_param, data_inicio_param, data_fim_param],
-    )
-    def get(self, request, *args, **kwargs):
-        formato = self._normalize_format(request.query_params.get("formato", "csv"))
-
-        data_inicio = request.query_params.get("data_inicio")
-        data_fim = request.query_params.get("data_fim")
-
-        start_dt = self._parse_datetime_bound(data_inicio, "data_inicio", is_start=True)
-        end_dt = self._parse_datetime_bound(data_fim, "data_fim", is_start=False)
+    def parse_report_params(self, params) -> tuple[str, datetime | None, datetime | None]:
+        formato = self._normalize_format(params.get("formato", "csv"))
+        start_dt = self._parse_datetime_bound(params.get("data_inicio"), "data_inicio", is_start=True)
+        end_dt = self._parse_datetime_bound(params.get("data_fim"), "data_fim", is_start=False)
 
         if start_dt and end_dt and start_dt > end_dt:
             raise ValidationError({"detail": "data_inicio não pode ser maior que data_fim."})
-
-        queryset = Denuncia.objects.all().order_by("created_at")
-        if start_dt:
-            queryset = queryset.filter(created_at__gte=start_dt)
-        if end_dt:
-            queryset = queryset.filter(created_at__lte=end_dt)
-
-        summary = self._build_summary(queryset, start_dt, end_dt)
-        details = self._build_details(queryset)
-
-        if formato == "csv":
-            content = self._build_csv(summary, details)
-            content_type = "text/csv; charset=utf-8"
-            extension = "csv"
-        elif formato == "xlsx":
-            content = self._build_xlsx(summary, details)
-            content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            extension = "xlsx"
-        else:  # docx
-            content = self._build_docx(summary, details)
-            content_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            extension = "docx"
-
-        filename = f"relatorio_denuncias_{timezone.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
-        response = HttpResponse(content, content_type=content_type)
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
+        return formato, start_dt, end_dt
 
     def _normalize_format(self, value: str) -> str:
         normalized = (value or "").lower()
         if normalized in ("doc", "docs", "docx"):
             return "docx"
-        if normalized in ("csv", "xlsx"):
+        if normalized in ("ipc", "feather"):
+            return "arrow"
+        if normalized in ("csv", "xlsx", *columnar.FORMATS):
             return normalized
         if normalized == "":
             return "csv"
-        raise ValidationError({"formato": "Formato inválido. Use csv, xlsx ou docs."})
+        raise ValidationError({"formato": "Formato inválido. Use csv, xlsx, docs, parquet ou arrow."})
 
     def _parse_datetime_bound(
         self, raw_value: str | None, field_name: str, *, is_start: bool
@@ -131,7 +102,147 @@ class DenunciaReportView(APIView):
             return timezone.make_aware(value, timezone.get_current_timezone())
         return timezone.localtime(value)
 
+
+class DenunciaReportView(ReportParamsMixin, APIView):
+    """
+    Gera relatórios de denúncias nos formatos CSV, XLSX e DOCX
+    com resumo por status e listagem detalhada filtrada por período.
+    Parquet e Arrow IPC exportam apenas as linhas, com tipos preservados.
+    """
+
+    permission_classes: ClassVar = [IsAuthenticated, IsAdmin | IsUser]
+
+    DETAIL_COLUMNS = ("protocolo", "categoria__nome", "status", "created_at", "descricao")
+    DETAIL_HEADERS: ClassVar[list[str]] = ["Protocolo", "Categoria", "Status", "Data de criação", "Descrição"]
+    ITERATOR_CHUNK_SIZE = 2000
+    CSV_FLUSH_ROWS = 500
+    XLSX_MAX_ROWS = 1_048_576  # limite de linhas por planilha do Excel
+    CONTENT_TYPES: ClassVar[dict[str, str]] = {
+        "csv": "text/csv; charset=utf-8",
+        "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "parquet": "application/vnd.apache.parquet",
+        "arrow": "application/vnd.apache.arrow.file",
+    }
+
+    @swagger_auto_schema(
+        tags=["Relatórios"],
+        operation_description="Gera um relatório detalhado de denúncias com resumo por status.",
+        responses={200: openapi.Response("Arquivo gerado no formato solicitado.")},
+        manual_parameters=[
+            ReportParamsMixin.formato_param,
+            ReportParamsMixin.data_inicio_param,
+            ReportParamsMixin.data_fim_param,
+        ],
+    )
+    def get(self, request, *args, **kwargs):
+        formato, start_dt, end_dt = self.parse_report_params(request.query_params)
+        queryset = self.build_queryset(start_dt, end_dt)
+        timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"relatorio_denuncias_{timestamp}.{formato}"
+
+        cache_key = self._report_cache_key(formato, queryset, start_dt, end_dt)
+        cached = report_cache.open_cached(cache_key, formato) if cache_key else None
+        if cached is not None:
+            # FileResponse define Content-Length a partir do arquivo
+            return FileResponse(
+                cached, as_attachment=True, filename=filename, content_type=self.CONTENT_TYPES[formato]
+            )
+
+        if formato in columnar.FORMATS:
+            spool = tempfile.TemporaryFile(suffix=f".{formato}")
+            columnar.write_table(self._iter_columnar_rows(queryset), spool, formato)
+            spool.seek(0)
+            if cache_key:
+                with report_cache.writer(cache_key, formato) as cache_file:
+                    shutil.copyfileobj(spool, cache_file)
+                spool.seek(0)
+            return FileResponse(
+                spool, as_attachment=True, filename=filename, content_type=self.CONTENT_TYPES[formato]
+            )
+
+        summary = self._build_summary(queryset, start_dt, end_dt)
+        details = self._iter_details(queryset)
+
+        if formato == "csv":
+            # streaming: memória constante e primeiro byte logo após o resumo
+            # (sob ASGI, via iterador assíncrono; ver api/streaming.py)
+            chunks = self._stream_csv(summary, details)
+            if cache_key:
+                chunks = report_cache.tee(chunks, cache_key, formato)
+            response = streaming_response(request, chunks, content_type=self.CONTENT_TYPES["csv"])
+            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+            return response
+
+        if formato == "xlsx":
+            # arquivo temporário (removido ao fechar) enviado em blocos pelo FileResponse
+            spool = self._build_xlsx(summary, details)
+            if cache_key:
+                with report_cache.writer(cache_key, formato) as cache_file:
+                    shutil.copyfileobj(spool, cache_file)
+                spool.seek(0)
+            return FileResponse(
+                spool, as_attachment=True, filename=filename, content_type=self.CONTENT_TYPES["xlsx"]
+            )
+
+        content = self._build_docx(summary, details)
+        if cache_key:
+            with report_cache.writer(cache_key, formato) as cache_file:
+                cache_file.write(content)
+        response = HttpResponse(content, content_type=self.CONTENT_TYPES["docx"])
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def _report_cache_key(self, formato, queryset, start_dt, end_dt) -> str | None:
+        """
+        Chave do cache de arquivos: formato, período e marca d'água do
+        intervalo. Com filtro, o resumo também traz totais gerais, então a
+        marca d'água da tabela inteira entra na chave. A geração do cache de
+        respostas cobre o que a marca d'água não vê (renomear categoria).
+        """
+        if not report_cache.enabled():
+            return None
+        generation, _changed_at = api_cache.generation_watermark()
+        watermarks = [generation, queryset_watermark(queryset)]
+        if start_dt or end_dt:
+            watermarks.append(queryset_watermark(Denuncia.objects.all()))
+        return report_cache.build_key(formato, start_dt, end_dt, watermarks)
+
+    def build_queryset(self, start_dt, end_dt):
+        queryset = Denuncia.objects.all().order_by("created_at")
+        if start_dt:
+            queryset = queryset.filter(created_at__gte=start_dt)
+        if end_dt:
+            queryset = queryset.filter(created_at__lte=end_dt)
+        return queryset
+
+    def render_to_file(self, formato, start_dt, end_dt, fileobj) -> None:
+        """Grava o relatório completo em `fileobj` (usado fora do ciclo de request, ex.: jobs)."""
+        queryset = self.build_queryset(start_dt, end_dt)
+        if formato in columnar.FORMATS:
+            columnar.write_table(self._iter_columnar_rows(queryset), fileobj, formato)
+            return
+        summary = self._build_summary(queryset, start_dt, end_dt)
+        details = self._iter_details(queryset)
+        if formato == "csv":
+            for chunk in self._stream_csv(summary, details):
+                fileobj.write(chunk)
+        elif formato == "xlsx":
+            with self._build_xlsx(summary, details) as spool:
+                shutil.copyfileobj(spool, fileobj)
+        else:
+            fileobj.write(self._build_docx(summary, details))
+
     def _build_summary(self, queryset, start_dt, end_dt):
+        summary, _hit = api_cache.get_or_set(
+            "report_summary",
+            {"start": start_dt, "end": end_dt},
+            lambda: self._compute_summary(queryset, start_dt, end_dt),
+            request=getattr(self, "request", None),
+        )
+        return summary
+
+    def _compute_summary(self, queryset, start_dt, end_dt):
         status_counts = self._status_counts_for_queryset(queryset)
         has_filters = any([start_dt, end_dt])
         global_queryset = Denuncia.objects.all()
@@ -167,23 +278,35 @@ class DenunciaReportView(APIView):
 
         return status_counts
 
-    def _build_details(self, queryset):
+    def _iter_details(self, queryset):
+        """
+        Percorre apenas as colunas exportadas em lotes (`iterator`), sem
+        instanciar modelos nem manter a listagem inteira em memória.
+        """
         status_choices = getattr(choice.STATUS_CHOICES, "choices", choice.STATUS_CHOICES)
         label_map = dict(status_choices)
-        data = []
-        for denuncia in queryset:
-            created = timezone.localtime(denuncia.created_at)
-            data.append(
-                {
-                    "protocolo": denuncia.protocolo,
-                    "categoria": denuncia.categoria,
-                    "status": denuncia.status,
-                    "status_label": label_map.get(denuncia.status, denuncia.status),
-                    "created_at": created,
-                    "descricao": denuncia.descricao,
-                }
-            )
-        return data
+        tz = timezone.get_current_timezone()
+        rows = queryset.values_list(*self.DETAIL_COLUMNS).iterator(chunk_size=self.ITERATOR_CHUNK_SIZE)
+        for protocolo, categoria, status, created_at, descricao in rows:
+            yield {
+                "protocolo": protocolo,
+                "categoria": categoria,
+                "status": status,
+                "status_label": label_map.get(status, status),
+                "created_at": timezone.localtime(created_at, tz),
+                "descricao": descricao,
+            }
+
+    def _iter_columnar_rows(self, queryset):
+        """
+        Tuplas na ordem de `columnar.COLUMNS`, com latitude/longitude
+        extraídas pelo PostGIS e lidas por cursor do lado do servidor.
+        """
+        return (
+            queryset.annotate(latitude=Y("localizacao"), longitude=X("localizacao"))
+            .values_list(*columnar.COLUMNS)
+            .iterator(chunk_size=self.ITERATOR_CHUNK_SIZE)
+        )
 
     def _format_period(self, start_dt, end_dt):
         if not start_dt and not end_dt:
@@ -197,10 +320,17 @@ class DenunciaReportView(APIView):
             parts.append(f"fim: {timezone.localtime(end_dt).strftime(fmt)}")
         return " | ".join(parts)
 
-    def _build_csv(self, summary, details):
+    def _stream_csv(self, summary, details):
+        """Gera o CSV em blocos de `CSV_FLUSH_ROWS` linhas, já codificados em UTF-8."""
         buffer = io.StringIO()
         writer = csv.writer(buffer, delimiter=";")
 
+        def flush():
+            chunk = buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            return chunk
+
         writer.writerow(["Relatório de Denúncias"])
         writer.writerow([summary["periodo"]])
         writer.writerow([f"Total de denúncias: {summary['total']}"])
@@ -216,8 +346,10 @@ class DenunciaReportView(APIView):
                 writer.writerow([row["label"], row["total"]])
 
         writer.writerow([])
-        writer.writerow(["Protocolo", "Categoria", "Status", "Data de criação", "Descrição"])
-        for item in details:
+        writer.writerow(self.DETAIL_HEADERS)
+        yield flush()
+
+        for count, item in enumerate(details, start=1):
             writer.writerow(
                 [
                     item["protocolo"],
@@ -227,55 +359,65 @@ class DenunciaReportView(APIView):
                     (item["descricao"] or "").replace("\n", " "),
                 ]
             )
+            if count % self.CSV_FLUSH_ROWS == 0:
+                yield flush()
 
-        return buffer.getvalue().encode("utf-8")
+        tail = flush()
+        if tail:
+            yield tail
 
     def _build_xlsx(self, summary, details):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Relatório"
-
-        row_idx = 1
-        ws.cell(row=row_idx, column=1, value="Relatório de Denúncias")
-        row_idx += 1
-        ws.cell(row=row_idx, column=1, value=summary["periodo"])
-        row_idx += 1
-        ws.cell(row=row_idx, column=1, value=f"Total de denúncias: {summary['total']}")
-        row_idx += 2
-
-        ws.cell(row=row_idx, column=1, value="Totais por status (intervalo)")
-        row_idx += 1
+        """
+        Monta o XLSX em modo write-only (linhas vão direto para disco) num
+        arquivo temporário. Passando de `XLSX_MAX_ROWS`, os detalhes
+        continuam em "Relatório (2)", "Relatório (3)"..., com o cabeçalho repetido.
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Relatório")
+
+        ws.append(["Relatório de Denúncias"])
+        ws.append([summary["periodo"]])
+        ws.append([f"Total de denúncias: {summary['total']}"])
+        ws.append([])
+
+        ws.append(["Totais por status (intervalo)"])
         for status in summary["status_counts"]:
-            ws.cell(row=row_idx, column=1, value=status["label"])
-            ws.cell(row=row_idx, column=2, value=status["total"])
-            row_idx += 1
+            ws.append([status["label"], status["total"]])
 
         if summary["has_filters"]:
-            row_idx += 1
-            ws.cell(row=row_idx, column=1, value="Totais por status (geral)")
-            row_idx += 1
+            ws.append([])
+            ws.append(["Totais por status (geral)"])
             for status in summary["status_counts_geral"]:
-                ws.cell(row=row_idx, column=1, value=status["label"])
-                ws.cell(row=row_idx, column=2, value=status["total"])
-                row_idx += 1
+                ws.append([status["label"], status["total"]])
 
-        row_idx += 1
-        headers = ["Protocolo", "Categoria", "Status", "Data de criação", "Descrição"]
-        for col, header in enumerate(headers, start=1):
-            ws.cell(row=row_idx, column=col, value=header)
-        row_idx += 1
+        ws.append([])
+        ws.append(self.DETAIL_HEADERS)
+        rows_in_sheet = 7 + len(summary["status_counts"])
+        if summary["has_filters"]:
+            rows_in_sheet += 2 + len(summary["status_counts_geral"])
 
+        sheet_number = 1
         for item in details:
-            ws.cell(row=row_idx, column=1, value=item["protocolo"])
-            ws.cell(row=row_idx, column=2, value=item["categoria"])
-            ws.cell(row=row_idx, column=3, value=item["status_label"])
-            ws.cell(row=row_idx, column=4, value=item["created_at"].strftime("%d/%m/%Y %H:%M"))
-            ws.cell(row=row_idx, column=5, value=item["descricao"])
-            row_idx += 1
+            if rows_in_sheet >= self.XLSX_MAX_ROWS:
+                sheet_number += 1
+                ws = wb.create_sheet(f"Relatório ({sheet_number})")
+                ws.append(self.DETAIL_HEADERS)
+                rows_in_sheet = 1
+            ws.append(
+                [
+                    item["protocolo"],
+                    item["categoria"],
+                    item["status_label"],
+                    item["created_at"].strftime("%d/%m/%Y %H:%M"),
+                    item["descricao"],
+                ]
+            )
+            rows_in_sheet += 1
 
-        stream = io.BytesIO()
-        wb.save(stream)
-        return stream.getvalue()
+        spool = tempfile.TemporaryFile(suffix=".xlsx")
+        wb.save(spool)
+        spool.seek(0)
+        return spool
 
     def _build_docx(self, summary, details):
         document = Document()
@@ -294,18 +436,24 @@ class DenunciaReportView(APIView):
 
         document.add_heading("Detalhes das denúncias", level=2)
         table = document.add_table(rows=1, cols=5)
-        headers = ["Protocolo", "Categoria", "Status", "Data de criação", "Descrição"]
         hdr_cells = table.rows[0].cells
-        for idx, header in enumerate(headers):
+        for idx, header in enumerate(self.DETAIL_HEADERS):
             hdr_cells[idx].text = header
 
-        for item in details:
-            cells = table.add_row().cells
-            cells[0].text = item["protocolo"]
-            cells[1].text = item["categoria"]
-            cells[2].text = item["status_label"]
-            cells[3].text = item["created_at"].strftime("%d/%m/%Y %H:%M")
-            cells[4].text = item["descricao"] or ""
+        # linhas montadas em lote (ver `append_table_rows`); add_row() é quadrático
+        append_table_rows(
+            table,
+            (
+                (
+                    item["protocolo"],
+                    item["categoria"],
+                    item["status_label"],
+                    item["created_at"].strftime("%d/%m/%Y %H:%M"),
+                    item["descricao"] or "",
+                )
+                for item in details
+            ),
+        )
 
         stream = io.BytesIO()
         document.save(stream)
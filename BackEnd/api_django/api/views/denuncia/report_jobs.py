@@ -0,0 +1,107 @@
+from typing import ClassVar
+
+from django.http import FileResponse
+from django.urls import reverse
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.generics import RetrieveAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.permissions.groups import IsAdmin, IsUser
+from api.choice import ReportJobStatusChoices
+from api.models import ReportJob
+from api.report_jobs import REPORT_EXTENSIONS, enqueue_report_job
+from api.serializers import ReportJobSerializer
+from api.views.denuncia.report import DenunciaReportView, ReportParamsMixin
+
+
+class ReportJobQuerysetMixin:
+    """Usuários comuns só enxergam os próprios jobs; `Admin` enxerga todos."""
+
+    def get_queryset(self):
+        queryset = ReportJob.objects.all()
+        if getattr(self, "swagger_fake_view", False):
+            return queryset.none()
+        if IsAdmin().has_permission(self.request, self):
+            return queryset
+        return queryset.filter(usuario=self.request.user)
+
+
+class ReportJobCreateView(ReportParamsMixin, APIView):
+    """
+    Enfileira a geração de um relatório (mesmos parâmetros de
+    `DenunciaReportView`). Pedidos idênticos ainda em andamento reaproveitam o job.
+    """
+
+    permission_classes: ClassVar = [IsAuthenticated, IsAdmin | IsUser]
+
+    @swagger_auto_schema(
+        tags=["Relatórios"],
+        operation_description=(
+            "Cria um job de relatório processado pelo worker (`run_report_worker`). "
+            "Acompanhe pelo link em `Location` e baixe o arquivo em `download_url`."
+        ),
+        manual_parameters=[
+            ReportParamsMixin.formato_param,
+            ReportParamsMixin.data_inicio_param,
+            ReportParamsMixin.data_fim_param,
+        ],
+        responses={202: ReportJobSerializer()},
+        operation_id="denuncia_report_job_create",
+    )
+    def post(self, request, *args, **kwargs):
+        params = request.data if request.data else request.query_params
+        formato, start_dt, end_dt = self.parse_report_params(params)
+        job, created = enqueue_report_job(formato, start_dt, end_dt, usuario=request.user)
+
+        data = ReportJobSerializer(job, context={"request": request}).data
+        data["coalesced"] = not created
+        response = Response(data, status=status.HTTP_202_ACCEPTED)
+        response["Location"] = reverse("denuncia-report-job-detail", kwargs={"pk": job.pk})
+        return response
+
+
+class ReportJobDetailView(ReportJobQuerysetMixin, RetrieveAPIView):
+    """Consulta o andamento de um job de relatório."""
+
+    serializer_class = ReportJobSerializer
+    permission_classes: ClassVar = [IsAuthenticated, IsAdmin | IsUser]
+
+    @swagger_auto_schema(
+        tags=["Relatórios"],
+        operation_description="Retorna o status do job; `download_url` é preenchido quando concluído.",
+        responses={200: ReportJobSerializer()},
+        operation_id="denuncia_report_job_detail",
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class ReportJobDownloadView(ReportJobQuerysetMixin, RetrieveAPIView):
+    """Entrega o arquivo gerado por um job concluído."""
+
+    permission_classes: ClassVar = [IsAuthenticated, IsAdmin | IsUser]
+
+    @swagger_auto_schema(
+        tags=["Relatórios"],
+        operation_description="Baixa o relatório gerado. Retorna 409 enquanto o job não estiver concluído.",
+        responses={200: openapi.Response("Arquivo do relatório."), 409: "Job ainda não concluído."},
+        operation_id="denuncia_report_job_download",
+    )
+    def get(self, request, *args, **kwargs):
+        job = self.get_object()
+        if job.status != ReportJobStatusChoices.CONCLUIDO or not job.arquivo:
+            return Response(
+                {"detail": "Relatório ainda não disponível.", "status": job.status},
+                status=status.HTTP_409_CONFLICT,
+            )
+        timestamp = job.created_at.strftime("%Y%m%d_%H%M%S")
+        return FileResponse(
+            job.arquivo.open("rb"),
+            as_attachment=True,
+            filename=f"relatorio_denuncias_{timestamp}.{REPORT_EXTENSIONS[job.formato]}",
+            content_type=DenunciaReportView.CONTENT_TYPES[job.formato],
+        )
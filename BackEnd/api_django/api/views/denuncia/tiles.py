@@ -0,0 +1,58 @@
+from typing import ClassVar
+
+from django.http import HttpResponse
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny
+from rest_framework.views import APIView
+
+from api.tiles import MAX_TILE_ZOOM, get_tile, is_valid_tile
+
+from .heatmap import date_bounds
+
+
+class DenunciaTileView(APIView):
+    """Entrega tiles MVT (`ST_AsMVT`) com os pontos de denúncia de um z/x/y."""
+
+    permission_classes: ClassVar = [AllowAny]
+    content_type = "application/vnd.mapbox-vector-tile"
+    browser_cache_max_age = 60  # segundos; permite cache por tile no navegador/CDN
+
+    start_date_param = openapi.Parameter(
+        "start_date",
+        openapi.IN_QUERY,
+        description="Data inicial (ISO-8601). Ex: 2025-10-01. Qualquer horário enviado será ignorado.",
+        type=openapi.TYPE_STRING,
+        format=openapi.FORMAT_DATETIME,
+        required=False,
+    )
+    end_date_param = openapi.Parameter(
+        "end_date",
+        openapi.IN_QUERY,
+        description="Data final (ISO-8601). Ex: 2025-10-31. Qualquer horário enviado será ignorado.",
+        type=openapi.TYPE_STRING,
+        format=openapi.FORMAT_DATETIME,
+        required=False,
+    )
+
+    @swagger_auto_schema(
+        tags=["Heatmap"],
+        operation_description=(
+            f"Tile vetorial (MVT, zoom 0-{MAX_TILE_ZOOM}) com as denúncias do z/x/y informado. "
+            "Camada `denuncias` com atributos `categoria`, `status` e `created_at` (epoch em segundos)."
+        ),
+        manual_parameters=[start_date_param, end_date_param],
+        responses={200: openapi.Response("Tile MVT (application/vnd.mapbox-vector-tile).")},
+        operation_id="denuncia_tile",
+    )
+    def get(self, request, z: int, x: int, y: int):
+        if not is_valid_tile(z, x, y):
+            raise ValidationError({"detail": "Coordenadas de tile inválidas."})
+
+        start_dt, end_dt = date_bounds(request.query_params)
+        tile = get_tile(z, x, y, start_dt, end_dt)
+
+        response = HttpResponse(tile, content_type=self.content_type)
+        response["Cache-Control"] = f"public, max-age={self.browser_cache_max_age}"
+        return response
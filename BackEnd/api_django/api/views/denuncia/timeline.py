@@ -0,0 +1,69 @@
+from datetime import date, timedelta
+from typing import ClassVar
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.permissions.groups import IsAdmin, IsUser
+from api.stats import reports_timeline
+
+
+class DenunciaReportsTimelineView(APIView):
+    """Série diária de denúncias abertas vs resolvidas, lida do rollup `DenunciaDailyStats`."""
+
+    permission_classes: ClassVar = [IsAuthenticated, IsAdmin | IsUser]
+
+    DEFAULT_RANGE_DAYS = 30
+    MAX_RANGE_DAYS = 366 * 3
+
+    start_date_param = openapi.Parameter(
+        "startDate",
+        openapi.IN_QUERY,
+        description="Data inicial (YYYY-MM-DD ou ISO-8601 com hora). Padrão: 30 dias antes de endDate.",
+        type=openapi.TYPE_STRING,
+        required=False,
+    )
+    end_date_param = openapi.Parameter(
+        "endDate",
+        openapi.IN_QUERY,
+        description="Data final (YYYY-MM-DD ou ISO-8601 com hora). Padrão: hoje.",
+        type=openapi.TYPE_STRING,
+        required=False,
+    )
+
+    @swagger_auto_schema(
+        tags=["Deshboard"],
+        operation_description="Retorna, por dia, a quantidade de denúncias abertas e resolvidas no período.",
+        manual_parameters=[start_date_param, end_date_param],
+        responses={200: "OK"},
+        operation_id="denuncia_dashboard_reports_timeline",
+    )
+    def get(self, request):
+        end = self._parse_day(request.query_params.get("endDate"), "endDate") or timezone.localdate()
+        start = self._parse_day(request.query_params.get("startDate"), "startDate") or (
+            end - timedelta(days=self.DEFAULT_RANGE_DAYS)
+        )
+        if start > end:
+            raise ValidationError({"startDate": "startDate não pode ser maior que endDate."})
+        if (end - start).days > self.MAX_RANGE_DAYS:
+            raise ValidationError({"startDate": f"Período máximo de {self.MAX_RANGE_DAYS} dias."})
+        return Response({"timeline": reports_timeline(start, end)})
+
+    def _parse_day(self, raw_value: str | None, field_name: str) -> date | None:
+        if not raw_value:
+            return None
+        parsed_dt = parse_datetime(raw_value)
+        if parsed_dt:
+            if timezone.is_aware(parsed_dt):
+                parsed_dt = timezone.localtime(parsed_dt)
+            return parsed_dt.date()
+        parsed_date = parse_date(raw_value)
+        if parsed_date is None:
+            raise ValidationError({field_name: "Data inválida. Use YYYY-MM-DD ou ISO-8601."})
+        return parsed_date
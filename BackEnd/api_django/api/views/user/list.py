@@ -3,16 +3,16 @@ from typing import ClassVar
 from django.contrib.auth import get_user_model
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.generics import ListAPIView
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 
 from accounts.permissions.groups import IsAdmin, IsUser
+from api.pagination import EstimatedCountPagination
 from api.serializers import UserListSerializer
 
 User = get_user_model()
 
 
-class CustomPagination(PageNumberPagination):
+class CustomPagination(EstimatedCountPagination):
     page_size = 20  # Número de itens por página
     page_size_query_param = 'page_size'  # permite o uso de ?page_size=20 na URL
     max_page_size = 100  # limite máximo
@@ -0,0 +1,24 @@
+"""
+Pontos de entrada dos processos do pool de `run_report_worker`.
+
+Este módulo não importa modelos no topo: os processos são iniciados com
+`spawn` e só podem tocar no ORM depois de `setup_worker` chamar
+`django.setup()`.
+"""
+
+
+def setup_worker():
+    import django
+
+    django.setup()
+
+
+def render_report_job(job_id):
+    from django.db import connections
+
+    from api.report_jobs import run_report_job
+
+    try:
+        return run_report_job(job_id)
+    finally:
+        connections.close_all()
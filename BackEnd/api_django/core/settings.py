@@ -124,6 +124,31 @@ DATABASES = {
     }
 }
 
+# Cache - Redis quando REDIS_URL estiver definido (ex.: redis://redis:6379/1 no docker-compose);
+# sem REDIS_URL usa memória local do processo (dev/testes)
+REDIS_URL = os.getenv('REDIS_URL', '').strip()
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Cache de respostas (heatmap, dashboard, resumo de relatórios) - ver api/cache.py
+API_CACHE_ENABLED = os.getenv('API_CACHE_ENABLED', 'True').lower() in ('1', 'true', 'yes', 'on')
+API_CACHE_TTLS = {
+    'heatmap': int(os.getenv('API_CACHE_TTL_HEATMAP', '300')),
+    'dashboard': int(os.getenv('API_CACHE_TTL_DASHBOARD', '60')),
+    'report_summary': int(os.getenv('API_CACHE_TTL_REPORT_SUMMARY', '300')),
+}
+
 # Internationalization - opcionalmente sobreescrito pelo .env
 LANGUAGE_CODE = os.getenv('LANGUAGE_CODE', 'pt-br')
 TIME_ZONE = os.getenv('TIME_ZONE', 'UTC')
@@ -157,6 +182,12 @@ STATICFILES_DIRS = [
 # Diretório onde collectstatic grava arquivos estáticos
 STATIC_ROOT = os.getenv('STATIC_ROOT', str(BASE_DIR / 'staticfiles'))
 
+# Relatórios gerados no servidor (jobs assíncronos); compartilhado entre API e worker
+REPORT_FILES_ROOT = os.getenv('REPORT_FILES_ROOT', str(BASE_DIR / 'report_files'))
+# Cache em disco dos relatórios renderizados (LRU por tamanho; ver `prune_report_cache`)
+REPORT_CACHE_ENABLED = os.getenv('REPORT_CACHE_ENABLED', 'True').lower() in ('1', 'true', 'yes', 'on')
+REPORT_CACHE_MAX_BYTES = int(os.getenv('REPORT_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -181,7 +212,20 @@ EMAIL_USE_SSL = os.getenv('EMAIL_USE_SSL', 'False').lower() in ('1', 'true', 'ye
 EMAIL_TIMEOUT = int(os.getenv('EMAIL_TIMEOUT', 5))
 
 # Django REST Framework - adicionar JWT se usar Simple JWT
+# JSON do DRF como padrão; o par orjson (api/renderers.py, api/parsers.py) é
+# opcional, negociado por ?format=orjson ou pelo media type application/vnd.mapcrime+json.
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': (
+        'rest_framework.renderers.JSONRenderer',
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'rest_framework.parsers.JSONParser',
+        'api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
@@ -194,7 +238,7 @@ REST_FRAMEWORK = {
 
 # Configurações do CORS
 CORS_ALLOW_CREDENTIALS = False
-CORS_EXPOSE_HEADERS = ['Content-Type', 'Authorization']
+CORS_EXPOSE_HEADERS = ['Content-Type', 'Authorization', 'ETag', 'Last-Modified', 'X-Cache', 'X-Heatmap-Cursor']
 CORS_ALLOW_HEADERS = [
     *default_headers,
     'access-control-allow-origin',